@@ -0,0 +1,23 @@
+-- 채팅방 마지막 메시지/활동 시각 컬럼 (채팅 목록 요약 조회용)
+-- save_message 에서 메시지 INSERT와 같은 트랜잭션으로 갱신
+ALTER TABLE chats ADD COLUMN IF NOT EXISTS last_message_id INTEGER;
+ALTER TABLE chats ADD COLUMN IF NOT EXISTS last_message_at TIMESTAMP;
+
+-- 기존 데이터로 초기화
+UPDATE chats c
+SET last_message_id = lm.id,
+    last_message_at = lm.timestamp
+FROM (
+    SELECT DISTINCT ON (chat_id) chat_id, id, timestamp
+    FROM messages
+    ORDER BY chat_id, id DESC
+) lm
+WHERE lm.chat_id = c.id;
+
+-- 인덱스 생성 (최근 활동순 정렬, 채팅방별 최신 메시지 조회, 사용자별 참여 채팅방 조회)
+CREATE INDEX IF NOT EXISTS idx_chats_last_activity ON chats ((COALESCE(last_message_at, created_at)) DESC);
+CREATE INDEX IF NOT EXISTS idx_messages_chat_id_id ON messages(chat_id, id);
+CREATE INDEX IF NOT EXISTS idx_chat_participants_username ON chat_participants(username);
+
+COMMENT ON COLUMN chats.last_message_id IS '마지막 메시지 ID';
+COMMENT ON COLUMN chats.last_message_at IS '마지막 메시지 시각 (최근 활동순 정렬용)';
@@ -0,0 +1,28 @@
+-- 채팅방별 사용자 읽지 않은 메시지 카운터 테이블
+-- save_message / mark_messages_as_read / mark_single_message_as_read 에서 같은 트랜잭션으로 갱신
+CREATE TABLE IF NOT EXISTS chat_unread_counters (
+    chat_id INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    unread INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (chat_id, username)
+);
+
+-- 인덱스 생성 (사용자별 전체 미읽음 합계 조회 최적화)
+CREATE INDEX IF NOT EXISTS idx_chat_unread_counters_username ON chat_unread_counters(username);
+
+-- 기존 데이터로 카운터 초기화 (내가 보내지 않은 메시지 중 읽지 않은 메시지 개수)
+INSERT INTO chat_unread_counters (chat_id, username, unread)
+SELECT cp.chat_id, cp.username, COUNT(m.id)
+FROM chat_participants cp
+LEFT JOIN messages m
+    ON m.chat_id = cp.chat_id
+    AND m.username != cp.username
+    AND NOT EXISTS (
+        SELECT 1 FROM message_reads mr
+        WHERE mr.message_id = m.id AND mr.username = cp.username
+    )
+GROUP BY cp.chat_id, cp.username
+ON CONFLICT (chat_id, username) DO UPDATE SET unread = EXCLUDED.unread;
+
+COMMENT ON TABLE chat_unread_counters IS '채팅방별 사용자 읽지 않은 메시지 수 (배지/채팅 목록용)';
+COMMENT ON COLUMN chat_unread_counters.unread IS '읽지 않은 메시지 개수';
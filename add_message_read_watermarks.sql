@@ -0,0 +1,29 @@
+-- 채팅 읽음 워터마크 (채팅방별 사용자가 마지막으로 읽은 메시지 ID)
+-- message_reads (메시지 x 읽은 사용자) 행 대신 참여자당 1개 값으로 읽음 상태 관리
+-- read_by 목록 = last_read_message_id >= 메시지 ID 인 참여자
+ALTER TABLE chat_participants ADD COLUMN IF NOT EXISTS last_read_message_id INTEGER NOT NULL DEFAULT 0;
+
+-- 기존 message_reads 데이터로 워터마크 초기화 (읽었거나 직접 보낸 마지막 메시지)
+UPDATE chat_participants cp
+SET last_read_message_id = wm.last_read
+FROM (
+    SELECT chat_id, username, MAX(message_id) as last_read
+    FROM (
+        SELECT m.chat_id, mr.username, m.id as message_id
+        FROM message_reads mr
+        INNER JOIN messages m ON m.id = mr.message_id
+        UNION ALL
+        SELECT chat_id, username, id as message_id
+        FROM messages
+    ) reads
+    GROUP BY chat_id, username
+) wm
+WHERE wm.chat_id = cp.chat_id
+AND wm.username = cp.username
+AND wm.last_read > cp.last_read_message_id;
+
+-- 참고: 새 코드는 message_reads를 더 이상 사용하지 않음
+-- 이전 데이터 확인이 끝나면 아래 명령으로 정리
+-- DROP TABLE message_reads;
+
+COMMENT ON COLUMN chat_participants.last_read_message_id IS '마지막으로 읽은 메시지 ID (읽음 워터마크)';
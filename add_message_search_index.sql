@@ -0,0 +1,9 @@
+-- 채팅 메시지 검색 인덱스 (pg_trgm)
+-- 한글은 형태소 분리 없이 부분 문자열 검색이 필요하므로 tsvector 대신 trigram GIN 인덱스 사용
+-- ILIKE '%검색어%' 조건과 similarity() 정렬이 이 인덱스를 사용함
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_messages_message_trgm ON messages USING gin (message gin_trgm_ops);
+
+-- 날짜 필터 + 채팅방 범위 검색용
+CREATE INDEX IF NOT EXISTS idx_messages_chat_timestamp ON messages(chat_id, timestamp);
@@ -0,0 +1,20 @@
+-- 프로모션 목록 검색/필터 인덱스
+-- 목록은 promotion_catalog 메모리 스냅샷으로 응답하고, 스냅샷이 없을 때(워커 시작 직후)
+-- database.query_promotions가 이 인덱스로 조회함
+-- 통합 검색(상품명, 채널, 프로모션명, 프로모션코드, 내용)은 아래 식 하나에 대한 ILIKE로 처리
+-- database.PROMOTION_SEARCH_EXPR 와 식이 같아야 인덱스를 사용함
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_promotions_search_trgm ON promotions USING gin (
+    (COALESCE(product_name, '') || E'\n' || COALESCE(channel, '') || E'\n' ||
+     COALESCE(promotion_name, '') || E'\n' || COALESCE(promotion_code, '') || E'\n' ||
+     COALESCE(content, '')) gin_trgm_ops
+);
+
+-- 필터 컬럼 (대분류/채널은 schema_postgresql.sql에 이미 있음)
+CREATE INDEX IF NOT EXISTS idx_promotions_product_name ON promotions(product_name);
+CREATE INDEX IF NOT EXISTS idx_promotions_promotion_name ON promotions(promotion_name);
+CREATE INDEX IF NOT EXISTS idx_promotions_end_date ON promotions(end_date);
+
+-- 구독 유형 필터 (EXISTS 서브쿼리)
+CREATE INDEX IF NOT EXISTS idx_promotion_subscription_types_promo ON promotion_subscription_types(promotion_id, subscription_type);
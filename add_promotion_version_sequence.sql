@@ -0,0 +1,6 @@
+-- 프로모션 카탈로그 버전 시퀀스
+-- 프로모션 추가/수정/삭제 트랜잭션이 커밋된 뒤 nextval로 증가 (커밋 전에 올리면 이전 데이터가 새 버전으로 캐시될 수 있음)
+-- 각 워커의 메모리 카탈로그가 버전을 비교해 변경 시에만 다시 로드하고, 버전은 ETag에도 사용
+CREATE SEQUENCE IF NOT EXISTS promotion_version_seq;
+
+COMMENT ON SEQUENCE promotion_version_seq IS '프로모션 카탈로그 버전 (변경마다 증가)';
@@ -0,0 +1,26 @@
+-- 푸시 알림 발송 대기열 (outbox)
+-- 알림은 구독 단위로 여기에 쌓이고, 배달 워커가 동시 발송 수를 제한하며 처리
+-- 성공 시 행 삭제, 일시 오류는 지수 백오프로 재시도, 만료된 구독(404/410)은 구독과 함께 삭제
+CREATE TABLE IF NOT EXISTS push_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    subscription_id INTEGER NOT NULL,
+    username VARCHAR(100) NOT NULL,
+    payload JSONB NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_until TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (subscription_id) REFERENCES push_subscriptions(id) ON DELETE CASCADE
+);
+
+-- 인덱스 생성 (발송 대상 조회 최적화: 대기 중인 행만)
+CREATE INDEX IF NOT EXISTS idx_push_outbox_due ON push_outbox(next_attempt_at) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_push_outbox_subscription ON push_outbox(subscription_id);
+
+COMMENT ON TABLE push_outbox IS '웹 푸시 알림 발송 대기열';
+COMMENT ON COLUMN push_outbox.status IS 'pending: 발송 대기/재시도, failed: 최대 재시도 초과';
+COMMENT ON COLUMN push_outbox.attempts IS '발송 시도 횟수';
+COMMENT ON COLUMN push_outbox.next_attempt_at IS '다음 발송 시도 시각 (지수 백오프)';
+COMMENT ON COLUMN push_outbox.locked_until IS '배달 워커 점유 만료 시각 (여러 프로세스 동시 처리용)';
@@ -0,0 +1,4 @@
+-- 미완료 예약 조회용 부분 인덱스
+-- 배너(당일/지난 예약 개수), 당일 예약 목록, 알림 스케줄러 로드가 모두 is_completed = 0 행만 조회
+CREATE INDEX IF NOT EXISTS idx_reminders_open_user_date ON reminders(user_id, scheduled_date) WHERE is_completed = 0;
+CREATE INDEX IF NOT EXISTS idx_reminders_open_date ON reminders(scheduled_date, scheduled_time) WHERE is_completed = 0;
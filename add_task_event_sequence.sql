@@ -0,0 +1,3 @@
+-- 할일 변경 이벤트(task_delta) 버전 시퀀스
+-- 모든 워커 프로세스가 같은 시퀀스에서 버전을 발급하므로 클라이언트가 누락(gap)을 감지할 수 있음
+CREATE SEQUENCE IF NOT EXISTS task_event_seq;
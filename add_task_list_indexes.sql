@@ -0,0 +1,19 @@
+-- 할일 목록 서버 측 필터/정렬/페이지네이션 인덱스
+-- 정렬 컬럼 + id 복합 인덱스로 키셋 커서 조회 ((정렬값, id) > (커서값, 커서id))
+CREATE INDEX IF NOT EXISTS idx_tasks_created_id ON tasks(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_assigned_at_id ON tasks(assigned_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_id ON tasks(status, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_assigned_to_id ON tasks(assigned_to, id);
+
+-- NULL 허용 컬럼은 정렬식이 COALESCE이므로 같은 식으로 표현식 인덱스 생성
+-- (database.TASK_SORT_COLUMNS와 식이 정확히 일치해야 ORDER BY/커서 조건에 사용됨)
+CREATE INDEX IF NOT EXISTS idx_tasks_assigned_at_sort ON tasks((COALESCE(assigned_at, '-infinity')), id);
+CREATE INDEX IF NOT EXISTS idx_tasks_updated_at_sort ON tasks((COALESCE(updated_at, '-infinity')), id);
+CREATE INDEX IF NOT EXISTS idx_tasks_completed_at_sort ON tasks((COALESCE(completed_at, '-infinity')), id);
+CREATE INDEX IF NOT EXISTS idx_tasks_assigned_to_sort ON tasks((COALESCE(assigned_to, '')), id);
+-- 팀 정렬은 users 조인 컬럼(u.team) 기준이라 tasks 인덱스로는 정렬할 수 없음 (필터 결과를 정렬)
+
+-- 제목/내용 부분 일치 검색 (ILIKE '%검색어%')
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_tasks_title_trgm ON tasks USING gin (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_tasks_content_trgm ON tasks USING gin (content gin_trgm_ops);
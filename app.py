@@ -14,14 +14,18 @@ import re
 import uuid
 import threading
 from datetime import datetime
+from itertools import islice
 import logging
 from logging.handlers import RotatingFileHandler
 from typing import Any, Optional, Union
 import database  # SQLite 데이터베이스 헬퍼
 import pandas as pd
 import random
-from cache_manager import app_cache, cached, invalidate_cache, generate_etag
+from cache_manager import app_cache, cached, invalidate_cache, generate_etag, start_invalidation_listener, on_task_modified
 import push_helper  # 웹 푸시 알림 헬퍼
+import promotion_catalog  # 프로모션 메모리 카탈로그
+import reminder_scheduler  # 예약 알림 스케줄러
+import scheduler_leader  # 스케줄러 리더 선출
 from rate_limiter import (
     create_limiter, get_limit_string, get_client_ip,
     check_login_lockout, record_login_attempt, get_remaining_attempts
@@ -226,6 +230,10 @@ socketio = SocketIO(
     engineio_logger=False
 )
 
+# 다른 워커의 캐시 무효화 구독은 워커가 앱을 불러올 때 바로 시작
+# (첫 HTTP 요청을 기다리면 Socket.IO 트래픽만 받는 워커는 무효화를 받지 못함)
+start_invalidation_listener()
+
 # 관리자 사용자명 캐시 (DB에서 로드)
 _admin_cache = None
 _admin_cache_time = None
@@ -245,13 +253,10 @@ def get_admin_accounts() -> set[str]:
 
 # SQLite 데이터베이스 함수 사용
 load_data = database.load_data
-save_data = database.save_data
 load_chats = database.load_chats
-save_chats = database.save_chats
 load_users = database.load_users
 save_users = database.save_users
 load_promotions = database.load_promotions
-save_promotions = database.save_promotions
 add_user = database.add_user
 load_users_by_team = database.load_users_by_team
 load_teams = database.load_teams
@@ -397,6 +402,9 @@ def add_security_headers(response):
     # 정적 파일 (CSS, JS, 이미지, 폰트 등)은 1시간 캐싱
     if request.path.startswith('/static/') or request.path.startswith('/uploads/'):
         response.headers['Cache-Control'] = 'public, max-age=3600'
+    # ETag가 있는 동적 응답은 매번 재검증 (변경 없으면 304)
+    elif response.headers.get('ETag'):
+        response.headers['Cache-Control'] = 'private, no-cache'
     # 동적 콘텐츠는 캐시 비활성화
     else:
         response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
@@ -536,6 +544,41 @@ def get_version():
     """
     return jsonify({'version': APP_VERSION})
 
+# ==================== 할일 변경 이벤트 ====================
+# 할일이 바뀔 때마다 admin_tasks room에 변경분(task_delta)을 전송해서
+# 관리자 화면이 전체 목록을 다시 받지 않고 증분 반영하도록 함
+# socketio.emit은 Redis message queue를 거치므로 모든 워커의 접속자에게 전달됨
+TASK_EVENTS_ROOM = 'admin_tasks'
+
+def publish_task_delta(op: str, items: Optional[list[dict[str, Any]]] = None,
+                       ids: Optional[list[int]] = None, count: Optional[int] = None) -> None:
+    """할일 변경 이벤트 전송
+
+    Args:
+        op: 'insert' (생성된 행), 'update' (수정된 행, 일부 컬럼만 있을 수 있음),
+            'delete' (삭제된 ID), 'bulk_insert' (일괄 등록 건수 - 클라이언트가 목록 재조회)
+        items: insert/update 대상 행 (id 필수)
+        ids: delete 대상 ID
+        count: bulk_insert 건수
+
+    Note: version은 task_event_seq에서 발급되어 단조 증가하며,
+          클라이언트는 마지막 version + 1이 아니면 누락으로 보고 목록을 다시 조회
+    """
+    # 통계 롤업/배지 캐시 무효화 (다른 워커 포함)
+    on_task_modified()
+
+    try:
+        payload = {'version': database.next_task_version(), 'op': op}
+        if items is not None:
+            payload['items'] = [{k: v for k, v in item.items() if k != 'old_assignee'} for item in items]
+        if ids is not None:
+            payload['ids'] = ids
+        if count is not None:
+            payload['count'] = count
+        socketio.emit('task_delta', payload, room=TASK_EVENTS_ROOM)
+    except Exception as e:
+        logger.error(f'할일 변경 이벤트 전송 실패 (op={op}): {e}')
+
 @app.route('/api/items', methods=['GET'])
 def get_items():
     """할일 목록 조회
@@ -544,31 +587,158 @@ def get_items():
       - 할일(Task)
     security:
       - session: []
+    parameters:
+      - in: query
+        name: limit
+        type: integer
+        description: 페이지 크기 (지정하면 페이지 응답 {items, next_cursor, total} 반환, 최대 500)
+      - in: query
+        name: cursor
+        type: string
+        description: 이전 응답의 next_cursor (키셋 페이지네이션)
+      - in: query
+        name: offset
+        type: integer
+        description: 건너뛸 행 수 (페이지 번호 이동용)
+      - in: query
+        name: sort
+        type: string
+        description: 정렬 컬럼 (id, title, content, status, assigned_to, team, created_at, assigned_at, updated_at, completed_at)
+      - in: query
+        name: order
+        type: string
+        enum: [asc, desc]
+      - in: query
+        name: status
+        type: string
+        description: 상태 (쉼표로 여러 개)
+      - in: query
+        name: assignee
+        type: string
+        description: 담당자 (쉼표로 여러 개)
+      - in: query
+        name: assignment
+        type: string
+        enum: [assigned, unassigned]
+      - in: query
+        name: team
+        type: string
+      - in: query
+        name: q
+        type: string
+        description: 제목/내용/담당자 검색어
+      - in: query
+        name: created_from
+        type: string
+        format: date
+      - in: query
+        name: created_until
+        type: string
+        format: date
+        description: 생성일 종료 (해당 날짜 포함)
+      - in: query
+        name: assigned_from
+        type: string
+        format: date
+      - in: query
+        name: assigned_until
+        type: string
+        format: date
+        description: 배정일 종료 (해당 날짜 포함)
+      - in: query
+        name: total
+        type: string
+        enum: ['true', only]
+        description: 전체 개수 포함 (only면 개수만 반환)
     responses:
       200:
-        description: 할일 목록
+        description: 할일 목록 (페이지 파라미터가 없으면 전체 배열)
         schema:
           type: array
           items:
             $ref: '#/definitions/Task'
+      400:
+        description: 잘못된 커서 또는 날짜 형식
       401:
         description: 인증 필요
         schema:
           $ref: '#/definitions/Error'
     """
-    if is_admin():
-        # 관리자는 전체 조회
-        data = load_data()
-        return jsonify(data)
-
-    if 'username' not in session:
+    if not is_admin() and 'username' not in session:
         return jsonify({'error': 'Unauthorized'}), 401
 
+    # 페이지/필터 파라미터가 있으면 서버 측 조회
+    if 'limit' in request.args or request.args.get('total'):
+        return get_items_page()
+
+    if is_admin():
+        # 관리자는 전체 조회 (조회 직전 이벤트 버전을 헤더로 전달)
+        version = database.get_task_version()
+        response = jsonify(load_data())
+        response.headers['X-Task-Version'] = str(version)
+        return response
+
     # 일반 사용자는 자신에게 할당된 항목만 조회 (최적화)
     username = session['username']
     user_items = database.load_data_by_assigned(username)
     return jsonify(user_items)
 
+def get_items_page():
+    """할일 목록 서버 측 필터/정렬/페이지 조회 (GET /api/items 페이지 모드)"""
+    def split_param(name):
+        return [v.strip() for v in request.args.get(name, '').split(',') if v.strip()]
+
+    filters = {
+        'status': split_param('status'),
+        'assignees': split_param('assignee'),
+        'assignment': request.args.get('assignment', ''),
+        'team': request.args.get('team', '').strip(),
+        'q': request.args.get('q', '').strip(),
+        'created_from': request.args.get('created_from', ''),
+        'created_until': request.args.get('created_until', ''),
+        'assigned_from': request.args.get('assigned_from', ''),
+        'assigned_until': request.args.get('assigned_until', ''),
+    }
+
+    # 일반 사용자는 자신에게 할당된 항목만
+    if not is_admin():
+        filters['assignees'] = [session['username']]
+
+    # 실제 달력 날짜인지 확인 (2024-13-45 같은 값이 DB 캐스팅 오류로 500이 되지 않도록)
+    for key in ('created_from', 'created_until', 'assigned_from', 'assigned_until'):
+        if filters[key]:
+            try:
+                datetime.strptime(filters[key], '%Y-%m-%d')
+            except ValueError:
+                return jsonify({'error': f'{key} 형식이 올바르지 않습니다 (YYYY-MM-DD)'}), 400
+
+    total_mode = request.args.get('total', '')
+    limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+    offset = max(0, request.args.get('offset', 0, type=int))
+
+    try:
+        if total_mode == 'only':
+            result = database.query_tasks(filters, limit=0, include_total=True)
+            return jsonify({'total': result['total']})
+
+        # 조회 직전 이벤트 버전 (이후 task_delta는 이 버전 다음부터 반영)
+        version = database.get_task_version()
+
+        result = database.query_tasks(
+            filters,
+            sort=request.args.get('sort', 'id'),
+            order=request.args.get('order', 'asc'),
+            limit=limit,
+            offset=offset,
+            cursor=request.args.get('cursor') or None,
+            include_total=total_mode == 'true'
+        )
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+
+    result['version'] = version
+    return jsonify(result)
+
 @app.route('/api/items', methods=['POST'])
 def create_item():
     """할일 생성
@@ -606,6 +776,10 @@ def create_item():
         description: 생성된 할일
         schema:
           $ref: '#/definitions/Task'
+      400:
+        description: 제목 또는 내용 누락
+        schema:
+          $ref: '#/definitions/Error'
       403:
         description: 권한 없음 (관리자 전용)
         schema:
@@ -614,14 +788,20 @@ def create_item():
     if not is_admin():
         return jsonify({'error': 'Forbidden'}), 403
 
-    data = load_data()
     new_item = request.json
-    new_item['id'] = database.get_next_id('tasks')
-    new_item['created_at'] = datetime.now().isoformat()
-    data.append(new_item)
-    save_data(data)
+    if not new_item or not new_item.get('title') or not new_item.get('content'):
+        return jsonify({'error': 'Title and content required'}), 400
+
+    # 새 할일 1행만 INSERT (전체 목록 재작성 없음)
+    item = database.create_task(
+        new_item['title'],
+        new_item['content'],
+        new_item.get('assigned_to') or None,
+        new_item.get('status') or '대기중'
+    )
+    publish_task_delta('insert', items=[item])
 
-    return jsonify(new_item), 201
+    return jsonify(item), 201
 
 @app.route('/api/items/<int:item_id>', methods=['PUT'])
 def update_item(item_id):
@@ -672,17 +852,14 @@ def update_item(item_id):
     if not title or not content:
         return jsonify({'error': 'Title and content required'}), 400
 
-    success = database.update_task(item_id, title, content)
+    # 수정된 항목을 UPDATE ... RETURNING으로 바로 반환
+    item = database.update_task(item_id, title, content)
 
-    if success:
-        # 업데이트된 항목 반환
-        data = database.load_data()
-        for item in data:
-            if item['id'] == item_id:
-                return jsonify(item)
+    if not item:
         return jsonify({'error': 'Not found'}), 404
-    else:
-        return jsonify({'error': 'Update failed'}), 500
+
+    publish_task_delta('update', items=[item])
+    return jsonify(item)
 
 @app.route('/api/items/<int:item_id>', methods=['DELETE'])
 def delete_item(item_id):
@@ -711,6 +888,8 @@ def delete_item(item_id):
 
     # 최적화된 delete_task 함수 사용 (개별 삭제)
     success = database.delete_task(item_id)
+    if success:
+        publish_task_delta('delete', ids=[item_id])
 
     return jsonify({'success': success})
 
@@ -742,7 +921,12 @@ def unassign_item(item_id):
         return jsonify({'error': 'Forbidden'}), 403
 
     try:
-        database.update_task_assignment(item_id, None)
+        item = database.update_task_assignment(item_id, None)
+        if item:
+            publish_task_delta('update', items=[item])
+            if item['old_assignee']:
+                socketio.emit('nav_counts_update', calculate_nav_counts(item['old_assignee']),
+                              room=f"user_{item['old_assignee']}")
         return jsonify({'success': True})
     except Exception as e:
         logger.error(f'할일 배정 해제 실패 (item_id={item_id}): {e}', exc_info=True)
@@ -812,17 +996,17 @@ def update_item_status(item_id):
             if row['assigned_to'] != session['username']:
                 return jsonify({'error': 'Forbidden'}), 403
 
-    database.update_task_status(item_id, status)
+    item = database.update_task_status(item_id, status)
+    if not item:
+        return jsonify({'error': 'Not found'}), 404
+
+    publish_task_delta('update', items=[item])
 
     # Socket.IO로 할당자에게 배지 업데이트 전송
-    with database.get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('SELECT assigned_to FROM tasks WHERE id = %s', (item_id,))
-        row = cursor.fetchone()
-        if row and row['assigned_to']:
-            assignee = row['assigned_to']
-            counts = calculate_nav_counts(assignee)
-            socketio.emit('nav_counts_update', counts, room=f'user_{assignee}')
+    if item['assigned_to']:
+        assignee = item['assigned_to']
+        counts = calculate_nav_counts(assignee)
+        socketio.emit('nav_counts_update', counts, room=f'user_{assignee}')
 
     return jsonify({'success': True, 'status': status})
 
@@ -834,16 +1018,13 @@ def update_item_assignment(item_id):
 
     assigned_to = request.json.get('assigned_to')  # None이면 회수
 
-    # 이전 할당자 확인 (배지 업데이트용)
-    old_assignee = None
-    with database.get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('SELECT assigned_to FROM tasks WHERE id = %s', (item_id,))
-        row = cursor.fetchone()
-        if row:
-            old_assignee = row['assigned_to']
+    # 이전 할당자는 UPDATE 결과로 함께 받음 (배지 업데이트용)
+    item = database.update_task_assignment(item_id, assigned_to)
+    if not item:
+        return jsonify({'error': 'Not found'}), 404
 
-    database.update_task_assignment(item_id, assigned_to)
+    old_assignee = item['old_assignee']
+    publish_task_delta('update', items=[item])
 
     # Socket.IO로 배지 업데이트 전송 (이전 할당자 + 새 할당자)
     if old_assignee:
@@ -869,6 +1050,9 @@ def bulk_assign_items():
         return jsonify({'error': 'Invalid parameters'}), 400
 
     try:
+        # 전체 task -> 사용자 매핑을 메모리에서 계산한 뒤 한 번의 UPDATE로 반영
+        assignments = []
+
         if assign_mode == 'random':
             # 랜덤 배정:
             # 1. 먼저 항목 순서를 랜덤하게 섞음
@@ -886,23 +1070,14 @@ def bulk_assign_items():
 
             # 1단계: 균등 분배 (모두에게 동일하게)
             for i, task_id in enumerate(shuffled_tasks[:base_count]):
-                user = users[i % len(users)]
-                database.update_task_assignment(task_id, user)
-
-            logger.info(f"[랜덤배정] 1단계 완료: {base_count}개 균등 배정")
+                assignments.append((task_id, users[i % len(users)]))
 
             # 2단계: 나머지를 랜덤하게 선정된 사람들에게 1개씩 분배
             remainder_tasks = shuffled_tasks[base_count:]
-            logger.info(f"[랜덤배정] 2단계 시작: {len(remainder_tasks)}개 나머지 랜덤 배정")
-
             if remainder_tasks:
                 # 나머지 개수만큼 사람을 랜덤하게 선정 (중복 없이)
                 selected_users = random.sample(users, len(remainder_tasks))
-                for task_id, user in zip(remainder_tasks, selected_users):
-                    database.update_task_assignment(task_id, user)
-                    logger.debug(f"[랜덤배정] 나머지 task_id={task_id} -> {user}")
-
-            logger.info(f"[랜덤배정] 완료: 총 {len(shuffled_tasks)}개 배정")
+                assignments.extend(zip(remainder_tasks, selected_users))
 
         elif assign_mode == 'sequential':
             # 순차 배정: 딱 나누어떨어지는 수만큼만 순차 분배, 나머지는 미배정
@@ -910,13 +1085,23 @@ def bulk_assign_items():
             assignable_count = items_per_person * len(users)
 
             for i, task_id in enumerate(task_ids[:assignable_count]):
-                user = users[i % len(users)]
-                database.update_task_assignment(task_id, user)
+                assignments.append((task_id, users[i % len(users)]))
 
         elif assign_mode == 'individual':
             # 개별 배정: task_ids와 users가 1:1 매칭
-            for task_id, user in zip(task_ids, users):
-                database.update_task_assignment(task_id, user)
+            assignments = list(zip(task_ids, users))
+
+        changed = database.bulk_update_task_assignments(assignments)
+        publish_task_delta('update', items=changed)
+
+        affected_users = {row['assigned_to'] for row in changed}
+        affected_users.update(row['old_assignee'] for row in changed if row['old_assignee'])
+        logger.info(f"[일괄배정] mode={assign_mode}, {len(assignments)}개 배정, 배지 갱신 {len(affected_users)}명")
+
+        # 영향받은 사용자마다 배지 1회 갱신 (이전 담당자 포함)
+        for username in affected_users:
+            invalidate_cache(f'nav_counts:{username}')
+            socketio.emit('nav_counts_update', calculate_nav_counts(username), room=f'user_{username}')
 
         return jsonify({'success': True, 'count': len(task_ids)})
 
@@ -924,10 +1109,147 @@ def bulk_assign_items():
         logger.error(f'일괄 배정 실패: {e}', exc_info=True)
         return jsonify({'error': '일괄 배정 중 오류가 발생했습니다'}), 500
 
+# ==================== 할일 엑셀 일괄 등록 ====================
+
+TASK_UPLOAD_BATCH_SIZE = 1000  # 배치 INSERT 단위 (행)
+TASK_UPLOAD_MAX_ERRORS = 200  # 응답에 포함할 행별 오류 최대 개수
+TASK_UPLOAD_PROGRESS_TTL = 3600  # 진행 상황 보관 시간 (초)
+
+
+def iter_excel_rows(stream: Any, ext: str):
+    """엑셀 행을 순서대로 반환 (첫 행은 헤더)
+
+    xlsx는 openpyxl 읽기 전용 모드로 시트를 스트리밍하고
+    openpyxl이 읽지 못하는 xls만 pandas로 읽음
+    """
+    if ext == 'xlsx':
+        import openpyxl
+        workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+        try:
+            for row in workbook.active.iter_rows(values_only=True):
+                yield row
+        finally:
+            workbook.close()
+    else:
+        df = pd.read_excel(stream, header=None, dtype=object)
+        for row in df.itertuples(index=False, name=None):
+            yield tuple(None if pd.isna(value) else value for value in row)
+
+
+def _cell_text(value: Any) -> str:
+    """엑셀 셀 값을 문자열로 변환 (빈 셀은 빈 문자열)"""
+    if value is None or value is pd.NaT or (isinstance(value, float) and value != value):
+        return ''  # None/NaN/NaT (pandas가 빈 셀을 NaN으로 채운 경우 포함)
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # 숫자 셀 '123.0' 방지
+    return str(value).strip()
+
+
+def _flush_task_upload_batch(cache_key: str, progress: dict[str, Any], assignees: set[str],
+                             batch: list[tuple[Optional[str], str, str]]) -> None:
+    """검증된 행 배치를 한 번에 INSERT 하고 진행 상황 갱신 (다른 워커도 조회하도록 캐시에 기록)"""
+    if not batch:
+        return
+    progress['count'] += database.bulk_insert_tasks(batch)
+    assignees.update(assigned_to for assigned_to, _, _ in batch if assigned_to)
+    batch.clear()
+    app_cache.set(cache_key, progress, ttl=TASK_UPLOAD_PROGRESS_TTL)
+
+
+def run_task_upload(upload_id: str, stream: Any, ext: str) -> None:
+    """엑셀 일괄 등록 처리 (백그라운드 실행, 진행 상황은 app_cache에 기록)"""
+    cache_key = f'task_upload:{upload_id}'
+    # 시작 전에 캐시에서 밀려났으면 처음 상태로 다시 만듦
+    progress = app_cache.get(cache_key) or {
+        'status': 'processing',
+        'processed': 0,
+        'count': 0,
+        'skipped': 0,
+        'errors': []
+    }
+    # 배정된 사용자 (배지 갱신용, JSON으로 캐시되지 않으므로 진행 상황과 분리)
+    assignees: set[str] = set()
+
+    def add_error(row_number: int, message: str) -> None:
+        if len(progress['errors']) < TASK_UPLOAD_MAX_ERRORS:
+            progress['errors'].append({'row': row_number, 'message': message})
+
+    try:
+        rows = iter_excel_rows(stream, ext)
+        header = [_cell_text(value) for value in next(rows, ())]
+
+        # 필수 컬럼 확인
+        required_columns = ['제목', '내용']
+        missing = [col for col in required_columns if col not in header]
+        if missing:
+            raise ValueError(f'필수 컬럼이 없습니다: {", ".join(required_columns)}')
+
+        title_idx = header.index('제목')
+        content_idx = header.index('내용')
+        target_idx = header.index('대상') if '대상' in header else None
+
+        # 대상 사용자명 검증용 (행마다 조회하지 않도록 미리 로드)
+        known_users = set(database.load_users())
+        batch = []
+
+        # 엑셀 기준 행 번호 (헤더가 1행)
+        for row_number, row in enumerate(rows, start=2):
+            progress['processed'] += 1
+            title = _cell_text(row[title_idx]) if title_idx < len(row) else ''
+            content = _cell_text(row[content_idx]) if content_idx < len(row) else ''
+
+            # 제목이 비어있으면 스킵
+            if not title:
+                if any(value is not None for value in row):
+                    add_error(row_number, '제목이 비어있어 건너뜀')
+                progress['skipped'] += 1
+                continue
+
+            # 대상 처리 로직 (존재하지 않는 사용자명은 미배정으로 등록)
+            assigned_to = None
+            if target_idx is not None and target_idx < len(row):
+                target_user = _cell_text(row[target_idx])
+                if target_user in known_users:
+                    assigned_to = target_user
+                elif target_user:
+                    add_error(row_number, f'사용자 "{target_user}"을(를) 찾을 수 없어 미배정으로 등록')
+
+            batch.append((assigned_to, title, content))
+            if len(batch) >= TASK_UPLOAD_BATCH_SIZE:
+                _flush_task_upload_batch(cache_key, progress, assignees, batch)
+                eventlet.sleep(0)  # 같은 워커의 다른 요청/소켓 처리에 양보
+
+        _flush_task_upload_batch(cache_key, progress, assignees, batch)
+        progress['status'] = 'done'
+        logger.info(f"[엑셀등록] {upload_id}: {progress['count']}개 등록, {progress['skipped']}개 건너뜀")
+
+    except ValueError as e:
+        progress['status'] = 'failed'
+        progress['error'] = str(e)
+    except Exception as e:
+        logger.error(f'엑셀 일괄 등록 실패: {e}', exc_info=True)
+        progress['status'] = 'failed'
+        progress['error'] = '파일 처리 중 오류가 발생했습니다'
+    finally:
+        stream.close()
+        # 중간에 실패해도 이미 INSERT된 배치는 반영되어 있으므로 목록/배지 갱신
+        if progress['count']:
+            publish_task_delta('bulk_insert', count=progress['count'])
+        for username in assignees:
+            invalidate_cache(f'nav_counts:{username}')
+            socketio.emit('nav_counts_update', calculate_nav_counts(username), room=f'user_{username}')
+
+        app_cache.set(cache_key, progress, ttl=TASK_UPLOAD_PROGRESS_TTL)
+
+
 @app.route('/api/items/bulk-upload', methods=['POST'])
 @limiter.limit(get_limit_string('upload'))
 def bulk_upload_items():
-    """엑셀 파일로 할일 일괄 등록 (관리자 전용)"""
+    """엑셀 파일로 할일 일괄 등록 (관리자 전용)
+
+    행 단위로 읽어 배치 INSERT 하며, 처리는 백그라운드에서 진행됨
+    응답의 upload_id로 /api/items/bulk-upload/<upload_id> 를 조회해서 진행 상황 확인
+    """
     if not is_admin():
         return jsonify({'error': 'Forbidden'}), 403
 
@@ -947,47 +1269,36 @@ def bulk_upload_items():
     if not validate_file_signature(file.stream, ext):
         return jsonify({'error': '올바른 엑셀 파일이 아닙니다'}), 400
 
-    try:
-        # 엑셀 파일 읽기
-        df = pd.read_excel(file)
-
-        # 필수 컬럼 확인
-        required_columns = ['제목', '내용']
-        if not all(col in df.columns for col in required_columns):
-            return jsonify({'error': f'필수 컬럼이 없습니다: {", ".join(required_columns)}'}), 400
-
-        # 데이터 검증 및 등록
-        added_count = 0
-        skipped_count = 0
+    # 업로드 임시 파일을 복사하지 않고 그대로 넘김
+    # (요청이 끝날 때 request.files가 닫히므로 요청에서 분리, 닫기는 백그라운드 작업이 담당)
+    from io import BytesIO
+    stream = file.stream
+    file.stream = BytesIO()
 
-        for _, row in df.iterrows():
-            title = str(row['제목']).strip() if pd.notna(row['제목']) else ''
-            content = str(row['내용']).strip() if pd.notna(row['내용']) else ''
+    upload_id = uuid.uuid4().hex
+    app_cache.set(f'task_upload:{upload_id}', {
+        'status': 'processing',
+        'processed': 0,
+        'count': 0,
+        'skipped': 0,
+        'errors': []
+    }, ttl=TASK_UPLOAD_PROGRESS_TTL)
 
-            # 제목이 비어있으면 스킵
-            if not title:
-                skipped_count += 1
-                continue
+    socketio.start_background_task(run_task_upload, upload_id, stream, ext)
 
-            # 대상 처리 로직
-            assigned_to = None
-            if '대상' in df.columns and pd.notna(row['대상']):
-                target_user = str(row['대상']).strip()
-                if target_user:  # 빈 문자열이 아닌 경우만 검증
-                    # DB에 사용자가 존재하는지 확인
-                    if database.user_exists(target_user):
-                        assigned_to = target_user
-                    # 존재하지 않는 사용자명은 자동으로 미배정(None)으로 처리
+    return jsonify({'success': True, 'upload_id': upload_id}), 202
 
-            # 개별 삽입 (ID 자동 증가)
-            database.add_task(assigned_to, title, content, '대기중')
-            added_count += 1
+@app.route('/api/items/bulk-upload/<upload_id>', methods=['GET'])
+def get_bulk_upload_progress(upload_id):
+    """엑셀 일괄 등록 진행 상황 조회 (관리자 전용)"""
+    if not is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
 
-        return jsonify({'success': True, 'count': added_count, 'skipped': skipped_count})
+    progress = app_cache.get(f'task_upload:{upload_id}')
+    if not progress:
+        return jsonify({'error': 'Not found'}), 404
 
-    except Exception as e:
-        logger.error(f'엑셀 일괄 등록 실패: {e}', exc_info=True)
-        return jsonify({'error': '파일 처리 중 오류가 발생했습니다'}), 500
+    return jsonify(progress)
 
 @app.route('/api/users/non-admin', methods=['GET'])
 def get_non_admin_users():
@@ -1173,12 +1484,11 @@ def chat_room(chat_id):
     if auth_check:
         return auth_check
 
-    chats = load_chats()
-    if chat_id not in chats:
+    chat_info = database.get_chat_info(chat_id) if str(chat_id).isdigit() else None
+    if not chat_info:
         return "Chat not found", 404
 
     username = session.get('username', 'Admin')
-    chat_info = chats[chat_id]
 
     # 로컬호스트(진짜 서버 관리자)만 모든 채팅방 입장 가능
     # 관리자 계정 포함 일반 사용자는 자신이 참여자인 채팅방만 입장 가능
@@ -1219,54 +1529,20 @@ def get_chats():
       401:
         description: 인증 필요
     """
-    chats = load_chats()
-
     # limit 파라미터: 각 채팅방당 반환할 메시지 개수 (기본값: 1)
-    message_limit = request.args.get('limit', 1, type=int)
+    message_limit = max(0, request.args.get('limit', 1, type=int))
 
     # 로컬호스트(진짜 서버 관리자)만 모든 채팅방 조회 가능
     if is_localhost():
-        # 로컬호스트도 메시지 제한 적용
-        optimized_chats = {}
-        for chat_id, chat_info in chats.items():
-            chat_data = chat_info.copy()
-            if message_limit > 0 and 'messages' in chat_data:
-                chat_data['messages'] = chat_data['messages'][-message_limit:]  # 최신 N개만
-            optimized_chats[chat_id] = chat_data
-        return jsonify(optimized_chats)
+        return jsonify(database.get_chat_summaries(None, message_limit))
 
     if 'username' not in session:
         return jsonify({'error': 'Unauthorized'}), 401
 
     # 관리자 계정 포함 모든 사용자는 자신이 참여한 채팅방만 조회
+    # (마지막 메시지 + 미읽음 수를 최근 활동순으로 단일 쿼리 조회)
     username = session['username']
-    user_chats = {}
-
-    for chat_id, chat_info in chats.items():
-        if username in chat_info['participants']:
-            # 안 읽은 메시지 개수 계산
-            unread_count = 0
-            for msg in chat_info.get('messages', []):
-                read_by = msg.get('read_by', [])
-                # 내가 보낸 메시지가 아니고, 내가 읽지 않은 메시지
-                if msg.get('username') != username and username not in read_by:
-                    unread_count += 1
-
-            # 디버깅 로그
-            if unread_count > 0:
-                logger.debug(f"[DEBUG] 채팅방 {chat_id} ({chat_info.get('title')}): 사용자 {username}의 안 읽은 메시지 = {unread_count}")
-
-            # 채팅방 정보에 unread_count 추가 + 메시지 제한
-            chat_data = chat_info.copy()
-            chat_data['unread_count'] = unread_count
-
-            # 최적화: 채팅 목록용으로는 최신 N개 메시지만 반환
-            if message_limit > 0 and 'messages' in chat_data:
-                chat_data['messages'] = chat_data['messages'][-message_limit:]
-
-            user_chats[chat_id] = chat_data
-
-    return jsonify(user_chats)
+    return jsonify(database.get_chat_summaries(username, message_limit))
 
 @app.route('/api/chats/all', methods=['GET'])
 def get_all_chats():
@@ -1284,15 +1560,11 @@ def create_chat():
         return jsonify({'error': 'Unauthorized'}), 401
 
     try:
-        chats = load_chats()
         new_chat = request.json
 
         if not new_chat:
             return jsonify({'error': '요청 데이터가 없습니다'}), 400
 
-        # 다음 채팅방 ID 가져오기
-        chat_id = str(database.get_next_id('chats'))
-
         creator = session.get('username', 'Admin')
 
         # 참여자 목록에 생성자 포함
@@ -1315,17 +1587,10 @@ def create_chat():
             # 다중 채팅인 경우 제목 필요
             title = new_chat.get('title', 'New Chat')
 
-        chats[chat_id] = {
-            'title': title,
-            'participants': participants,
-            'creator': creator,
-            'messages': [],
-            'is_one_to_one': is_one_to_one,
-            'created_at': datetime.now().isoformat()
-        }
-
-        save_chats(chats)
-        return jsonify({'chat_id': chat_id, 'chat': chats[chat_id]}), 201
+        # 새 채팅방 행만 INSERT (전체 채팅 데이터 재작성 없음)
+        chat = database.create_chat(title, creator, participants)
+        chat_id = str(chat.pop('id'))
+        return jsonify({'chat_id': chat_id, 'chat': chat}), 201
 
     except Exception as e:
         logger.error(f"채팅방 생성 오류: {str(e)}")
@@ -1336,13 +1601,30 @@ def delete_chat(chat_id):
     if not is_admin():
         return jsonify({'error': 'Forbidden'}), 403
 
-    chats = load_chats()
-    if chat_id in chats:
-        del chats[chat_id]
-        save_chats(chats)
+    if str(chat_id).isdigit():
+        database.delete_chat(chat_id)
 
     return jsonify({'success': True})
 
+def check_chat_message_access(chat_id):
+    """채팅방 메시지 API 공통 권한 확인 (실패 시 에러 응답, 통과 시 None)"""
+    if 'username' not in session and not is_localhost():
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    if not str(chat_id).isdigit():
+        return jsonify({'error': 'Chat not found'}), 404
+
+    # 권한 확인: 참여자만 메시지 조회 가능 (로컬호스트는 전체 허용)
+    if not is_localhost():
+        if not database.is_chat_participant(chat_id, session['username']):
+            if not database.chat_exists(chat_id):
+                return jsonify({'error': 'Chat not found'}), 404
+            return jsonify({'error': 'Forbidden'}), 403
+    elif not database.chat_exists(chat_id):
+        return jsonify({'error': 'Chat not found'}), 404
+
+    return None
+
 @app.route('/api/chats/<chat_id>/messages', methods=['GET'])
 def get_chat_messages(chat_id):
     """
@@ -1350,8 +1632,9 @@ def get_chat_messages(chat_id):
 
     Query Parameters:
         - limit: 반환할 메시지 개수 (기본값: 50)
-        - offset: 건너뛸 메시지 개수 (기본값: 0)
         - before_id: 특정 메시지 ID 이전의 메시지만 가져오기 (무한 스크롤용)
+        - after_id: 특정 메시지 ID 이후의 메시지만 가져오기 (재연결 동기화용)
+        - offset: 건너뛸 메시지 개수 (before_id/after_id가 없을 때, 하위 호환)
 
     Returns:
         {
@@ -1360,57 +1643,82 @@ def get_chat_messages(chat_id):
             'has_more': 더 가져올 메시지가 있는지 여부
         }
     """
-    # 로그인 확인
-    if 'username' not in session and not is_localhost():
-        return jsonify({'error': 'Unauthorized'}), 401
+    access_error = check_chat_message_access(chat_id)
+    if access_error:
+        return access_error
 
-    chats = load_chats()
+    # 파라미터 파싱
+    limit = max(1, min(request.args.get('limit', 50, type=int), 200))
+    offset = request.args.get('offset', 0, type=int)
+    before_id = request.args.get('before_id', type=int)  # 무한 스크롤용
+    after_id = request.args.get('after_id', type=int)  # 재연결 동기화용
 
-    if chat_id not in chats:
-        return jsonify({'error': 'Chat not found'}), 404
+    messages, has_more = database.get_chat_messages_page(
+        chat_id, limit=limit, before_id=before_id, after_id=after_id, offset=offset
+    )
+    total = database.get_chat_message_count(chat_id)
 
-    chat_info = chats[chat_id]
+    return jsonify({
+        'messages': messages,
+        'total': total,
+        'has_more': has_more,
+        'offset': offset,
+        'limit': limit
+    })
 
-    # 권한 확인: 참여자만 메시지 조회 가능
-    if not is_localhost():
-        username = session['username']
-        if username not in chat_info['participants']:
-            return jsonify({'error': 'Forbidden'}), 403
+@app.route('/api/chats/search', methods=['GET'])
+@limiter.limit(get_limit_string('search'))
+def search_all_chat_messages():
+    """
+    내가 참여한 모든 채팅방 메시지 검색 API
 
-    # 파라미터 파싱
-    limit = request.args.get('limit', 50, type=int)
-    offset = request.args.get('offset', 0, type=int)
-    before_id = request.args.get('before_id', type=int)  # 무한 스크롤용
+    Query Parameters:
+        - q: 검색어
+        - date_from / date_to: 기간 검색 (YYYY-MM-DD 형식)
+        - sort: time (최신순, 기본값) 또는 relevance (유사도순)
+        - limit: 반환할 결과 개수 (기본값: 50, 최대 200)
+        - offset: 건너뛸 결과 개수 (기본값: 0)
 
-    messages = chat_info.get('messages', [])
-    total = len(messages)
+    Returns:
+        {
+            'results': [{ id, chat_id, chat_title, message, ... }...],
+            'total': 검색 결과 개수 (조건에 맞는 최신 MESSAGE_SEARCH_MAX_RESULTS건까지),
+            'total_capped': 결과 수가 상한에 도달했는지 여부,
+            'has_more': 더 가져올 결과가 있는지 여부
+        }
+    """
+    if 'username' not in session and not is_localhost():
+        return jsonify({'error': 'Unauthorized'}), 401
 
-    # before_id가 있으면 해당 메시지 이전의 메시지만 가져오기
-    if before_id is not None:
-        # 메시지에 ID가 없으면 인덱스를 ID로 사용
-        before_index = None
-        for idx, msg in enumerate(messages):
-            msg_id = msg.get('id', idx)
-            if msg_id == before_id:
-                before_index = idx
-                break
+    query = request.args.get('q', '').strip()
+    date_from = request.args.get('date_from', '')
+    date_to = request.args.get('date_to', '')
+    sort = request.args.get('sort', 'time')
+    limit = max(1, min(request.args.get('limit', 50, type=int), 200))
+    offset = max(0, request.args.get('offset', 0, type=int))
 
-        if before_index is not None:
-            # before_id 이전 메시지들만 선택
-            messages = messages[:before_index]
-            total = len(messages)
+    if not query and not date_from and not date_to:
+        return jsonify({'error': '검색어 또는 날짜를 입력해주세요.'}), 400
 
-    # 오프셋과 리밋 적용 (최신 메시지부터 가져오려면 역순으로)
-    start_idx = max(0, total - offset - limit)
-    end_idx = total - offset
+    try:
+        for date_value in (date_from, date_to):
+            if date_value:
+                datetime.strptime(date_value, '%Y-%m-%d')
+    except ValueError:
+        return jsonify({'error': '날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)'}), 400
 
-    paginated_messages = messages[start_idx:end_idx]
-    has_more = start_idx > 0
+    # 로그인하지 않은 로컬호스트(진짜 서버 관리자)는 전체 채팅방 검색
+    username = session.get('username')
+    results, total, has_more = database.search_user_chat_messages(
+        username, query, date_from, date_to, limit=limit, offset=offset, sort=sort
+    )
 
     return jsonify({
-        'messages': paginated_messages,
+        'results': results,
         'total': total,
+        'total_capped': total >= database.MESSAGE_SEARCH_MAX_RESULTS,
         'has_more': has_more,
+        'query': query,
         'offset': offset,
         'limit': limit
     })
@@ -1424,57 +1732,43 @@ def search_chat_messages(chat_id):
     Query Parameters:
         - q: 검색어 (필수)
         - date: 특정 날짜 검색 (YYYY-MM-DD 형식)
+        - sort: time (시간순, 기본값) 또는 relevance (유사도순)
+        - limit: 반환할 결과 개수 (기본값: 500, 최대 1000)
+        - offset: 건너뛸 결과 개수 (기본값: 0)
 
     Returns:
         {
-            'results': [{ message, index, highlight }...],
-            'total': 검색 결과 개수
+            'results': [{ message, id, ... }...],
+            'total': 검색 결과 개수 (조건에 맞는 최신 MESSAGE_SEARCH_MAX_RESULTS건까지),
+            'total_capped': 결과 수가 상한에 도달했는지 여부,
+            'has_more': 더 가져올 결과가 있는지 여부
         }
     """
-    if 'username' not in session and not is_localhost():
-        return jsonify({'error': 'Unauthorized'}), 401
-
-    chats = load_chats()
-
-    if chat_id not in chats:
-        return jsonify({'error': 'Chat not found'}), 404
-
-    chat_info = chats[chat_id]
-
-    # 권한 확인
-    if not is_localhost():
-        username = session['username']
-        if username not in chat_info['participants']:
-            return jsonify({'error': 'Forbidden'}), 403
+    access_error = check_chat_message_access(chat_id)
+    if access_error:
+        return access_error
 
-    query = request.args.get('q', '').strip().lower()
+    query = request.args.get('q', '').strip()
     date_filter = request.args.get('date', '')  # YYYY-MM-DD 형식
+    sort = request.args.get('sort', 'time')
+    limit = max(1, min(request.args.get('limit', 500, type=int), 1000))
+    offset = max(0, request.args.get('offset', 0, type=int))
 
-    messages = chat_info.get('messages', [])
-    results = []
-
-    for idx, msg in enumerate(messages):
-        msg_text = msg.get('message', '').lower()
-        msg_timestamp = msg.get('timestamp', '')
-        msg_date = msg_timestamp[:10] if msg_timestamp else ''  # YYYY-MM-DD 추출
-
-        # 날짜 필터
-        if date_filter and msg_date != date_filter:
-            continue
-
-        # 검색어 필터 (검색어가 있을 때만)
-        if query and query not in msg_text:
-            continue
+    try:
+        if date_filter:
+            datetime.strptime(date_filter, '%Y-%m-%d')
+    except ValueError:
+        return jsonify({'error': '날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)'}), 400
 
-        # 결과에 추가
-        result_msg = msg.copy()
-        result_msg['index'] = idx
-        result_msg['id'] = msg.get('id', idx)
-        results.append(result_msg)
+    results, total, has_more = database.search_chat_messages_in_room(
+        chat_id, query, date_filter, limit=limit, offset=offset, sort=sort
+    )
 
     return jsonify({
         'results': results,
-        'total': len(results),
+        'total': total,
+        'total_capped': total >= database.MESSAGE_SEARCH_MAX_RESULTS,
+        'has_more': has_more,
         'query': query,
         'date': date_filter
     })
@@ -1484,33 +1778,14 @@ def get_chat_dates(chat_id):
     """
     채팅방에 메시지가 있는 날짜 목록 반환 (캘린더용)
     """
-    if 'username' not in session and not is_localhost():
-        return jsonify({'error': 'Unauthorized'}), 401
-
-    chats = load_chats()
-
-    if chat_id not in chats:
-        return jsonify({'error': 'Chat not found'}), 404
-
-    chat_info = chats[chat_id]
-
-    # 권한 확인
-    if not is_localhost():
-        username = session['username']
-        if username not in chat_info['participants']:
-            return jsonify({'error': 'Forbidden'}), 403
-
-    messages = chat_info.get('messages', [])
-    dates = set()
+    access_error = check_chat_message_access(chat_id)
+    if access_error:
+        return access_error
 
-    for msg in messages:
-        timestamp = msg.get('timestamp', '')
-        if timestamp:
-            date = timestamp[:10]  # YYYY-MM-DD
-            dates.add(date)
+    dates = database.get_chat_message_dates(chat_id)
 
     return jsonify({
-        'dates': sorted(list(dates)),
+        'dates': dates,
         'total': len(dates)
     })
 
@@ -1533,52 +1808,18 @@ def get_message_context(chat_id, msg_id):
             'has_more_after': 더 이후 메시지가 있는지
         }
     """
-    if 'username' not in session and not is_localhost():
-        return jsonify({'error': 'Unauthorized'}), 401
-
-    chats = load_chats()
-
-    if chat_id not in chats:
-        return jsonify({'error': 'Chat not found'}), 404
-
-    chat_info = chats[chat_id]
-
-    # 권한 확인
-    if not is_localhost():
-        username = session['username']
-        if username not in chat_info['participants']:
-            return jsonify({'error': 'Forbidden'}), 403
-
-    before = int(request.args.get('before', 25))
-    after = int(request.args.get('after', 25))
-
-    messages = chat_info.get('messages', [])
+    access_error = check_chat_message_access(chat_id)
+    if access_error:
+        return access_error
 
-    # 메시지 ID로 인덱스 찾기
-    target_index = -1
-    for idx, msg in enumerate(messages):
-        if msg.get('id') == msg_id:
-            target_index = idx
-            break
+    before = min(request.args.get('before', 25, type=int), 200)
+    after = min(request.args.get('after', 25, type=int), 200)
 
-    if target_index == -1:
+    context = database.get_chat_message_context(chat_id, msg_id, before, after)
+    if context is None:
         return jsonify({'error': 'Message not found'}), 404
 
-    # 시작/끝 인덱스 계산
-    start_index = max(0, target_index - before)
-    end_index = min(len(messages), target_index + after + 1)
-
-    # 메시지 슬라이스
-    context_messages = messages[start_index:end_index]
-
-    return jsonify({
-        'messages': context_messages,
-        'target_index': target_index - start_index,  # context_messages 내에서의 인덱스
-        'first_msg_index': start_index,  # 전체 대화에서 첫 메시지 인덱스
-        'total_messages': len(messages),
-        'has_more_before': start_index > 0,
-        'has_more_after': end_index < len(messages)
-    })
+    return jsonify(context)
 
 
 # ==================== 채팅방 설정 API ====================
@@ -1841,10 +2082,7 @@ def search_users():
     users = set(load_users())  # 로그인한 사용자들
 
     # 항목에 할당된 사용자도 추가
-    data = load_data()
-    for item in data:
-        if item.get('assigned_to'):  # None이 아닌 경우만 추가
-            users.add(item['assigned_to'])
+    users.update(database.get_assigned_usernames())
 
     # 관리자 계정도 추가
     users.update(get_admin_accounts())
@@ -1871,11 +2109,88 @@ def on_join_user_room(data):
     username = data['username']
     join_room(f'user_{username}')
 
+@socketio.on('join_admin_tasks')
+def on_join_admin_tasks(data=None):
+    """관리자 할일 변경 이벤트 room에 join (관리자만)"""
+    if not is_admin():
+        return
+    join_room(TASK_EVENTS_ROOM)
+
 @socketio.on('leave')
 def on_leave(data):
     chat_id = data['chat_id']
     leave_room(chat_id)
 
+# ==================== 채팅 메시지 알림 팬아웃 ====================
+
+def dispatch_message_fanout(chat_id, sender, message):
+    """새 메시지를 참여자들에게 팬아웃 (전역 알림, 네비게이션 배지, 푸시)
+
+    참여자 설정/배지 카운트/푸시 구독 여부를 한 번에 조회하고
+    계산된 배지는 nav_counts 캐시에 바로 저장해서 재조회를 막음
+    푸시는 발송 대기열(push_outbox)에 한 번에 추가하고 배달 워커가 발송
+    """
+    try:
+        targets = database.get_chat_fanout_targets(chat_id)
+    except Exception as e:
+        logger.error(f'알림 대상 조회 실패 (chat_id={chat_id}): {e}')
+        return
+
+    if not targets:
+        return
+
+    participants = targets['participants']
+    is_one_to_one = len(participants) == 2
+    admin_accounts = get_admin_accounts()
+    preview = message[:100]
+    push_jobs = []
+    nav_counts = {}
+    push_data = {
+        'type': 'chat',
+        'chatId': chat_id,
+        'url': f'/chat/{chat_id}'
+    }
+
+    for target in participants:
+        participant = target['username']
+        if participant == sender:  # 보낸 사람 제외
+            continue
+
+        emit('global_new_message', {
+            'chat_id': chat_id,
+            'chat_title': targets['title'],
+            'sender': sender,
+            'message': preview,
+            'is_one_to_one': is_one_to_one
+        }, room=f'user_{participant}')
+
+        # 네비게이션 배지 (calculate_nav_counts와 같은 규칙: 관리자는 할일 배지 없음)
+        participant_counts = {
+            'pending_tasks': 0 if participant in admin_accounts else target['pending_tasks'],
+            'unread_chats': target['unread_chats']
+        }
+        nav_counts[f'nav_counts:{participant}'] = participant_counts
+        emit('nav_counts_update', participant_counts, room=f'user_{participant}')
+
+        # 푸시 알림 (구독이 있는 참여자만)
+        if target['has_push_subscription']:
+            push_jobs.append((
+                participant,
+                f'{sender}님의 메시지',
+                preview if target['chat_push_preview'] else '새 메시지가 있습니다.',
+                push_data
+            ))
+
+    # 참여자 배지 캐시를 한 번에 기록 (Redis 왕복 1회)
+    app_cache.set_many(nav_counts, ttl=10)
+
+    # 푸시 알림 발송 대기열에 일괄 추가
+    if push_jobs:
+        try:
+            push_helper.enqueue_push_batch(push_jobs)
+        except Exception as e:
+            logger.error(f'푸시 알림 대기열 추가 실패: {e}')
+
 @socketio.on('send_message')
 def handle_message(data):
     chat_id = data['chat_id']
@@ -1909,60 +2224,8 @@ def handle_message(data):
     # 방의 모든 사용자에게 브로드캐스트
     emit('new_message', msg_obj, room=chat_id)
 
-    # 채팅방 정보 조회 (최적화: 필요한 정보만 조회)
-    chat_info = database.get_chat_info(chat_id)
-    if not chat_info:
-        return
-
-    # 채팅 참여자들에게 알림 브로드캐스트
-    for participant in chat_info['participants']:
-        if participant != username:  # 보낸 사람 제외
-            emit('global_new_message', {
-                'chat_id': chat_id,
-                'chat_title': chat_info['title'],
-                'sender': username,
-                'message': message[:100],
-                'is_one_to_one': len(chat_info['participants']) == 2
-            }, room=f'user_{participant}')
-
-            # 캐시 무효화 후 네비게이션 배지 업데이트
-            invalidate_cache(f'nav_counts:{participant}')
-            participant_counts = calculate_nav_counts(participant)
-            emit('nav_counts_update', participant_counts, room=f'user_{participant}')
-
-            # 푸시 알림 발송 (백그라운드)
-            target_user = participant  # 클로저 문제 방지
-            sender_name = username  # 클로저 문제 방지
-            msg_preview = message[:100]  # 클로저 문제 방지
-
-            def send_push_async(target=target_user, sender=sender_name, preview=msg_preview):
-                try:
-                    # 사용자 설정 확인 (내용 표시 여부)
-                    show_preview = True
-                    try:
-                        with database.get_db_connection() as conn:
-                            cur = conn.cursor()
-                            cur.execute("SELECT chat_push_preview FROM users WHERE username = %s", (target,))
-                            row = cur.fetchone()
-                            if row and row['chat_push_preview'] is not None:
-                                show_preview = row['chat_push_preview']
-                    except Exception:
-                        pass  # 설정 조회 실패 시 기본값(표시) 사용
-
-                    push_helper.send_push_notification(
-                        username=target,
-                        title=f'{sender}님의 메시지',
-                        body=preview if show_preview else '새 메시지가 있습니다.',
-                        data={
-                            'type': 'chat',
-                            'chatId': chat_id,
-                            'url': f'/chat/{chat_id}'
-                        }
-                    )
-                except Exception as e:
-                    logger.error(f'푸시 알림 발송 실패: {e}')
-
-            threading.Thread(target=send_push_async).start()
+    # 참여자 알림/배지/푸시를 일괄 처리 (참여자 수와 무관하게 쿼리 1회)
+    dispatch_message_fanout(chat_id, username, message)
 
 @socketio.on('typing_start')
 def handle_typing_start(data):
@@ -1978,41 +2241,93 @@ def handle_typing_stop(data):
     # 같은 방의 다른 사용자들에게 타이핑 중지 알림
     emit('user_typing_stop', {'username': username}, room=chat_id, include_self=False)
 
+# ==================== 읽음 이벤트 일괄 처리 (write-behind) ====================
+
+# 읽음 이벤트를 모아서 반영하는 주기 (초)
+READ_RECEIPT_FLUSH_DELAY = 0.2
+# DB 반영 실패 시 다시 시도하기까지 대기 시간 (초)
+READ_RECEIPT_RETRY_DELAY = 2
+# (chat_id, username) -> 읽은 마지막 메시지 ID (None이면 채팅방 전체 읽음)
+_read_receipt_buffer: dict[tuple[str, str], Optional[int]] = {}
+_read_receipt_lock = threading.Lock()
+_read_receipt_flush_scheduled = False
+
+def _merge_read_receipt(key, message_id):
+    """버퍼에 읽음 이벤트 합치기 (가장 큰 메시지 ID 유지, _read_receipt_lock 안에서 호출)"""
+    if key in _read_receipt_buffer:
+        previous = _read_receipt_buffer[key]
+        if previous is None or message_id is None:
+            _read_receipt_buffer[key] = None
+        else:
+            _read_receipt_buffer[key] = max(previous, message_id)
+    else:
+        _read_receipt_buffer[key] = message_id
+
+def _schedule_read_receipt_flush(delay):
+    """버퍼 반영 예약 (이미 예약되어 있으면 무시, _read_receipt_lock 안에서 호출)"""
+    global _read_receipt_flush_scheduled
+    if not _read_receipt_flush_scheduled:
+        _read_receipt_flush_scheduled = True
+        eventlet.spawn_after(delay, flush_read_receipts)
+
+def queue_read_receipt(chat_id, username, message_id=None):
+    """읽음 이벤트를 버퍼에 추가 (같은 채팅방/사용자의 이벤트는 가장 큰 메시지 ID로 합침)"""
+    with _read_receipt_lock:
+        _merge_read_receipt((str(chat_id), username), message_id)
+        _schedule_read_receipt_flush(READ_RECEIPT_FLUSH_DELAY)
+
+def flush_read_receipts():
+    """버퍼의 읽음 이벤트를 한 번에 DB 반영 후 채팅방별로 묶어서 브로드캐스트"""
+    global _read_receipt_buffer, _read_receipt_flush_scheduled
+    with _read_receipt_lock:
+        entries = _read_receipt_buffer
+        _read_receipt_buffer = {}
+        _read_receipt_flush_scheduled = False
+
+    if not entries:
+        return
+
+    try:
+        moved = database.apply_read_watermarks(
+            [(chat_id, username, message_id) for (chat_id, username), message_id in entries.items()]
+        )
+    except Exception as e:
+        # 유실되지 않도록 버퍼에 되돌리고 잠시 후 다시 시도 (그 사이 들어온 이벤트와 합침)
+        logger.error(f'읽음 처리 실패 ({len(entries)}건), {READ_RECEIPT_RETRY_DELAY}초 후 재시도: {e}')
+        with _read_receipt_lock:
+            for key, message_id in entries.items():
+                _merge_read_receipt(key, message_id)
+            _schedule_read_receipt_flush(READ_RECEIPT_RETRY_DELAY)
+        return
+
+    # 채팅방별 읽음 상태 변경 1회 브로드캐스트
+    readers_by_chat: dict[str, list[dict[str, Any]]] = {}
+    for row in moved:
+        readers_by_chat.setdefault(str(row['chat_id']), []).append({
+            'username': row['username'],
+            'last_read_message_id': row['last_read_message_id']
+        })
+
+    for chat_id, readers in readers_by_chat.items():
+        socketio.emit('read_receipt_update', {
+            'chat_id': chat_id,
+            'readers': readers
+        }, room=chat_id)
+
+    # 워터마크가 바뀐 사용자만 네비게이션 배지 업데이트
+    for username in {row['username'] for row in moved}:
+        invalidate_cache(f'nav_counts:{username}')
+        socketio.emit('nav_counts_update', calculate_nav_counts(username), room=f'user_{username}')
+
 @socketio.on('mark_as_read')
 def handle_mark_as_read(data):
-    """메시지를 읽음으로 표시 (최적화: 직접 DB 업데이트 + 캐시 무효화)"""
+    """메시지를 읽음으로 표시 (짧은 주기로 모아서 일괄 반영)"""
     chat_id = data['chat_id']
     username = data['username']
     message_id = data.get('message_id')  # 특정 메시지 ID (옵션)
 
     try:
-        if message_id is not None:
-            # 특정 메시지만 읽음 처리
-            database.mark_single_message_as_read(chat_id, message_id, username)
-            # 읽음 상태 조회
-            read_by = database.get_message_read_by(message_id)
-            emit('read_receipt_update', {
-                'chat_id': chat_id,
-                'username': username,
-                'message_id': message_id,
-                'read_by': read_by
-            }, room=chat_id, include_self=False)
-        else:
-            # 모든 메시지를 읽음 처리 (최적화된 함수 사용)
-            affected = database.mark_messages_as_read(chat_id, username)
-            logger.debug(f'채팅방 {chat_id}에서 {affected}개 메시지 읽음 처리 by {username}')
-
-            emit('read_receipt_update', {
-                'chat_id': chat_id,
-                'username': username,
-                'message_id': None,
-                'all_messages_read': True
-            }, room=chat_id, include_self=False)
-
-        # 캐시 무효화 후 네비게이션 배지 업데이트
-        invalidate_cache(f'nav_counts:{username}')
-        user_counts = calculate_nav_counts(username)
-        emit('nav_counts_update', user_counts, room=f'user_{username}')
+        queue_read_receipt(chat_id, username, int(message_id) if message_id is not None else None)
     except Exception as e:
         logger.error(f'읽음 처리 실패 (chat_id={chat_id}): {e}')
 
@@ -2157,41 +2472,80 @@ def promotions_page():
                          page_title='프로모션 게시판',
                          current_page='promotions')
 
+def promotion_catalog_response(payload_fn, fallback_fn):
+    """
+    프로모션 카탈로그 스냅샷 기반 응답 (버전 ETag, 변경 없으면 304)
+
+    Args:
+        payload_fn: 스냅샷을 받아 응답 데이터를 만드는 함수
+        fallback_fn: 스냅샷이 아직 없을 때(워커 시작 직후 빌드 중) SQL로 응답 데이터를 만드는 함수
+    """
+    snapshot = promotion_catalog.get_snapshot(wait=False)
+    if snapshot is None:
+        return jsonify(fallback_fn())
+
+    etag = generate_etag(f'{snapshot.version}:{request.full_path}')
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(payload_fn(snapshot))
+    response.set_etag(etag)
+    return response
+
 @app.route('/api/promotions', methods=['GET'])
 def get_promotions():
     if 'username' not in session:
         return jsonify({'error': 'Unauthorized'}), 401
 
-    promotions = load_promotions()
-
-    # 필터링 (쿼리 파라미터)
-    category = request.args.get('category')
-    product_name = request.args.get('product_name')
-    channel = request.args.get('channel')
-    promotion_name = request.args.get('promotion_name')
-    search = request.args.get('search')
-
-    filtered = promotions
-
-    if category:
-        filtered = [p for p in filtered if p.get('category') == category]
-    if product_name:
-        filtered = [p for p in filtered if p.get('product_name') == product_name]
-    if channel:
-        filtered = [p for p in filtered if p.get('channel') == channel]
-    if promotion_name:
-        filtered = [p for p in filtered if p.get('promotion_name') == promotion_name]
-    if search:
-        # 검색어로 모든 필드 검색
-        search_lower = search.lower()
-        filtered = [p for p in filtered if
-                   search_lower in str(p.get('product_name', '')).lower() or
-                   search_lower in str(p.get('channel', '')).lower() or
-                   search_lower in str(p.get('promotion_name', '')).lower() or
-                   search_lower in str(p.get('promotion_code', '')).lower() or
-                   search_lower in str(p.get('content', '')).lower()]
-
-    return jsonify(filtered)
+    # 필터/검색/페이지를 메모리 카탈로그(facet 역인덱스)로 처리 (카탈로그 준비 전에는 SQL)
+    filters = {
+        'category': request.args.get('category'),
+        'product_name': request.args.get('product_name'),
+        'channel': request.args.get('channel'),
+        'promotion_name': request.args.get('promotion_name'),
+        'subscription_type': request.args.get('subscription_type'),
+        'search': (request.args.get('search') or '').strip(),
+        'active_on': request.args.get('active_on'),
+        'not_ended_on': request.args.get('not_ended_on'),
+    }
+
+    for key in ('active_on', 'not_ended_on'):
+        if filters[key] and not re.match(r'^\d{4}-\d{2}-\d{2}$', filters[key]):
+            return jsonify({'error': f'{key} 형식이 올바르지 않습니다 (YYYY-MM-DD)'}), 400
+
+    # page/limit이 없으면 조건에 맞는 전체 목록(배열) 반환
+    if 'page' not in request.args and 'limit' not in request.args:
+        return promotion_catalog_response(lambda snapshot: snapshot.query(filters),
+                                          lambda: database.query_promotions(filters)['items'])
+
+    limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+    page = max(1, request.args.get('page', 1, type=int))
+    include_facets = request.args.get('facets') in ('1', 'true')
+
+    def build_page(snapshot):
+        matched = snapshot.query(filters)
+        result = {
+            'items': matched[(page - 1) * limit:page * limit],
+            'total': len(matched),
+            'page': page,
+            'limit': limit
+        }
+        if include_facets:
+            result['facets'] = snapshot.facet_counts(matched)
+        return result
+
+    def query_page():
+        result = database.query_promotions(
+            filters,
+            limit=limit,
+            offset=(page - 1) * limit,
+            include_total=True,
+            include_facets=include_facets
+        )
+        result.update(page=page, limit=limit)
+        return result
+
+    return promotion_catalog_response(build_page, query_page)
 
 @app.route('/api/promotions', methods=['POST'])
 def create_promotion():
@@ -2206,10 +2560,7 @@ def create_promotion():
         if not data.get(field):
             return jsonify({'error': f'{field}는 필수 항목입니다'}), 400
 
-    promotions = load_promotions()
-
     new_promotion = {
-        'id': database.get_next_id('promotions'),
         'category': data['category'],
         'product_name': data['product_name'],
         'channel': data['channel'],
@@ -2220,24 +2571,20 @@ def create_promotion():
         'promotion_code': data.get('promotion_code', ''),
         'content': data['content'],
         'start_date': data['start_date'],
-        'end_date': data.get('end_date', '무기한'),
-        'created_at': datetime.now().isoformat(),
-        'updated_at': datetime.now().isoformat(),
-        'created_by': session['username']
+        'end_date': data.get('end_date', '무기한')
     }
 
-    promotions.append(new_promotion)
-    save_promotions(promotions)
+    # 새 프로모션 1행만 INSERT
+    promo_id = database.insert_promotions([new_promotion], session['username'])[0]
 
-    return jsonify(new_promotion), 201
+    return jsonify(database.get_promotion(promo_id)), 201
 
 @app.route('/api/promotions/<int:promo_id>', methods=['GET'])
 def get_promotion(promo_id):
     if 'username' not in session:
         return jsonify({'error': 'Unauthorized'}), 401
 
-    promotions = load_promotions()
-    promo = next((p for p in promotions if p.get('id') == promo_id), None)
+    promo = database.get_promotion(promo_id)
 
     if not promo:
         return jsonify({'error': 'Not found'}), 404
@@ -2250,45 +2597,41 @@ def update_promotion(promo_id):
         return jsonify({'error': 'Forbidden'}), 403
 
     data = request.json
-    promotions = load_promotions()
-
-    for i, p in enumerate(promotions):
-        if p.get('id') == promo_id:
-            # 필수 값 검증
-            required_fields = ['category', 'product_name', 'channel', 'promotion_name', 'content', 'start_date']
-            for field in required_fields:
-                if field in data and not data[field]:
-                    return jsonify({'error': f'{field}는 필수 항목입니다'}), 400
-
-            # 업데이트
-            promotions[i].update({
-                'category': data.get('category', p.get('category', '안마의자')),
-                'product_name': data.get('product_name', p['product_name']),
-                'channel': data.get('channel', p['channel']),
-                'promotion_name': data.get('promotion_name', p['promotion_name']),
-                'discount_amount': data.get('discount_amount', p.get('discount_amount', '')),
-                'session_exemption': data.get('session_exemption', p.get('session_exemption', '')),
-                'subscription_types': data.get('subscription_types', p.get('subscription_types', [])),
-                'promotion_code': data.get('promotion_code', p.get('promotion_code', '')),
-                'content': data.get('content', p['content']),
-                'start_date': data.get('start_date', p['start_date']),
-                'end_date': data.get('end_date', p.get('end_date', '무기한')),
-                'updated_at': datetime.now().isoformat()
-            })
+    p = database.get_promotion(promo_id)
+    if not p:
+        return jsonify({'error': 'Not found'}), 404
 
-            save_promotions(promotions)
-            return jsonify(promotions[i])
+    # 필수 값 검증
+    required_fields = ['category', 'product_name', 'channel', 'promotion_name', 'content', 'start_date']
+    for field in required_fields:
+        if field in data and not data[field]:
+            return jsonify({'error': f'{field}는 필수 항목입니다'}), 400
+
+    # 업데이트
+    p.update({
+        'category': data.get('category', p.get('category', '안마의자')),
+        'product_name': data.get('product_name', p['product_name']),
+        'channel': data.get('channel', p['channel']),
+        'promotion_name': data.get('promotion_name', p['promotion_name']),
+        'discount_amount': data.get('discount_amount', p.get('discount_amount', '')),
+        'session_exemption': data.get('session_exemption', p.get('session_exemption', '')),
+        'subscription_types': data.get('subscription_types', p.get('subscription_types', [])),
+        'promotion_code': data.get('promotion_code', p.get('promotion_code', '')),
+        'content': data.get('content', p['content']),
+        'start_date': data.get('start_date', p['start_date']),
+        'end_date': data.get('end_date', p.get('end_date', '무기한'))
+    })
 
-    return jsonify({'error': 'Not found'}), 404
+    # 해당 프로모션 1행만 UPDATE
+    database.update_promotions([p])
+    return jsonify(database.get_promotion(promo_id))
 
 @app.route('/api/promotions/<int:promo_id>', methods=['DELETE'])
 def delete_promotion(promo_id):
     if not is_admin():
         return jsonify({'error': 'Forbidden'}), 403
 
-    promotions = load_promotions()
-    promotions = [p for p in promotions if p.get('id') != promo_id]
-    save_promotions(promotions)
+    database.delete_promotions([promo_id])
 
     return jsonify({'success': True})
 
@@ -2298,34 +2641,11 @@ def get_promotion_filters():
     if 'username' not in session:
         return jsonify({'error': 'Unauthorized'}), 401
 
-    promotions = load_promotions()
-
-    categories = list(set(p.get('category') for p in promotions if p.get('category')))
-    products = list(set(p.get('product_name') for p in promotions if p.get('product_name')))
-    channels = list(set(p.get('channel') for p in promotions if p.get('channel')))
-    promo_names = list(set(p.get('promotion_name') for p in promotions if p.get('promotion_name')))
-
-    # 대분류별 상품 매핑 생성
-    category_products = {}
-    for promo in promotions:
-        cat = promo.get('category')
-        prod = promo.get('product_name')
-        if cat and prod:
-            if cat not in category_products:
-                category_products[cat] = set()
-            category_products[cat].add(prod)
-
-    # set을 list로 변환하고 정렬
-    for cat in category_products:
-        category_products[cat] = sorted(list(category_products[cat]))
-
-    return jsonify({
-        'categories': sorted(categories),
-        'products': sorted(products),
-        'channels': sorted(channels),
-        'promotion_names': sorted(promo_names),
-        'category_products': category_products  # 대분류별 상품 매핑 추가
-    })
+    # 카탈로그 스냅샷에서 미리 계산된 값 사용
+    return promotion_catalog_response(
+        lambda snapshot: snapshot.filters,
+        lambda: promotion_catalog.build_filters(database.get_promotion_filter_values())
+    )
 
 @app.route('/api/promotions/template', methods=['GET'])
 def download_promotion_template():
@@ -2543,10 +2863,190 @@ def download_promotion_template():
         download_name='프로모션_일괄등록_양식.xlsx'
     )
 
+# ==================== 프로모션 엑셀 일괄 등록 ====================
+
+PROMOTION_UPLOAD_HEADER_ROW = 17  # 양식의 헤더 행 (데이터는 다음 행부터)
+PROMOTION_UPLOAD_BATCH_SIZE = 1000  # 일괄 검증 단위 (행)
+PROMOTION_UPLOAD_MAX_ERRORS = 200  # 응답에 포함할 행별 오류 최대 개수
+
+# 양식 컬럼 순서 (필드, 헤더)
+PROMOTION_UPLOAD_COLUMNS = (
+    ('category', '대분류'),
+    ('product_name', '상품명'),
+    ('channel', '채널'),
+    ('promotion_name', '프로모션명'),
+    ('discount_amount', '금액할인'),
+    ('session_exemption', '회차면제'),
+    ('subscription_types', '중복여부'),
+    ('promotion_code', '프로모션코드'),
+    ('content', '프로모션내용'),
+    ('start_date', '시작일'),
+    ('end_date', '종료일'),
+)
+PROMOTION_UPLOAD_REQUIRED = ('category', 'product_name', 'channel', 'promotion_name', 'content', 'start_date')
+PROMOTION_SUBSCRIPTION_TYPES = ('기존', '결합', '지인')
+
+
+def iter_promotion_upload_rows(stream: Any, ext: str):
+    """프로모션 양식의 데이터 행을 (엑셀 행 번호, 값 튜플)로 반환
+
+    헤더(17행)가 양식과 다르면 ValueError
+    빈 행과 주의사항(※) 행은 건너뜀
+    """
+    rows = iter_excel_rows(stream, ext)
+    header_row = next(islice(rows, PROMOTION_UPLOAD_HEADER_ROW - 1, None), None) or ()
+
+    # 헤더 검증 (* 제거 후 비교)
+    headers = [_cell_text(value).replace(' *', '').strip() for value in header_row]
+    if headers[:len(PROMOTION_UPLOAD_COLUMNS)] != [label for _, label in PROMOTION_UPLOAD_COLUMNS]:
+        raise ValueError('엑셀 양식이 올바르지 않습니다. 제공된 양식을 사용해주세요.')
+
+    width = len(PROMOTION_UPLOAD_COLUMNS)
+    for row_number, row in enumerate(rows, start=PROMOTION_UPLOAD_HEADER_ROW + 1):
+        row = tuple(row[:width]) + (None,) * (width - len(row))
+        if all(value is None or _cell_text(value) == '' for value in row):
+            continue
+        if _cell_text(row[0]).startswith('※'):
+            continue
+        yield row_number, row
+
+
+def _excel_date_column(values: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """날짜 컬럼 일괄 변환
+
+    날짜 셀, 'YYYY-MM-DD'/'YYYY.MM.DD' 등 문자열, 엑셀 일련번호를 모두 처리
+
+    Returns:
+        ('YYYY-MM-DD' 문자열 Series (빈 셀은 NaN), 변환 실패 여부 Series)
+    """
+    filled = values.map(_cell_text) != ''
+    serial = filled & values.map(lambda value: isinstance(value, (int, float)) and not isinstance(value, bool))
+
+    parsed = pd.to_datetime(values.where(filled & ~serial), errors='coerce', format='mixed')
+    if serial.any():
+        parsed[serial] = pd.to_datetime(values[serial].astype(float), unit='D',
+                                        origin='1899-12-30', errors='coerce')
+
+    return parsed.dt.strftime('%Y-%m-%d'), filled & parsed.isna()
+
+
+def _validate_promotion_batch(row_numbers: list[int], rows: list[tuple]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    프로모션 행 배치를 컬럼 단위로 정규화하고 검증
+
+    Args:
+        row_numbers: 엑셀 행 번호
+        rows: 양식 컬럼 순서의 셀 값 튜플
+
+    Returns:
+        (정상 프로모션 목록, 행별 오류 [{row, fields, message}])
+    """
+    fields = [field for field, _ in PROMOTION_UPLOAD_COLUMNS]
+    labels = dict(PROMOTION_UPLOAD_COLUMNS)
+    # dtype=object: 빈 셀(None)이 숫자 컬럼에서 NaN으로 바뀌지 않도록
+    frame = pd.DataFrame(rows, columns=fields, dtype=object)
+    text = frame.apply(lambda column: column.map(_cell_text))
+
+    # 필수 항목
+    missing = text[list(PROMOTION_UPLOAD_REQUIRED)] == ''
+
+    # 날짜 (종료일 비어있으면 무기한)
+    start_dates, start_invalid = _excel_date_column(frame['start_date'])
+    unlimited = text['end_date'].isin(['', '무기한'])
+    end_dates, end_invalid = _excel_date_column(frame['end_date'].where(~unlimited, None))
+    end_dates = end_dates.where(~unlimited, '무기한')
+    reversed_dates = ~unlimited & start_dates.notna() & end_dates.notna() & (end_dates < start_dates)
+
+    # 중복여부: 콤마 구분, 허용 값만
+    subscription_types = text['subscription_types'].str.split(',').map(
+        lambda values: [value.strip() for value in values if value.strip()])
+    unknown_types = subscription_types.map(
+        lambda values: [value for value in values if value not in PROMOTION_SUBSCRIPTION_TYPES])
+
+    promotions = []
+    errors = []
+    for i, row_number in enumerate(row_numbers):
+        messages = []
+        error_fields = [field for field in PROMOTION_UPLOAD_REQUIRED if missing.iat[i, missing.columns.get_loc(field)]]
+        if error_fields:
+            messages.append('필수 항목 누락: ' + ', '.join(labels[field] for field in error_fields))
+        if start_invalid.iat[i]:
+            error_fields.append('start_date')
+            messages.append(f"시작일 형식이 올바르지 않습니다: {text['start_date'].iat[i]}")
+        if end_invalid.iat[i]:
+            error_fields.append('end_date')
+            messages.append(f"종료일 형식이 올바르지 않습니다: {text['end_date'].iat[i]}")
+        if reversed_dates.iat[i]:
+            error_fields.append('end_date')
+            messages.append('종료일이 시작일보다 빠릅니다')
+        if unknown_types.iat[i]:
+            error_fields.append('subscription_types')
+            messages.append(f"중복여부는 {'/'.join(PROMOTION_SUBSCRIPTION_TYPES)}만 가능합니다: "
+                            + ', '.join(unknown_types.iat[i]))
+
+        if messages:
+            errors.append({'row': row_number, 'fields': error_fields, 'message': '; '.join(messages)})
+            continue
+
+        promotions.append({
+            'category': text['category'].iat[i],
+            'product_name': text['product_name'].iat[i],
+            'channel': text['channel'].iat[i],
+            'promotion_name': text['promotion_name'].iat[i],
+            'discount_amount': text['discount_amount'].iat[i],
+            'session_exemption': text['session_exemption'].iat[i],
+            'subscription_types': subscription_types.iat[i],
+            'promotion_code': text['promotion_code'].iat[i],
+            'content': text['content'].iat[i],
+            'start_date': start_dates.iat[i],
+            'end_date': end_dates.iat[i]
+        })
+
+    return promotions, errors
+
+
+def parse_promotion_upload(stream: Any, ext: str) -> dict[str, Any]:
+    """
+    프로모션 엑셀 파싱 (읽기 전용 스트리밍 + 배치 검증)
+
+    오류가 하나라도 나오면 이후 정상 행은 보관하지 않음 (오류 보고만 계속)
+
+    Returns:
+        dict: {promotions, errors(최대 PROMOTION_UPLOAD_MAX_ERRORS), error_count, row_count}
+    """
+    result = {'promotions': [], 'errors': [], 'error_count': 0, 'row_count': 0}
+    row_numbers, rows = [], []
+
+    def flush() -> None:
+        promotions, errors = _validate_promotion_batch(row_numbers, rows)
+        result['error_count'] += len(errors)
+        result['errors'].extend(errors[:PROMOTION_UPLOAD_MAX_ERRORS - len(result['errors'])])
+        if result['error_count']:
+            result['promotions'].clear()
+        else:
+            result['promotions'].extend(promotions)
+        row_numbers.clear()
+        rows.clear()
+
+    for row_number, row in iter_promotion_upload_rows(stream, ext):
+        result['row_count'] += 1
+        row_numbers.append(row_number)
+        rows.append(row)
+        if len(rows) >= PROMOTION_UPLOAD_BATCH_SIZE:
+            flush()
+    if rows:
+        flush()
+
+    return result
+
+
 @app.route('/api/promotions/bulk-upload', methods=['POST'])
 @limiter.limit(get_limit_string('upload'))
 def bulk_upload_promotions():
-    """엑셀 파일을 파싱하여 JSON 형태로 반환 (저장하지 않음)"""
+    """엑셀 파일을 파싱하여 JSON 형태로 반환 (저장하지 않음)
+
+    오류가 있으면 400과 함께 행별 오류 목록(errors: [{row, fields, message}])을 반환
+    """
     if not is_admin():
         return jsonify({'error': 'Forbidden'}), 403
 
@@ -2566,102 +3066,32 @@ def bulk_upload_promotions():
         return jsonify({'error': '올바른 엑셀 파일이 아닙니다'}), 400
 
     try:
-        from openpyxl import load_workbook
-        from io import BytesIO
-
-        # 파일을 메모리에 로드
-        file_content = BytesIO(file.read())
-        wb = load_workbook(file_content, data_only=True)
-        ws = wb.active
-
-        # 헤더 확인 (17번째 행 - 데이터 입력 시작 행)
-        expected_headers = [
-            "대분류", "상품명", "채널", "프로모션명",
-            "금액할인", "회차면제", "중복여부", "프로모션코드",
-            "프로모션내용", "시작일", "종료일"
-        ]
-
-        # 헤더 검증 (17번째 행에서 헤더 확인, * 제거 후 비교)
-        actual_headers = [str(cell.value).replace(' *', '').strip() if cell.value else '' for cell in ws[17]]
-        if actual_headers[:len(expected_headers)] != expected_headers:
-            return jsonify({'error': '엑셀 양식이 올바르지 않습니다. 제공된 양식을 사용해주세요.'}), 400
-
-        # 데이터 파싱 (18번째 행부터, 예시 데이터와 가이드 제외하고 실제 데이터만)
-        promotions_data = []
-        errors = []
-
-        for row_num, row in enumerate(ws.iter_rows(min_row=18, values_only=True), start=18):
-            # 빈 행 스킵
-            if not any(row):
-                continue
-
-            # 주의사항 행 스킵
-            if row[0] and str(row[0]).startswith('※'):
-                continue
-
-            # 필수 필드 검증
-            category, product_name, channel, promotion_name, \
-            discount_amount, session_exemption, subscription_types_str, promotion_code, \
-            content, start_date, end_date = row[:11]
-
-            # 필수 필드 체크
-            if not all([category, product_name, channel, promotion_name, content, start_date]):
-                errors.append(f"행 {row_num}: 필수 항목이 누락되었습니다 (대분류, 상품명, 채널, 프로모션명, 내용, 시작일은 필수)")
-                continue
-
-            # 중복여부 파싱
-            subscription_types = []
-            if subscription_types_str:
-                types_list = [t.strip() for t in str(subscription_types_str).split(',')]
-                for t in types_list:
-                    if t in ['기존', '결합', '지인']:
-                        subscription_types.append(t)
-
-            # 날짜 형식 변환
-            def format_date(date_val):
-                if date_val is None:
-                    return None
-                if isinstance(date_val, str):
-                    return date_val
-                # datetime 객체인 경우
-                try:
-                    return date_val.strftime('%Y-%m-%d')
-                except:
-                    return str(date_val)
-
-            start_date_str = format_date(start_date)
-            end_date_str = format_date(end_date) if end_date else '무기한'
-
-            promotion_data = {
-                'category': str(category) if category else '',
-                'product_name': str(product_name),
-                'channel': str(channel),
-                'promotion_name': str(promotion_name),
-                'discount_amount': str(discount_amount) if discount_amount else '',
-                'session_exemption': str(session_exemption) if session_exemption else '',
-                'subscription_types': subscription_types,
-                'promotion_code': str(promotion_code) if promotion_code else '',
-                'content': str(content),
-                'start_date': start_date_str,
-                'end_date': end_date_str
-            }
-
-            promotions_data.append(promotion_data)
-
-        if errors:
-            return jsonify({'error': '\n'.join(errors)}), 400
-
-        if not promotions_data:
-            return jsonify({'error': '등록할 데이터가 없습니다'}), 400
+        # 업로드 스트림을 그대로 읽기 전용 모드로 파싱 (전체 셀 객체를 만들지 않음)
+        result = parse_promotion_upload(file.stream, ext)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': f'파일 처리 중 오류 발생: {str(e)}'}), 500
 
+    if result['error_count']:
+        summary = '\n'.join(f"행 {error['row']}: {error['message']}" for error in result['errors'][:20])
+        if result['error_count'] > 20:
+            summary += f"\n... 외 {result['error_count'] - 20}건"
         return jsonify({
-            'success': True,
-            'count': len(promotions_data),
-            'data': promotions_data
-        })
+            'error': summary,
+            'errors': result['errors'],
+            'error_count': result['error_count'],
+            'row_count': result['row_count']
+        }), 400
 
-    except Exception as e:
-        return jsonify({'error': f'파일 처리 중 오류 발생: {str(e)}'}), 500
+    if not result['promotions']:
+        return jsonify({'error': '등록할 데이터가 없습니다'}), 400
+
+    return jsonify({
+        'success': True,
+        'count': len(result['promotions']),
+        'data': result['promotions']
+    })
 
 @app.route('/api/promotions/bulk-save', methods=['POST'])
 def bulk_save_promotions():
@@ -2676,27 +3106,11 @@ def bulk_save_promotions():
         if not promotions_to_save:
             return jsonify({'error': '저장할 데이터가 없습니다'}), 400
 
-        # 기존 프로모션 로드
-        existing_promotions = load_promotions()
-
-        # 새 ID 생성을 위한 최대 ID 찾기
-        max_id = max([p.get('id', 0) for p in existing_promotions], default=0)
-
         # 현재 사용자 정보
         username = session.get('username', 'Admin')
-        now = datetime.now().isoformat()
 
-        # 새 프로모션 추가
-        for promo in promotions_to_save:
-            max_id += 1
-            promo['id'] = max_id
-            promo['created_at'] = now
-            promo['created_by'] = username
-            promo['updated_at'] = now
-            existing_promotions.append(promo)
-
-        # 저장
-        save_promotions(existing_promotions)
+        # 새 프로모션만 배치 INSERT (기존 프로모션은 건드리지 않음)
+        database.insert_promotions(promotions_to_save, username)
 
         return jsonify({
             'success': True,
@@ -2721,15 +3135,12 @@ def bulk_update_promotions():
         if not promotions_to_update:
             return jsonify({'error': '수정할 데이터가 없습니다'}), 400
 
-        # 기존 프로모션 로드
-        existing_promotions = load_promotions()
-        promo_map = {p['id']: p for p in existing_promotions}
+        # 수정 대상 프로모션만 로드
+        target_promotions = database.get_promotions_by_ids(
+            [p.get('id') for p in promotions_to_update if isinstance(p.get('id'), int)])
+        promo_map = {p['id']: p for p in target_promotions}
 
-        # 현재 사용자 정보
-        username = session.get('username', 'Admin')
-        now = datetime.now().isoformat()
-
-        updated_count = 0
+        changed = []
 
         for update_data in promotions_to_update:
             promo_id = update_data.get('id')
@@ -2765,12 +3176,10 @@ def bulk_update_promotions():
                     if key in update_data and key != 'extend_days':
                         promo[key] = update_data[key]
 
-            promo['updated_at'] = now
-            promo['updated_by'] = username
-            updated_count += 1
+            changed.append(promo)
 
-        # 저장
-        save_promotions(existing_promotions)
+        # 변경된 행만 한 번에 UPDATE
+        updated_count = database.update_promotions(changed)
 
         return jsonify({
             'success': True,
@@ -2788,23 +3197,18 @@ def bulk_delete_promotions():
     if not is_admin():
         return jsonify({'error': 'Forbidden'}), 403
 
+    data = request.get_json(silent=True) or {}
     try:
-        data = request.get_json()
-        ids_to_delete = set(data.get('ids', []))
+        ids_to_delete = {int(promo_id) for promo_id in data.get('ids') or []}
+    except (AttributeError, TypeError, ValueError):
+        return jsonify({'error': '프로모션 ID 형식이 올바르지 않습니다'}), 400
 
-        if not ids_to_delete:
-            return jsonify({'error': '삭제할 프로모션이 없습니다'}), 400
+    if not ids_to_delete:
+        return jsonify({'error': '삭제할 프로모션이 없습니다'}), 400
 
-        # 기존 프로모션 로드
-        existing_promotions = load_promotions()
-
-        # 삭제 대상 제외
-        original_count = len(existing_promotions)
-        remaining_promotions = [p for p in existing_promotions if p.get('id') not in ids_to_delete]
-        deleted_count = original_count - len(remaining_promotions)
-
-        # 저장
-        save_promotions(remaining_promotions)
+    try:
+        # 대상 행만 DELETE
+        deleted_count = database.delete_promotions(list(ids_to_delete))
 
         return jsonify({
             'success': True,
@@ -2981,6 +3385,7 @@ def create_reminder():
         return jsonify({'error': error_msg}), 400
 
     reminder_id = database.add_reminder(username, title, content, scheduled_date, scheduled_time)
+    reminder_scheduler.refresh_reminder(reminder_id)
 
     # Socket.IO로 배지 업데이트 전송
     counts = calculate_nav_counts(username)
@@ -3015,6 +3420,8 @@ def update_reminder(reminder_id):
     if not success:
         return jsonify({'error': 'Reminder not found or unauthorized'}), 404
 
+    reminder_scheduler.refresh_reminder(reminder_id)
+
     return jsonify({'success': True})
 
 @app.route('/api/reminders/<int:reminder_id>', methods=['DELETE'])
@@ -3029,6 +3436,8 @@ def delete_reminder(reminder_id):
     if not success:
         return jsonify({'error': 'Reminder not found or unauthorized'}), 404
 
+    reminder_scheduler.refresh_reminder(reminder_id)
+
     return jsonify({'success': True})
 
 @app.route('/api/reminders/<int:reminder_id>/complete', methods=['PATCH'])
@@ -3043,6 +3452,8 @@ def toggle_reminder_complete(reminder_id):
     if not success:
         return jsonify({'error': 'Reminder not found or unauthorized'}), 404
 
+    reminder_scheduler.refresh_reminder(reminder_id)
+
     # Socket.IO로 배지 업데이트 전송
     counts = calculate_nav_counts(username)
     socketio.emit('nav_counts_update', counts, room=f'user_{username}')
@@ -3075,39 +3486,12 @@ def check_reminder_banner():
         return jsonify({'error': 'Unauthorized'}), 401
 
     username = session.get('username')
-    from datetime import date
-    today = str(date.today())
 
-    # 당일 + 지난 미완료 예약 필터링
-    today_count = 0
-    overdue_count = 0
-
-    # 로컬호스트 또는 로그인하지 않은 경우: 모든 사용자의 예약 확인
-    if is_localhost() or not username:
-        users = database.load_all_users_detail()
-        for user in users:
-            user_reminders = database.load_reminders(user['username'], show_completed=True)
-            for r in user_reminders:
-                # PostgreSQL: is_completed는 0(미완료) 또는 1(완료)
-                if r.get('is_completed') == 1:
-                    continue
-                reminder_date = r.get('scheduled_date', '')
-                if reminder_date == today:
-                    today_count += 1
-                elif reminder_date < today:
-                    overdue_count += 1
-    else:
-        # 로그인된 사용자: 본인 예약만 확인
-        reminders = database.load_reminders(username, show_completed=True)
-        for r in reminders:
-            # PostgreSQL: is_completed는 0(미완료) 또는 1(완료)
-            if r.get('is_completed') == 1:
-                continue
-            reminder_date = r.get('scheduled_date', '')
-            if reminder_date == today:
-                today_count += 1
-            elif reminder_date < today:
-                overdue_count += 1
+    # 로컬호스트 또는 로그인하지 않은 경우: 모든 사용자의 예약, 그 외 본인 예약 (단일 집계 쿼리)
+    scope = None if is_localhost() or not username else username
+    counts = database.get_reminder_banner_counts(scope)
+    today_count = counts['today_count']
+    overdue_count = counts['overdue_count']
 
     return jsonify({
         'has_reminders': today_count > 0 or overdue_count > 0,
@@ -3123,33 +3507,10 @@ def get_today_reminders():
         return jsonify({'error': 'Unauthorized'}), 401
 
     username = session.get('username')
-    from datetime import date
-    today = str(date.today())
 
-    # 당일 미완료 예약 필터링
-    today_reminders = []
-
-    # 로컬호스트 또는 로그인하지 않은 경우: 모든 사용자의 예약 확인
-    if is_localhost() or not username:
-        users = database.load_all_users_detail()
-        for user in users:
-            user_reminders = database.load_reminders(user['username'])
-            for r in user_reminders:
-                if r.get('is_completed'):
-                    continue
-                if r.get('scheduled_date', '') == today:
-                    today_reminders.append(r)
-    else:
-        # 로그인된 사용자: 본인 예약만 확인
-        reminders = database.load_reminders(username)
-        for r in reminders:
-            if r.get('is_completed'):
-                continue
-            if r.get('scheduled_date', '') == today:
-                today_reminders.append(r)
-
-    # 시간순 정렬
-    today_reminders.sort(key=lambda x: x.get('scheduled_time', ''))
+    # 로컬호스트 또는 로그인하지 않은 경우: 모든 사용자의 예약, 그 외 본인 예약 (시간순)
+    scope = None if is_localhost() or not username else username
+    today_reminders = database.get_open_reminders_for_today(scope)
 
     return jsonify(today_reminders)
 
@@ -4652,23 +5013,69 @@ def calculate_nav_counts(username: str) -> dict[str, int]:
         # 읽지 않은 채팅 메시지 개수 (최적화: 전용 카운트 쿼리)
         counts['unread_chats'] = database.get_unread_chat_count(username)
 
-        # 상담사: 내게 할당된 미완료 할일 개수 (assigned_to 사용)
+        # 상담사: 내게 할당된 미완료 할일 개수 (할일 통계 롤업 캐시 사용)
         if username not in get_admin_accounts():
-            with database.get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT COUNT(*) as count
-                    FROM tasks
-                    WHERE assigned_to = %s AND status != '완료'
-                ''', (username,))
-                row = cursor.fetchone()
-                counts['pending_tasks'] = row['count'] if row else 0
+            counts['pending_tasks'] = get_task_stats()['pending_by_user'].get(username, 0)
 
     except Exception as e:
         logger.error(f"Error calculating nav counts for {username}: {e}")
 
     return counts
 
+@cached(ttl=300, key_prefix='task_stats')
+def get_task_stats() -> dict[str, Any]:
+    """할일 통계 (상태 x 팀 x 담당자 롤업, 5분 캐시)
+
+    할일이 바뀌면 on_task_modified()로 모든 워커에서 무효화됨
+    """
+    rollup = database.get_task_rollup()
+    stats = {
+        'total': 0,
+        'by_status': {},
+        'by_team': {},
+        'by_assignee': {},
+        'pending_by_user': {},
+        'rollup': rollup
+    }
+
+    for row in rollup:
+        status, count = row['status'], row['count']
+        team = row['team'] or '미지정'
+        assignee = row['assigned_to'] or '미배정'
+
+        stats['total'] += count
+        stats['by_status'][status] = stats['by_status'].get(status, 0) + count
+        team_stats = stats['by_team'].setdefault(team, {})
+        team_stats[status] = team_stats.get(status, 0) + count
+        assignee_stats = stats['by_assignee'].setdefault(assignee, {})
+        assignee_stats[status] = assignee_stats.get(status, 0) + count
+
+        if row['assigned_to'] and status != '완료':
+            stats['pending_by_user'][row['assigned_to']] = \
+                stats['pending_by_user'].get(row['assigned_to'], 0) + count
+
+    return stats
+
+@app.route('/api/items/stats', methods=['GET'])
+def get_items_stats():
+    """할일 통계 조회 (관리자 전용)
+    ---
+    tags:
+      - 할일(Task)
+    security:
+      - session: []
+    responses:
+      200:
+        description: 전체/상태별/팀별/담당자별 건수와 상태 x 팀 x 담당자 롤업
+      403:
+        description: 권한 없음 (관리자 전용)
+    """
+    if not is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+
+    stats = get_task_stats()
+    return jsonify({key: value for key, value in stats.items() if key != 'pending_by_user'})
+
 @app.route('/api/nav-counts', methods=['GET'])
 def get_nav_counts():
     """네비게이션 카운트 조회
@@ -4784,6 +5191,7 @@ def save_notification_settings():
     success = database.save_user_notification_settings(username, settings)
 
     if success:
+        reminder_scheduler.refresh_user(username)
         return jsonify({'success': True, 'settings': settings})
     else:
         return jsonify({'error': 'Failed to save settings'}), 500
@@ -4875,60 +5283,6 @@ def serve_service_worker():
 
 # ==================== 예약 알림 스케줄러 ====================
 
-def check_reminder_notifications():
-    """예약 알림 체크 및 푸시 발송 (사용자별 설정 적용, 반복 알림 지원)"""
-    while True:
-        try:
-            # 사용자별 설정이 적용된 알림 대상 목록 가져오기
-            pending_reminders = database.get_pending_reminders_for_notification()
-
-            for reminder in pending_reminders:
-                if not reminder.get('should_notify'):
-                    continue
-
-                user_id = reminder.get('user_id')
-                reminder_id = reminder.get('id')
-                title = reminder.get('title', '예약')
-                scheduled_time = reminder.get('scheduled_time', '')
-                notify_reason = reminder.get('notify_reason', 'first')
-
-                # 반복 알림인 경우 메시지 다르게
-                if notify_reason == 'repeat':
-                    notification_count = reminder.get('notification_count', 0)
-                    push_title = f'🔔 재알림: {title}'
-                    push_body = f'{scheduled_time} 예약이 곧 시작됩니다! (알림 {notification_count + 1}회차)'
-                else:
-                    push_title = f'⏰ 예약 알림: {title}'
-                    push_body = f'{scheduled_time}에 "{title}" 예약이 있습니다.'
-
-                # 푸시 알림 발송
-                push_result = push_helper.send_push_notification(
-                    username=user_id,
-                    title=push_title,
-                    body=push_body,
-                    data={
-                        'type': 'reminder',
-                        'reminderId': reminder_id,
-                        'url': '/reminders',
-                        'requireInteraction': True,
-                        'tag': f'reminder-{reminder_id}-{notify_reason}'
-                    }
-                )
-
-                # 알림 발송 완료 표시
-                if push_result.get('success', 0) > 0:
-                    database.update_reminder_notification(reminder_id)
-                    logger.info(f"[Reminder] 푸시 알림 발송 완료: {user_id} - {title} ({notify_reason})")
-                else:
-                    logger.warning(f"[Reminder] 푸시 알림 발송 실패: {user_id} - {title}, errors: {push_result.get('errors')}")
-
-        except Exception as e:
-            logger.error(f"[Reminder] 알림 체크 오류: {e}", exc_info=True)
-
-        # 1분마다 체크
-        eventlet.sleep(60)
-
-
 def check_daily_summary_notifications():
     """아침 일일 요약 알림 체크 및 발송"""
     from datetime import date
@@ -4939,43 +5293,40 @@ def check_daily_summary_notifications():
             current_time = now.strftime('%H:%M')
             today = str(date.today())
 
-            # 일일 요약이 필요한 사용자 목록
-            users_needing_summary = database.get_users_needing_daily_summary()
-
-            for user in users_needing_summary:
-                username = user.get('username')
-                summary_time = user.get('daily_summary_time', '09:00')
-
-                # 설정된 시간이 지났으면 알림 발송
-                if current_time >= summary_time:
-                    # 오늘 예약 개수 확인
-                    today_count = database.get_today_reminder_count(username)
-
-                    if today_count > 0:
-                        # 오늘 예약 목록 가져오기
-                        today_reminders = database.get_today_reminders_list(username)
-                        reminder_list = ', '.join([f"{r['scheduled_time']} {r['title']}" for r in today_reminders[:3]])
-                        if today_count > 3:
-                            reminder_list += f' 외 {today_count - 3}건'
-
-                        push_result = push_helper.send_push_notification(
-                            username=username,
-                            title=f'📅 오늘의 예약 알림',
-                            body=f'오늘 {today_count}건의 예약이 있습니다: {reminder_list}',
-                            data={
-                                'type': 'daily_summary',
-                                'url': '/reminders',
-                                'requireInteraction': False,
-                                'tag': f'daily-summary-{today}'
-                            }
-                        )
-
-                        if push_result.get('success', 0) > 0:
-                            database.update_last_daily_summary(username, today)
-                            logger.info(f"[DailySummary] 일일 요약 발송 완료: {username} - {today_count}건")
-                    else:
-                        # 예약이 없어도 발송 완료 처리 (다시 보내지 않도록)
-                        database.update_last_daily_summary(username, today)
+            # 요약 시간이 지난 사용자별 당일 예약 개수 + 상위 3건 (단일 쿼리)
+            summaries = database.get_due_daily_summaries(today, current_time)
+
+            jobs = []
+            for summary in summaries:
+                today_count = summary['today_count']
+                if today_count == 0:
+                    continue
+                reminder_list = ', '.join(f"{r['scheduled_time']} {r['title']}" for r in summary['top_reminders'])
+                if today_count > 3:
+                    reminder_list += f' 외 {today_count - 3}건'
+                jobs.append((
+                    summary['username'],
+                    '📅 오늘의 예약 알림',
+                    f'오늘 {today_count}건의 예약이 있습니다: {reminder_list}',
+                    {
+                        'type': 'daily_summary',
+                        'url': '/reminders',
+                        'requireInteraction': False,
+                        'tag': f'daily-summary-{today}'
+                    }
+                ))
+
+            if summaries:
+                # 발송 완료 기록과 푸시 대기열 추가를 한 트랜잭션으로 처리
+                # (예약이 없는 사용자는 그대로 완료, 구독이 없는 사용자는 다음 체크에서 재시도)
+                marked, queued = database.mark_daily_summaries_sent(
+                    [summary['username'] for summary in summaries],
+                    today,
+                    pushes=push_helper.outbox_rows(jobs)
+                )
+                if queued:
+                    push_helper.wake_delivery_worker()
+                logger.info(f"[DailySummary] 일일 요약 대기열 추가: {len(jobs)}명 ({queued}건), 완료 처리 {marked}명")
 
         except Exception as e:
             logger.error(f"[DailySummary] 일일 요약 체크 오류: {e}", exc_info=True)
@@ -4987,8 +5338,13 @@ def check_daily_summary_notifications():
 def start_reminder_scheduler():
     """예약 알림 스케줄러 시작"""
     logger.info("[Reminder] 예약 알림 스케줄러 시작")
-    eventlet.spawn(check_reminder_notifications)
-    eventlet.spawn(check_daily_summary_notifications)
+    # 예약 알림/일일 요약은 클러스터에서 리더 프로세스 하나만 실행
+    eventlet.spawn(scheduler_leader.run_leader_election, [
+        reminder_scheduler.run_reminder_scheduler,
+        check_daily_summary_notifications
+    ])
+    # 푸시 배달 워커는 행 점유(locked_until)로 여러 프로세스에서 안전하게 실행
+    eventlet.spawn(push_helper.run_push_delivery_loop)
 
 
 # 앱 시작 시 스케줄러 실행 (Gunicorn 워커당 1회)
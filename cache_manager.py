@@ -1,17 +1,30 @@
 """
 Stage 3: Advanced Caching Manager
-- In-memory LRU cache with TTL (Time-To-Live)
+- In-memory LRU cache with TTL (Time-To-Live) as L1
+- Shared Redis tier (L2) so workers and instances reuse each other's entries
 - Cache invalidation triggers
+- Cross-worker invalidation over Redis pub/sub
 - ETag generation for conditional requests
 - Performance monitoring
 """
 import hashlib
 import json
+import logging
+import os
+import threading
 import time
+import uuid
 from functools import wraps
 from collections import OrderedDict
 from threading import Lock
 
+try:
+    import redis
+except ImportError:  # Redis is optional: without it invalidation stays process-local
+    redis = None
+
+logger = logging.getLogger('crm')
+
 class LRUCache:
     """Thread-safe LRU Cache with TTL support"""
 
@@ -83,8 +96,218 @@ class LRUCache:
                 'max_size': self.max_size
             }
 
+L2_RETRY_SECONDS = 30  # How long to skip L2 after a Redis error
+L1_FILL_TTL = 10  # L2 hits stay in L1 at most this long (bounds staleness of keys overwritten elsewhere)
+L2_INDEX_PRUNE_EVERY = 500  # Writes per namespace between sweeps of expired keys out of its index set
+L2_INDEX_CHUNK = 500  # Keys per SSCAN/pipeline round trip when walking an index set
+
+
+class TieredCache:
+    """
+    Two-tier cache: the per-process LRUCache (L1) in front of Redis (L2)
+
+    - get: L1, then L2 (a hit is copied into L1 for up to L1_FILL_TTL seconds)
+    - set: L1 and L2; values that are not JSON-serializable stay in L1 only
+    - set_many: like set for several keys, with one Redis round trip
+    - invalidate: L1 and L2 by prefix, then broadcast so other workers drop their L1
+    If Redis fails the cache keeps working on L1 alone and retries L2 later.
+
+    L2 keys are indexed per namespace (the part before the first ':') so prefix
+    invalidation scans only the matching namespaces. Redis expires the values but
+    not their index entries, so each namespace's index is swept for dead keys
+    every L2_INDEX_PRUNE_EVERY writes to keep it bounded by the live keys. The
+    sweep runs in a background thread so the write that triggers it stays cheap.
+    """
+
+    def __init__(self, local, key_prefix='crm:cache:', default_ttl=3600):
+        self.local = local
+        self.key_prefix = key_prefix
+        self.namespaces_key = f'{key_prefix}_namespaces'  # Set of namespaces that have an index
+        self.default_ttl = default_ttl
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self._l2_down_until = 0
+        self._writes = {}  # namespace -> writes since its index was last pruned
+        self._pruning = set()  # namespaces with a sweep in progress
+        self._prune_lock = Lock()
+
+    def _index_key(self, namespace):
+        """Set of L2 keys in one namespace, scanned for prefix invalidation"""
+        return f'{self.key_prefix}_keys:{namespace}'
+
+    def _namespaces(self, client, pattern):
+        """Namespaces whose keys can start with pattern"""
+        if pattern and ':' in pattern:
+            return [pattern.split(':', 1)[0]]
+        match = _escape_glob(pattern or '') + '*'
+        return [namespace.decode() for namespace in
+                client.sscan_iter(self.namespaces_key, match=match, count=L2_INDEX_CHUNK)]
+
+    def _prune_index(self, client, namespace):
+        """Drop index entries whose L2 key has already expired"""
+        index_key = self._index_key(namespace)
+        keys = list(client.sscan_iter(index_key, count=L2_INDEX_CHUNK))
+        for start in range(0, len(keys), L2_INDEX_CHUNK):
+            chunk = keys[start:start + L2_INDEX_CHUNK]
+            pipe = client.pipeline(transaction=False)
+            for key in chunk:
+                pipe.exists(self.key_prefix.encode() + key)
+            dead = [key for key, alive in zip(chunk, pipe.execute()) if not alive]
+            if dead:
+                client.srem(index_key, *dead)
+
+    def _schedule_prune(self, client, namespace):
+        """Sweep a namespace's index in the background (one sweep per namespace at a time)"""
+        with self._prune_lock:
+            if namespace in self._pruning:
+                return
+            self._pruning.add(namespace)
+        threading.Thread(target=self._prune_in_background, args=(client, namespace), daemon=True).start()
+
+    def _prune_in_background(self, client, namespace):
+        try:
+            self._prune_index(client, namespace)
+        except Exception as e:
+            logger.warning(f"L2 index prune failed ({namespace}): {e}")
+        finally:
+            with self._prune_lock:
+                self._pruning.discard(namespace)
+
+    def _redis(self):
+        """Redis client for L2 (None while Redis is unavailable)"""
+        if time.time() < self._l2_down_until:
+            return None
+        return _get_redis()
+
+    def _l2_failed(self, action, error):
+        self._l2_down_until = time.time() + L2_RETRY_SECONDS
+        logger.warning(f"L2 cache {action} failed, using L1 only for {L2_RETRY_SECONDS}s: {error}")
+
+    def get(self, key):
+        """Get cached value from L1, falling back to L2"""
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        client = self._redis()
+        if client is None:
+            return None
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.get(self.key_prefix + key)
+            pipe.pttl(self.key_prefix + key)
+            raw, pttl = pipe.execute()
+        except Exception as e:
+            self._l2_failed('read', e)
+            return None
+
+        if raw is None:
+            self.l2_misses += 1
+            return None
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return None
+
+        self.l2_hits += 1
+        self.local.set(key, value, ttl=min(pttl / 1000, L1_FILL_TTL) if pttl and pttl > 0 else L1_FILL_TTL)
+        return value
+
+    def set(self, key, value, ttl=None):
+        """Set value in L1 and (if JSON-serializable) in L2"""
+        self.set_many({key: value}, ttl=ttl)
+
+    def set_many(self, items, ttl=None):
+        """
+        Set several values with one L2 round trip
+
+        Args:
+            items: Mapping of key -> value (same rules as set)
+            ttl: Time-to-live in seconds for every item
+        """
+        for key, value in items.items():
+            self.local.set(key, value, ttl=ttl)
+
+        client = self._redis()
+        if client is None:
+            return
+        payloads = {}
+        for key, value in items.items():
+            try:
+                payloads[key] = json.dumps(value)
+            except (TypeError, ValueError):
+                continue  # Not JSON-serializable: process-local only
+        if not payloads:
+            return
+
+        ex = max(1, int(ttl or self.default_ttl))
+        namespaces = {}
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, payload in payloads.items():
+                namespace = key.split(':', 1)[0]
+                namespaces.setdefault(namespace, []).append(key)
+                pipe.set(self.key_prefix + key, payload, ex=ex)
+            for namespace, keys in namespaces.items():
+                pipe.sadd(self._index_key(namespace), *keys)
+            pipe.sadd(self.namespaces_key, *namespaces)
+            pipe.execute()
+        except Exception as e:
+            self._l2_failed('write', e)
+            return
+
+        for namespace, keys in namespaces.items():
+            writes = self._writes.get(namespace, 0) + len(keys)
+            self._writes[namespace] = writes % L2_INDEX_PRUNE_EVERY
+            if writes >= L2_INDEX_PRUNE_EVERY:
+                self._schedule_prune(client, namespace)
+
+    def invalidate(self, pattern=None):
+        """Invalidate entries matching prefix in every tier on every worker"""
+        self.local.invalidate(pattern)
+
+        client = self._redis()
+        if client is not None:
+            try:
+                match = _escape_glob(pattern or '') + '*'
+                for namespace in self._namespaces(client, pattern):
+                    index_key = self._index_key(namespace)
+                    keys = list(client.sscan_iter(index_key, match=match, count=L2_INDEX_CHUNK))
+                    for start in range(0, len(keys), L2_INDEX_CHUNK):
+                        chunk = keys[start:start + L2_INDEX_CHUNK]
+                        pipe = client.pipeline(transaction=False)
+                        pipe.delete(*[self.key_prefix.encode() + key for key in chunk])
+                        pipe.srem(index_key, *chunk)
+                        pipe.execute()
+            except Exception as e:
+                self._l2_failed('invalidate', e)
+
+        publish_invalidation('cache', pattern)
+
+    def invalidate_local(self, pattern=None):
+        """Drop L1 entries only (invalidation received from another worker)"""
+        self.local.invalidate(pattern)
+
+    def get_stats(self):
+        """Get L1 statistics plus L2 hit/miss counts"""
+        stats = self.local.get_stats()
+        stats.update({
+            'l2_hits': self.l2_hits,
+            'l2_misses': self.l2_misses,
+            'l2_available': self._redis() is not None
+        })
+        return stats
+
+
+def _escape_glob(text):
+    """Escape Redis glob metacharacters so a prefix matches literally"""
+    for char in ('\\', '*', '?', '[', ']'):
+        text = text.replace(char, '\\' + char)
+    return text
+
+
 # Global cache instance
-app_cache = LRUCache(max_size=1000)
+app_cache = TieredCache(LRUCache(max_size=1000))
 
 def cached(ttl=60, key_prefix=''):
     """
@@ -135,7 +358,7 @@ def cached(ttl=60, key_prefix=''):
 
 def invalidate_cache(pattern=None):
     """
-    Invalidate cache entries matching pattern
+    Invalidate cache entries matching pattern (L1 + L2, on all workers)
 
     Args:
         pattern: Prefix to match (None = clear all)
@@ -172,6 +395,7 @@ def get_cache_stats():
 
 def on_task_modified(task_id=None, assigned_to=None):
     """Invalidate cache when task is modified"""
+    invalidate_cache('task_stats')
     if assigned_to:
         invalidate_cache(f'nav_counts:{assigned_to}')
     else:
@@ -197,8 +421,110 @@ def on_promotion_modified():
     """Invalidate cache when promotion is modified"""
     invalidate_cache('promotions')
     invalidate_cache('promotion_filters')
+    # Mark the in-memory promotion catalog stale here and on the other workers
+    handler = _invalidation_handlers.get('promotions')
+    if handler:
+        handler(None)
+    publish_invalidation('promotions')
 
 def on_user_modified():
     """Invalidate cache when user data is modified"""
     invalidate_cache('teams')
     invalidate_cache('users')
+
+
+# Cross-worker invalidation (Redis pub/sub on the Socket.IO message queue server)
+
+INVALIDATION_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://127.0.0.1:6379/0')
+INVALIDATION_CHANNEL = 'crm:cache_invalidate'
+
+# Identifies this process so it can skip its own broadcasts
+_instance_id = uuid.uuid4().hex
+_invalidation_handlers = {}
+_redis_client = None
+_redis_lock = Lock()
+_listener_started = False
+
+
+def _get_redis():
+    """Return a shared Redis client (None if Redis is unavailable)"""
+    global _redis_client
+    if redis is None:
+        return None
+    with _redis_lock:
+        if _redis_client is None:
+            _redis_client = redis.Redis.from_url(INVALIDATION_REDIS_URL, socket_timeout=2)
+        return _redis_client
+
+
+def register_invalidation_handler(kind, handler):
+    """
+    Register a handler for invalidation messages from other workers
+
+    Args:
+        kind: Message type (e.g. 'promotions')
+        handler: Callable receiving the invalidated key
+    """
+    _invalidation_handlers[kind] = handler
+
+
+def publish_invalidation(kind, key=None):
+    """
+    Tell other workers to drop a cached entry (best effort)
+
+    Args:
+        kind: Message type registered with register_invalidation_handler
+        key: Entry to invalidate (None = all entries of that kind)
+    """
+    client = _get_redis()
+    if client is None:
+        return
+    try:
+        client.publish(INVALIDATION_CHANNEL, json.dumps({
+            'origin': _instance_id,
+            'kind': kind,
+            'key': key
+        }))
+    except Exception as e:
+        logger.warning(f"Cache invalidation publish failed ({kind}:{key}): {e}")
+
+
+def _listen_for_invalidations():
+    """Subscriber loop: apply invalidations published by other workers"""
+    while True:
+        try:
+            # Dedicated connection without socket timeout (listen() blocks)
+            pubsub = redis.Redis.from_url(INVALIDATION_REDIS_URL).pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            for message in pubsub.listen():
+                try:
+                    payload = json.loads(message['data'])
+                except (TypeError, ValueError):
+                    continue
+                if payload.get('origin') == _instance_id:
+                    continue
+                handler = _invalidation_handlers.get(payload.get('kind'))
+                if handler:
+                    # A failing handler must not drop the subscription (messages sent
+                    # while reconnecting would be lost for every kind)
+                    try:
+                        handler(payload.get('key'))
+                    except Exception as e:
+                        logger.error(f"Cache invalidation handler failed "
+                                     f"({payload.get('kind')}:{payload.get('key')}): {e}", exc_info=True)
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener error, reconnecting: {e}")
+            time.sleep(5)
+
+
+def start_invalidation_listener():
+    """Start the cross-worker invalidation subscriber (once per process)"""
+    global _listener_started
+    if _listener_started or _get_redis() is None:
+        return
+    _listener_started = True
+    threading.Thread(target=_listen_for_invalidations, daemon=True).start()
+
+
+# invalidate_cache() on another worker: drop the matching L1 entries here
+register_invalidation_handler('cache', app_cache.invalidate_local)
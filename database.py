@@ -13,11 +13,15 @@ import psycopg2.pool
 import threading
 import logging
 import time
+import base64
+import json
 from contextlib import contextmanager
+from datetime import datetime
 from functools import wraps
 from typing import Any, Callable, Generator, TypeVar, Optional
 import os
 from password_helper import hash_password, verify_password, is_hashed
+from cache_manager import app_cache, invalidate_cache, on_promotion_modified
 
 logger = logging.getLogger('crm')
 
@@ -86,23 +90,27 @@ def get_db_connection() -> Generator[Any, None, None]:
 
 # ==================== 할일 관리 ====================
 
+# 할일 조회 컬럼 (tasks t + users u JOIN, load_data와 단건 조회/생성/수정 응답이 같은 형태)
+TASK_COLUMNS = '''
+    t.id,
+    t.assigned_to,
+    t.title,
+    t.content,
+    t.status,
+    TO_CHAR(t.created_at, 'YYYY-MM-DD HH24:MI:SS') as created_at,
+    TO_CHAR(t.assigned_at, 'YYYY-MM-DD HH24:MI:SS') as assigned_at,
+    TO_CHAR(t.updated_at, 'YYYY-MM-DD HH24:MI:SS') as updated_at,
+    TO_CHAR(t.completed_at, 'YYYY-MM-DD HH24:MI:SS') as completed_at,
+    u.team as team
+'''
+
 @log_slow_query
 def load_data() -> list[dict[str, Any]]:
     """할일 목록 조회 (users와 JOIN하여 team 정보 포함)"""
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute('''
-            SELECT
-                t.id,
-                t.assigned_to,
-                t.title,
-                t.content,
-                t.status,
-                TO_CHAR(t.created_at, 'YYYY-MM-DD HH24:MI:SS') as created_at,
-                TO_CHAR(t.assigned_at, 'YYYY-MM-DD HH24:MI:SS') as assigned_at,
-                TO_CHAR(t.updated_at, 'YYYY-MM-DD HH24:MI:SS') as updated_at,
-                TO_CHAR(t.completed_at, 'YYYY-MM-DD HH24:MI:SS') as completed_at,
-                u.team as team
+        cursor.execute(f'''
+            SELECT {TASK_COLUMNS}
             FROM tasks t
             LEFT JOIN users u ON t.assigned_to = u.username
             ORDER BY t.id
@@ -110,6 +118,26 @@ def load_data() -> list[dict[str, Any]]:
         rows = cursor.fetchall()
         return [dict(row) for row in rows]
 
+def get_task(task_id: int) -> Optional[dict[str, Any]]:
+    """할일 단건 조회 (없으면 None)"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT {TASK_COLUMNS}
+            FROM tasks t
+            LEFT JOIN users u ON t.assigned_to = u.username
+            WHERE t.id = %s
+        ''', (task_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
+def get_assigned_usernames() -> list[str]:
+    """할일이 배정된 사용자명 목록 (중복 제거)"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT DISTINCT assigned_to FROM tasks WHERE assigned_to IS NOT NULL')
+        return [row['assigned_to'] for row in cursor.fetchall()]
+
 def load_data_by_assigned(username: str) -> list[dict[str, Any]]:
     """특정 사용자에게 배정된 할일만 조회"""
     with get_db_connection() as conn:
@@ -154,6 +182,154 @@ def load_data_unassigned() -> list[dict[str, Any]]:
         rows = cursor.fetchall()
         return [dict(row) for row in rows]
 
+# 할일 목록 정렬 키: (정렬식, 커서 값 타입) - NULL은 정렬/커서 비교를 위해 최소값으로 치환
+# COALESCE 식을 바꾸면 add_task_list_indexes.sql의 표현식 인덱스도 함께 수정
+TASK_SORT_COLUMNS = {
+    'id': ('t.id', 'integer'),
+    'title': ('t.title', 'text'),
+    'content': ('t.content', 'text'),
+    'status': ('t.status', 'text'),
+    'assigned_to': ("COALESCE(t.assigned_to, '')", 'text'),
+    'team': ("COALESCE(u.team, '')", 'text'),
+    'created_at': ('t.created_at', 'timestamp'),
+    'assigned_at': ("COALESCE(t.assigned_at, '-infinity')", 'timestamp'),
+    'updated_at': ("COALESCE(t.updated_at, '-infinity')", 'timestamp'),
+    'completed_at': ("COALESCE(t.completed_at, '-infinity')", 'timestamp'),
+}
+
+
+def _task_filter_conditions(filters: dict[str, Any]) -> tuple[str, list[Any]]:
+    """할일 목록 필터 WHERE 조건 생성 (내부 함수)"""
+    conditions = ''
+    params: list[Any] = []
+
+    if filters.get('status'):
+        conditions += ' AND t.status = ANY(%s)'
+        params.append(list(filters['status']))
+
+    if filters.get('assignees'):
+        conditions += ' AND t.assigned_to = ANY(%s)'
+        params.append(list(filters['assignees']))
+
+    if filters.get('assignment') == 'assigned':
+        conditions += ' AND t.assigned_to IS NOT NULL'
+    elif filters.get('assignment') == 'unassigned':
+        conditions += ' AND t.assigned_to IS NULL'
+
+    if filters.get('team'):
+        conditions += ' AND u.team = %s'
+        params.append(filters['team'])
+
+    if filters.get('q'):
+        pattern = f"%{_escape_like(filters['q'])}%"
+        conditions += """ AND (t.title ILIKE %s ESCAPE '\\'
+                              OR t.content ILIKE %s ESCAPE '\\'
+                              OR t.assigned_to ILIKE %s ESCAPE '\\')"""
+        params.extend([pattern, pattern, pattern])
+
+    # 날짜 범위 (YYYY-MM-DD, 종료일 포함)
+    for column in ('created', 'assigned'):
+        if filters.get(f'{column}_from'):
+            conditions += f' AND t.{column}_at >= %s::date'
+            params.append(filters[f'{column}_from'])
+        if filters.get(f'{column}_until'):
+            conditions += f' AND t.{column}_at < %s::date + 1'
+            params.append(filters[f'{column}_until'])
+
+    return conditions, params
+
+
+def _encode_task_cursor(sort: str, direction: str, sort_key: str, task_id: int) -> str:
+    """키셋 커서 인코딩 (정렬 컬럼/방향 + 정렬 값 + ID, 내부 함수)"""
+    return base64.urlsafe_b64encode(json.dumps([sort, direction, sort_key, task_id]).encode()).decode()
+
+
+def _decode_task_cursor(cursor: str, sort: str, direction: str) -> tuple[str, int]:
+    """키셋 커서 디코딩 (잘못된 값이거나 정렬 조건이 다르면 ValueError, 내부 함수)"""
+    try:
+        cursor_sort, cursor_direction, sort_key, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        task_id = int(task_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+    # 다른 정렬로 만든 커서의 정렬 값을 비교하면 행이 빠지거나 중복됨
+    if (cursor_sort, cursor_direction) != (sort, direction):
+        raise ValueError('Invalid cursor')
+    return sort_key, task_id
+
+
+@log_slow_query
+def query_tasks(filters: Optional[dict[str, Any]] = None, sort: str = 'id', order: str = 'asc',
+                limit: int = 50, offset: int = 0, cursor: Optional[str] = None,
+                include_total: bool = False) -> dict[str, Any]:
+    """
+    할일 목록 조회 (서버 측 필터/정렬/페이지네이션)
+
+    Args:
+        filters: {status: [..], assignees: [..], assignment: 'assigned'|'unassigned', team,
+                  q: 검색어, created_from, created_until, assigned_from, assigned_until}
+        sort: TASK_SORT_COLUMNS 키 (그 외 값은 'id')
+        order: 'asc' 또는 'desc'
+        limit: 페이지 크기
+        offset: 건너뛸 행 수 (페이지 번호 이동용, cursor가 있으면 무시)
+        cursor: 이전 응답의 next_cursor (키셋 페이지네이션, 같은 sort/order에서만 유효)
+        include_total: 필터 조건의 전체 개수 포함 여부
+
+    Returns:
+        dict: {items, next_cursor(다음 페이지 없으면 None), total(include_total일 때)}
+    """
+    if sort not in TASK_SORT_COLUMNS:
+        sort = 'id'
+    sort_expr, sort_type = TASK_SORT_COLUMNS[sort]
+    direction = 'DESC' if order == 'desc' else 'ASC'
+    conditions, params = _task_filter_conditions(filters or {})
+
+    with get_db_connection() as conn:
+        db_cursor = conn.cursor()
+        result: dict[str, Any] = {}
+
+        if include_total:
+            db_cursor.execute(f'''
+                SELECT COUNT(*) as count
+                FROM tasks t
+                LEFT JOIN users u ON t.assigned_to = u.username
+                WHERE TRUE {conditions}
+            ''', params)
+            result['total'] = db_cursor.fetchone()['count']
+
+        # 개수만 필요한 경우
+        if limit <= 0:
+            result.update(items=[], next_cursor=None)
+            return result
+
+        page_conditions = conditions
+        page_params = list(params)
+        if cursor:
+            sort_key, last_id = _decode_task_cursor(cursor, sort, direction)
+            comparison = '<' if direction == 'DESC' else '>'
+            page_conditions += f' AND ({sort_expr}, t.id) {comparison} (%s::{sort_type}, %s)'
+            page_params.extend([sort_key, last_id])
+            offset = 0
+
+        # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+        db_cursor.execute(f'''
+            SELECT {TASK_COLUMNS}, ({sort_expr})::text as sort_key
+            FROM tasks t
+            LEFT JOIN users u ON t.assigned_to = u.username
+            WHERE TRUE {page_conditions}
+            ORDER BY {sort_expr} {direction}, t.id {direction}
+            LIMIT %s OFFSET %s
+        ''', page_params + [limit + 1, offset])
+        rows = [dict(row) for row in db_cursor.fetchall()]
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    result['next_cursor'] = (_encode_task_cursor(sort, direction, rows[-1]['sort_key'], rows[-1]['id'])
+                             if has_more else None)
+    for row in rows:
+        del row['sort_key']
+    result['items'] = rows
+    return result
+
 def save_data(data: list[dict[str, Any]]) -> None:
     """할일 목록 저장 (전체 덮어쓰기 - 호환성 유지)"""
     with db_lock:
@@ -168,41 +344,92 @@ def save_data(data: list[dict[str, Any]]) -> None:
                       task['content'], task['created_at'], task.get('status', '대기중')))
             conn.commit()
 
-def update_task_status(task_id: int, status: str) -> None:
-    """할일 상태 업데이트"""
+def update_task_status(task_id: int, status: str) -> Optional[dict[str, Any]]:
+    """할일 상태 업데이트 후 수정된 행 반환 (없으면 None)"""
     with db_lock:
         with get_db_connection() as conn:
             cursor = conn.cursor()
             # 완료일 업데이트 (완료 상태로 변경 시)
-            if status == '완료':
-                cursor.execute('''
+            cursor.execute(f'''
+                WITH t AS (
                     UPDATE tasks
                     SET status = %s,
                         updated_at = CURRENT_TIMESTAMP,
-                        completed_at = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                ''', (status, task_id))
-            else:
-                cursor.execute('''
-                    UPDATE tasks
-                    SET status = %s,
-                        updated_at = CURRENT_TIMESTAMP
+                        completed_at = CASE WHEN %s = '완료' THEN CURRENT_TIMESTAMP ELSE completed_at END
                     WHERE id = %s
-                ''', (status, task_id))
+                    RETURNING *
+                )
+                SELECT {TASK_COLUMNS}
+                FROM t
+                LEFT JOIN users u ON t.assigned_to = u.username
+            ''', (status, status, task_id))
+            row = cursor.fetchone()
             conn.commit()
+            return dict(row) if row else None
 
-def update_task_assignment(task_id: int, assigned_to: Optional[str]) -> None:
-    """할일 배정 업데이트 (배정/회수) - 배정일만 업데이트, 수정일은 변경하지 않음"""
+def update_task_assignment(task_id: int, assigned_to: Optional[str]) -> Optional[dict[str, Any]]:
+    """할일 배정 업데이트 (배정/회수) - 배정일만 업데이트, 수정일은 변경하지 않음
+
+    Returns:
+        dict: 수정된 행 + 이전 담당자(old_assignee) 또는 None
+    """
     with db_lock:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE tasks
-                SET assigned_to = %s,
-                    assigned_at = CURRENT_TIMESTAMP
-                WHERE id = %s
+            cursor.execute(f'''
+                WITH t AS (
+                    UPDATE tasks t
+                    SET assigned_to = %s,
+                        assigned_at = CURRENT_TIMESTAMP
+                    FROM tasks old
+                    WHERE t.id = %s AND old.id = t.id
+                    RETURNING t.*, old.assigned_to as old_assignee
+                )
+                SELECT {TASK_COLUMNS}, t.old_assignee
+                FROM t
+                LEFT JOIN users u ON t.assigned_to = u.username
             ''', (assigned_to, task_id))
+            row = cursor.fetchone()
+            conn.commit()
+            return dict(row) if row else None
+
+def bulk_update_task_assignments(assignments: list[tuple[int, str]]) -> list[dict[str, Any]]:
+    """
+    할일 일괄 배정 (unnest 배열로 단일 UPDATE, 한 트랜잭션)
+
+    Args:
+        assignments: [(task_id, assigned_to), ...] (같은 task_id가 여러 번 있으면 마지막 값 사용)
+
+    Returns:
+        list: 변경된 행 [{id, assigned_to, assigned_at, team, old_assignee}, ...]
+    """
+    mapping = dict(assignments)
+    if not mapping:
+        return []
+
+    with db_lock:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                WITH t AS (
+                    UPDATE tasks t
+                    SET assigned_to = a.username,
+                        assigned_at = CURRENT_TIMESTAMP
+                    FROM unnest(%s::integer[], %s::text[]) AS a(task_id, username),
+                         tasks old
+                    WHERE t.id = a.task_id
+                    AND old.id = a.task_id
+                    RETURNING t.id, t.assigned_to, t.assigned_at, old.assigned_to as old_assignee
+                )
+                SELECT t.id, t.assigned_to,
+                       TO_CHAR(t.assigned_at, 'YYYY-MM-DD HH24:MI:SS') as assigned_at,
+                       u.team as team, t.old_assignee
+                FROM t
+                LEFT JOIN users u ON t.assigned_to = u.username
+            ''', (list(mapping.keys()), list(mapping.values())))
+            rows = [dict(row) for row in cursor.fetchall()]
             conn.commit()
+            return rows
 
 def add_task(assigned_to: Optional[str], title: str, content: str, status: str = '대기중') -> int:
     """새 할일 추가 (개별 삽입)"""
@@ -225,20 +452,74 @@ def add_task(assigned_to: Optional[str], title: str, content: str, status: str =
             conn.commit()
             return cursor.fetchone()['id']
 
-def update_task(task_id: int, title: str, content: str) -> bool:
-    """할일 수정 (제목, 내용)"""
+def create_task(title: str, content: str, assigned_to: Optional[str] = None,
+                status: str = '대기중') -> dict[str, Any]:
+    """새 할일 추가 후 생성된 행 반환 (INSERT ... RETURNING, 전체 목록 재작성 없음)"""
     with db_lock:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE tasks
-                SET title = %s,
-                    content = %s,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s
+            # assigned_to가 있으면 배정일도 함께 저장
+            cursor.execute(f'''
+                WITH t AS (
+                    INSERT INTO tasks (assigned_to, title, content, status, created_at, assigned_at)
+                    VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP,
+                            CASE WHEN %s::text IS NOT NULL THEN CURRENT_TIMESTAMP END)
+                    RETURNING *
+                )
+                SELECT {TASK_COLUMNS}
+                FROM t
+                LEFT JOIN users u ON t.assigned_to = u.username
+            ''', (assigned_to, title, content, status, assigned_to))
+            row = cursor.fetchone()
+            conn.commit()
+            return dict(row)
+
+def bulk_insert_tasks(rows: list[tuple[Optional[str], str, str]]) -> int:
+    """
+    할일 일괄 추가 (execute_values 배치 INSERT, 한 트랜잭션)
+
+    Args:
+        rows: [(assigned_to, title, content), ...] - 상태는 '대기중', assigned_to가 있으면 배정일도 저장
+
+    Returns:
+        int: 추가된 행 수
+    """
+    if not rows:
+        return 0
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        psycopg2.extras.execute_values(cursor, '''
+            INSERT INTO tasks (assigned_to, title, content, status, created_at, assigned_at)
+            VALUES %s
+        ''', [(assigned_to, title, content, assigned_to) for assigned_to, title, content in rows],
+            template="(%s, %s, %s, '대기중', CURRENT_TIMESTAMP, "
+                     "CASE WHEN %s::text IS NOT NULL THEN CURRENT_TIMESTAMP END)",
+            page_size=len(rows))
+        conn.commit()
+        return len(rows)
+
+def update_task(task_id: int, title: str, content: str) -> Optional[dict[str, Any]]:
+    """할일 수정 (제목, 내용) 후 수정된 행 반환 (없으면 None)"""
+    with db_lock:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                WITH t AS (
+                    UPDATE tasks
+                    SET title = %s,
+                        content = %s,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                    RETURNING *
+                )
+                SELECT {TASK_COLUMNS}
+                FROM t
+                LEFT JOIN users u ON t.assigned_to = u.username
             ''', (title, content, task_id))
+            row = cursor.fetchone()
             conn.commit()
-            return cursor.rowcount > 0
+            return dict(row) if row else None
 
 def delete_task(task_id: int) -> bool:
     """할일 삭제"""
@@ -249,6 +530,39 @@ def delete_task(task_id: int) -> bool:
             conn.commit()
             return cursor.rowcount > 0
 
+@log_slow_query
+def get_task_rollup() -> list[dict[str, Any]]:
+    """할일 통계 롤업 조회 (상태 x 팀 x 담당자별 건수, 단일 GROUP BY)
+
+    Returns:
+        list: [{status, team, assigned_to, count}, ...] (미배정은 assigned_to/team이 None)
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT t.status, u.team, t.assigned_to, COUNT(*) as count
+            FROM tasks t
+            LEFT JOIN users u ON t.assigned_to = u.username
+            GROUP BY t.status, u.team, t.assigned_to
+        ''')
+        return [dict(row) for row in cursor.fetchall()]
+
+def next_task_version() -> int:
+    """할일 변경 이벤트 버전 발급 (task_event_seq, 모든 워커에서 단조 증가)"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT nextval('task_event_seq') as version")
+        version = cursor.fetchone()['version']
+        conn.commit()
+        return version
+
+def get_task_version() -> int:
+    """마지막으로 발급된 할일 변경 이벤트 버전"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT CASE WHEN is_called THEN last_value ELSE 0 END as version FROM task_event_seq")
+        return cursor.fetchone()['version']
+
 # ==================== 사용자 관리 ====================
 
 def load_users() -> list[str]:
@@ -571,6 +885,32 @@ def change_user_password(username: str, current_password: str, new_password: str
 
 # ==================== 채팅 관리 (최적화) ====================
 
+def _load_read_watermarks(cursor: Any, chat_ids: list[int]) -> dict[int, list[tuple[str, int]]]:
+    """채팅방별 참여자 읽음 워터마크 조회 (내부 함수)"""
+    watermarks: dict[int, list[tuple[str, int]]] = {}
+    if not chat_ids:
+        return watermarks
+
+    cursor.execute('''
+        SELECT chat_id, username, last_read_message_id
+        FROM chat_participants
+        WHERE chat_id = ANY(%s)
+        ORDER BY chat_id, id
+    ''', (list(chat_ids),))
+    for row in cursor.fetchall():
+        watermarks.setdefault(row['chat_id'], []).append(
+            (row['username'], row['last_read_message_id'] or 0)
+        )
+    return watermarks
+
+
+def _apply_read_by(msg: dict[str, Any], message_id: int, watermarks: list[tuple[str, int]]) -> None:
+    """워터마크로 메시지의 read_by 목록 계산 (내부 함수)"""
+    read_by = [username for username, last_read in watermarks if last_read >= message_id]
+    if read_by:
+        msg['read_by'] = read_by
+
+
 def load_chats() -> dict[str, dict[str, Any]]:
     """채팅 목록 조회 (최적화: 단일 쿼리로 모든 데이터 로드)"""
     with get_db_connection() as conn:
@@ -591,17 +931,21 @@ def load_chats() -> dict[str, dict[str, Any]]:
                 'messages': []
             }
 
-        # 2. 모든 참여자를 한 번에 조회 (역할 포함)
+        # 2. 모든 참여자를 한 번에 조회 (역할, 읽음 워터마크 포함)
         cursor.execute('''
-            SELECT chat_id, username, role
+            SELECT chat_id, username, role, last_read_message_id
             FROM chat_participants
-            ORDER BY chat_id
+            ORDER BY chat_id, id
         ''')
+        watermarks: dict[str, list[tuple[str, int]]] = {}
         for row in cursor.fetchall():
             chat_id = str(row['chat_id'])
             if chat_id in chats:
                 chats[chat_id]['participants'].append(row['username'])
                 chats[chat_id]['participant_roles'][row['username']] = row['role'] or 'member'
+                watermarks.setdefault(chat_id, []).append(
+                    (row['username'], row['last_read_message_id'] or 0)
+                )
 
         # 3. 모든 메시지를 한 번에 조회 (N+1 제거)
         cursor.execute('''
@@ -611,7 +955,6 @@ def load_chats() -> dict[str, dict[str, Any]]:
             ORDER BY m.chat_id, m.id
         ''')
 
-        messages_by_id = {}
         for msg_row in cursor.fetchall():
             chat_id = str(msg_row['chat_id'])
             if chat_id in chats:
@@ -626,28 +969,10 @@ def load_chats() -> dict[str, dict[str, Any]]:
                 if msg_row['file_name']:
                     msg['file_name'] = msg_row['file_name']
 
-                messages_by_id[msg_row['id']] = msg
+                # 읽음 상태는 참여자 워터마크에서 계산
+                _apply_read_by(msg, msg_row['id'], watermarks.get(chat_id, []))
                 chats[chat_id]['messages'].append(msg)
 
-        # 4. 모든 읽음 상태를 한 번에 조회 (N+1 제거)
-        cursor.execute('''
-            SELECT message_id, username
-            FROM message_reads
-            ORDER BY message_id
-        ''')
-
-        read_by_dict = {}
-        for row in cursor.fetchall():
-            msg_id = row['message_id']
-            if msg_id not in read_by_dict:
-                read_by_dict[msg_id] = []
-            read_by_dict[msg_id].append(row['username'])
-
-        # 읽음 상태를 메시지에 추가
-        for msg_id, msg in messages_by_id.items():
-            if msg_id in read_by_dict:
-                msg['read_by'] = read_by_dict[msg_id]
-
         return chats
 
 def load_chat_by_id(chat_id: int | str) -> Optional[dict[str, dict[str, Any]]]:
@@ -669,12 +994,14 @@ def load_chat_by_id(chat_id: int | str) -> Optional[dict[str, dict[str, Any]]]:
             'messages': []
         }
 
-        # 참여자
+        # 참여자 (읽음 워터마크 포함)
         cursor.execute('''
-            SELECT username FROM chat_participants
+            SELECT username, last_read_message_id FROM chat_participants
             WHERE chat_id = %s
+            ORDER BY id
         ''', (int(chat_id),))
-        chat['participants'] = [row['username'] for row in cursor.fetchall()]
+        watermarks = [(row['username'], row['last_read_message_id'] or 0) for row in cursor.fetchall()]
+        chat['participants'] = [username for username, _ in watermarks]
 
         # 메시지
         cursor.execute('''
@@ -685,7 +1012,6 @@ def load_chat_by_id(chat_id: int | str) -> Optional[dict[str, dict[str, Any]]]:
             ORDER BY m.id
         ''', (int(chat_id),))
 
-        messages_by_id = {}
         for msg_row in cursor.fetchall():
             msg = {
                 'username': msg_row['username'],
@@ -697,29 +1023,10 @@ def load_chat_by_id(chat_id: int | str) -> Optional[dict[str, dict[str, Any]]]:
             if msg_row['file_name']:
                 msg['file_name'] = msg_row['file_name']
 
-            messages_by_id[msg_row['id']] = msg
+            # 읽음 상태 (워터마크)
+            _apply_read_by(msg, msg_row['id'], watermarks)
             chat['messages'].append(msg)
 
-        # 읽음 상태
-        if messages_by_id:
-            placeholders = ','.join(['%s'] * len(messages_by_id))
-            cursor.execute(f'''
-                SELECT message_id, username
-                FROM message_reads
-                WHERE message_id IN ({placeholders})
-            ''', list(messages_by_id.keys()))
-
-            read_by_dict = {}
-            for row in cursor.fetchall():
-                msg_id = row['message_id']
-                if msg_id not in read_by_dict:
-                    read_by_dict[msg_id] = []
-                read_by_dict[msg_id].append(row['username'])
-
-            for msg_id, msg in messages_by_id.items():
-                if msg_id in read_by_dict:
-                    msg['read_by'] = read_by_dict[msg_id]
-
         return {str(chat_id): chat}
 
 def save_chats(chats: dict[str, dict[str, Any]]) -> None:
@@ -748,7 +1055,8 @@ def save_chats(chats: dict[str, dict[str, Any]]) -> None:
                             VALUES (%s, %s)
                         ''', participant_data)
 
-                    # 메시지
+                    # 메시지 (새로 부여된 ID로 참여자별 읽음 워터마크 계산)
+                    last_read: dict[str, int] = {}
                     for msg in chat['messages']:
                         cursor.execute('''
                             INSERT INTO messages (chat_id, username, message, timestamp, file_path, file_name)
@@ -759,20 +1067,119 @@ def save_chats(chats: dict[str, dict[str, Any]]) -> None:
 
                         message_id = cursor.fetchone()['id']
 
-                        # 읽음 상태 (배치 삽입)
-                        if 'read_by' in msg and msg['read_by']:
-                            read_data = [(message_id, reader) for reader in msg['read_by']]
-                            psycopg2.extras.execute_batch(cursor, '''
-                                INSERT INTO message_reads (message_id, username)
-                                VALUES (%s, %s)
-                            ''', read_data)
+                        for reader in msg.get('read_by') or []:
+                            last_read[reader] = message_id
+
+                    # 읽음 워터마크 (배치 업데이트)
+                    if last_read:
+                        psycopg2.extras.execute_batch(cursor, '''
+                            UPDATE chat_participants SET last_read_message_id = %s
+                            WHERE chat_id = %s AND username = %s
+                        ''', [(msg_id, int(chat_id), reader) for reader, msg_id in last_read.items()])
+
+                # 메시지 ID가 새로 부여되므로 마지막 메시지 정보 재계산
+                cursor.execute('''
+                    UPDATE chats c
+                    SET last_message_id = lm.id, last_message_at = lm.timestamp
+                    FROM (
+                        SELECT DISTINCT ON (chat_id) chat_id, id, timestamp
+                        FROM messages
+                        ORDER BY chat_id, id DESC
+                    ) lm
+                    WHERE lm.chat_id = c.id
+                ''')
 
                 conn.commit()
+                invalidate_chat_meta()
             except Exception as e:
                 conn.rollback()
                 raise e
 
 
+def create_chat(title: str, creator: str, participants: list[str]) -> dict[str, Any]:
+    """
+    채팅방 생성 (채팅방 1행 + 참여자 행만 INSERT)
+
+    Args:
+        title: 채팅방 제목
+        creator: 생성자 (방장)
+        participants: 참여자 목록 (생성자 포함)
+
+    Returns:
+        dict: 생성된 채팅방 정보 (id, title, creator, participants, messages, is_one_to_one, created_at)
+    """
+    from datetime import datetime
+
+    participants = list(dict.fromkeys(participants))  # 순서 유지 중복 제거
+    is_one_to_one = len(participants) == 2
+    created_at = datetime.now()
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+                INSERT INTO chats (title, creator, created_at)
+                VALUES (%s, %s, %s)
+                RETURNING id
+            ''', (title, creator, created_at))
+            chat_id = cursor.fetchone()['id']
+
+            psycopg2.extras.execute_values(cursor, '''
+                INSERT INTO chat_participants (chat_id, username)
+                VALUES %s
+                ON CONFLICT (chat_id, username) DO NOTHING
+            ''', [(chat_id, p) for p in participants])
+
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+
+    logger.info(f"Chat {chat_id} created by {creator} ({len(participants)} participants)")
+
+    return {
+        'id': chat_id,
+        'title': title,
+        'participants': participants,
+        'creator': creator,
+        'messages': [],
+        'is_one_to_one': is_one_to_one,
+        'created_at': created_at.isoformat()
+    }
+
+
+def delete_chat(chat_id: int | str) -> bool:
+    """
+    채팅방 삭제 (CASCADE로 참여자/메시지 삭제, 미읽음 카운터 정리)
+
+    Args:
+        chat_id: 채팅방 ID
+
+    Returns:
+        bool: 삭제 여부 (없는 채팅방이면 False)
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('DELETE FROM chats WHERE id = %s', (int(chat_id),))
+            deleted = cursor.rowcount > 0
+
+            # 미읽음 카운터는 FK가 없으므로 직접 삭제
+            cursor.execute('DELETE FROM chat_unread_counters WHERE chat_id = %s', (int(chat_id),))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+
+    invalidate_chat_meta(chat_id)
+
+    if deleted:
+        logger.info(f"Chat {chat_id} deleted")
+    return deleted
+
+
 def save_message(chat_id: int | str, message: dict[str, Any]) -> int:
     """
     개별 메시지 저장 (최적화: 전체 데이터 로드/저장 없이 단일 INSERT)
@@ -802,136 +1209,257 @@ def save_message(chat_id: int | str, message: dict[str, Any]) -> int:
         ))
 
         msg_id = cursor.fetchone()['id']
+        read_by = list(message.get('read_by', [message['username']]) or [])
+
+        # 채팅방 마지막 메시지 갱신 (채팅 목록 요약용)
+        cursor.execute('''
+            UPDATE chats SET last_message_id = %s, last_message_at = %s
+            WHERE id = %s
+        ''', (msg_id, message['timestamp'], int(chat_id)))
+
+        # 읽지 않은 참여자들의 미읽음 카운터 증가 (같은 트랜잭션, 잠금 순서 고정)
+        cursor.execute('''
+            INSERT INTO chat_unread_counters (chat_id, username, unread)
+            SELECT chat_id, username, 1
+            FROM chat_participants
+            WHERE chat_id = %s AND username != ALL(%s)
+            ORDER BY username
+            ON CONFLICT (chat_id, username)
+            DO UPDATE SET unread = chat_unread_counters.unread + 1
+        ''', (int(chat_id), read_by))
 
-        # 읽음 상태 INSERT (보낸 사람)
-        read_by = message.get('read_by', [message['username']])
+        # 읽음 워터마크 전진 (보낸 사람)
         if read_by:
-            for reader in read_by:
-                cursor.execute('''
-                    INSERT INTO message_reads (message_id, username)
-                    VALUES (%s, %s)
-                    ON CONFLICT DO NOTHING
-                ''', (msg_id, reader))
+            cursor.execute('''
+                UPDATE chat_participants
+                SET last_read_message_id = GREATEST(last_read_message_id, %s)
+                WHERE chat_id = %s AND username = ANY(%s)
+            ''', (msg_id, int(chat_id), read_by))
 
         conn.commit()
         return msg_id
 
 
-def mark_messages_as_read(chat_id: int | str, username: str) -> int:
+def apply_read_watermarks(entries: list[tuple[int | str, str, Optional[int]]]) -> list[dict[str, Any]]:
     """
-    채팅방의 모든 메시지를 읽음 처리 (최적화: 직접 INSERT)
+    여러 (채팅방, 사용자)의 읽음 워터마크를 한 번에 전진 (읽음 이벤트 일괄 반영)
 
     Args:
-        chat_id: 채팅방 ID
-        username: 읽은 사용자명
+        entries: [(chat_id, username, message_id)] - message_id가 None이면 채팅방 전체 읽음
 
     Returns:
-        int: 새로 읽음 처리된 메시지 수
+        list: 실제로 전진한 항목 [{chat_id, username, last_read_message_id}]
     """
+    if not entries:
+        return []
+
+    values = sorted((int(chat_id), username, message_id) for chat_id, username, message_id in entries)
+
     with get_db_connection() as conn:
         cursor = conn.cursor()
 
-        # 아직 읽지 않은 메시지에 대해 읽음 상태 추가
+        # 잠금 순서: 미읽음 카운터 → 참여자 (메시지 저장 시 카운터 증가와 같은 순서)
+        # 카운터 행을 정렬된 순서로 먼저 잠가 교착 상태 방지
         cursor.execute('''
-            INSERT INTO message_reads (message_id, username)
-            SELECT m.id, %s
-            FROM messages m
-            WHERE m.chat_id = %s
-            AND NOT EXISTS (
-                SELECT 1 FROM message_reads mr
-                WHERE mr.message_id = m.id AND mr.username = %s
+            SELECT 1 FROM chat_unread_counters
+            WHERE (chat_id, username) IN (
+                SELECT * FROM UNNEST(%s::integer[], %s::text[])
+            )
+            ORDER BY chat_id, username
+            FOR UPDATE
+        ''', ([chat_id for chat_id, _, _ in values], [username for _, username, _ in values]))
+
+        # 워터마크 UPSERT + 미읽음 카운터 감소를 단일 문장으로 처리
+        rows = psycopg2.extras.execute_values(cursor, '''
+            WITH v(chat_id, username, target) AS (VALUES %s),
+            targets AS (
+                SELECT cp.chat_id, cp.username,
+                       cp.last_read_message_id AS old_read,
+                       LEAST(COALESCE(v.target, lm.max_id), lm.max_id) AS new_read
+                FROM v
+                INNER JOIN chat_participants cp
+                    ON cp.chat_id = v.chat_id AND cp.username = v.username
+                CROSS JOIN LATERAL (
+                    SELECT MAX(id) AS max_id FROM messages WHERE chat_id = v.chat_id
+                ) lm
+            ),
+            moved AS (
+                UPDATE chat_participants cp
+                SET last_read_message_id = t.new_read
+                FROM targets t
+                WHERE cp.chat_id = t.chat_id AND cp.username = t.username
+                AND t.new_read > cp.last_read_message_id
+                RETURNING cp.chat_id, cp.username, t.old_read, t.new_read
+            ),
+            counted AS (
+                UPDATE chat_unread_counters uc
+                SET unread = GREATEST(uc.unread - (
+                    SELECT COUNT(*) FROM messages m
+                    WHERE m.chat_id = mv.chat_id
+                    AND m.id > mv.old_read AND m.id <= mv.new_read
+                    AND m.username != mv.username
+                ), 0)
+                FROM moved mv
+                WHERE uc.chat_id = mv.chat_id AND uc.username = mv.username
             )
-        ''', (username, int(chat_id), username))
+            SELECT chat_id, username, new_read AS last_read_message_id FROM moved
+        ''', values, template='(%s::integer, %s::text, %s::integer)', fetch=True)
 
-        affected = cursor.rowcount
         conn.commit()
-        return affected
+        return [dict(row) for row in rows]
+
 
+# ==================== 채팅방 메타데이터 캐시 ====================
+# 채팅방 정보/참여자 구성은 자주 바뀌지 않으므로 app_cache(L1 메모리 + L2 Redis)에 캐시
+# 변경 함수(제목 변경, 멤버 추가/내보내기/나가기, 관리자 지정, 알림 설정)에서 invalidate_cache로
+# 무효화하면 다른 워커 프로세스의 L1도 함께 무효화됨
 
-def mark_single_message_as_read(chat_id: int | str, message_id: int, username: str) -> bool:
+CHAT_META_CACHE_TTL = 600  # 무효화 메시지 유실 대비 최대 보관 시간 (초)
+_chat_meta_lock = threading.Lock()
+_chat_meta_generation = 0  # 무효화마다 증가 (조회 중 무효화된 결과를 캐시하지 않기 위해)
+
+
+def invalidate_chat_meta(chat_id: Optional[int | str] = None) -> None:
     """
-    특정 메시지 하나를 읽음 처리
+    채팅방 메타데이터 캐시 무효화 (모든 워커)
 
     Args:
-        chat_id: 채팅방 ID
-        message_id: 메시지 ID
-        username: 읽은 사용자명
+        chat_id: 채팅방 ID (None이면 전체)
+    """
+    global _chat_meta_generation
+    with _chat_meta_lock:
+        _chat_meta_generation += 1
+    invalidate_cache(f'chat_meta:{int(chat_id)}' if chat_id is not None else 'chat_meta:')
+
+
+def get_chat_meta(chat_id: int | str) -> Optional[dict[str, Any]]:
+    """
+    채팅방 메타데이터 조회 (캐시 우선)
 
     Returns:
-        bool: 성공 여부
+        dict: {id, title, creator, created_at, chat_type,
+               participants: [{username, role, muted}]} 또는 None
+        반환값은 캐시와 공유되므로 수정하지 말 것
     """
+    chat_id = int(chat_id)
+    cache_key = f'chat_meta:{chat_id}'
+
+    meta = app_cache.get(cache_key)
+    if meta is not None:
+        return meta
+    generation = _chat_meta_generation
+
     with get_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('''
-            INSERT INTO message_reads (message_id, username)
-            VALUES (%s, %s)
-            ON CONFLICT (message_id, username) DO NOTHING
-        ''', (int(message_id), username))
-        conn.commit()
-        return cursor.rowcount > 0
+            SELECT c.id, c.title, c.creator, c.created_at, c.chat_type,
+                   (SELECT json_agg(json_build_object(
+                        'username', cp.username,
+                        'role', COALESCE(cp.role, 'member'),
+                        'muted', COALESCE(cp.muted, FALSE)) ORDER BY cp.id)
+                    FROM chat_participants cp WHERE cp.chat_id = c.id) as participants
+            FROM chats c
+            WHERE c.id = %s
+        ''', (chat_id,))
+        row = cursor.fetchone()
+
+    if not row:
+        return None
+
+    meta = {
+        'id': row['id'],
+        'title': row['title'],
+        'creator': row['creator'],
+        'created_at': str(row['created_at']),
+        'chat_type': row['chat_type'] or 'direct',
+        'participants': row['participants'] or []
+    }
+
+    with _chat_meta_lock:
+        fresh = generation == _chat_meta_generation
+    if fresh:
+        app_cache.set(cache_key, meta, ttl=CHAT_META_CACHE_TTL)
+
+    return meta
 
 
-def get_message_read_by(message_id: int) -> list[str]:
+@log_slow_query
+def get_chat_info(chat_id: int | str) -> Optional[dict[str, Any]]:
     """
-    특정 메시지의 읽은 사용자 목록 조회
+    특정 채팅방 정보 조회 (참여자 목록 포함, 메타데이터 캐시 사용)
 
     Args:
-        message_id: 메시지 ID
+        chat_id: 채팅방 ID
 
     Returns:
-        list: 읽은 사용자 username 리스트
+        dict: 채팅방 정보 또는 None
     """
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT username FROM message_reads
-            WHERE message_id = %s
-            ORDER BY read_at
-        ''', (int(message_id),))
-        return [row['username'] for row in cursor.fetchall()]
+    meta = get_chat_meta(chat_id)
+    if not meta:
+        return None
+
+    return {
+        'id': meta['id'],
+        'title': meta['title'],
+        'creator': meta['creator'],
+        'created_at': meta['created_at'],
+        'participants': [p['username'] for p in meta['participants']]
+    }
 
 
 @log_slow_query
-def get_chat_info(chat_id: int | str) -> Optional[dict[str, Any]]:
+def get_chat_fanout_targets(chat_id: int | str) -> Optional[dict[str, Any]]:
     """
-    특정 채팅방 정보 조회 (참여자 목록 포함)
+    메시지 알림 발송 대상 일괄 조회 (참여자 설정 + 배지 카운트 + 푸시 구독 여부를 단일 쿼리로)
 
     Args:
         chat_id: 채팅방 ID
 
     Returns:
-        dict: 채팅방 정보 또는 None
+        dict: {title, participants: [{username, chat_push_preview, unread_chats,
+               pending_tasks, has_push_subscription}]} 또는 None
     """
     with get_db_connection() as conn:
         cursor = conn.cursor()
+        cursor.execute('''
+            SELECT c.title, cp.username,
+                   COALESCE(u.chat_push_preview, TRUE) as chat_push_preview,
+                   (SELECT COALESCE(SUM(uc.unread), 0)
+                    FROM chat_unread_counters uc
+                    INNER JOIN chat_participants mine
+                        ON mine.chat_id = uc.chat_id AND mine.username = uc.username
+                    WHERE uc.username = cp.username) as unread_chats,
+                   (SELECT COUNT(*) FROM tasks t
+                    WHERE t.assigned_to = cp.username AND t.status != '완료') as pending_tasks,
+                   EXISTS (SELECT 1 FROM push_subscriptions ps
+                           WHERE ps.username = cp.username) as has_push_subscription
+            FROM chats c
+            INNER JOIN chat_participants cp ON cp.chat_id = c.id
+            LEFT JOIN users u ON u.username = cp.username
+            WHERE c.id = %s
+            ORDER BY cp.id
+        ''', (int(chat_id),))
+        rows = cursor.fetchall()
 
-        # 채팅방 기본 정보
-        cursor.execute('SELECT * FROM chats WHERE id = %s', (int(chat_id),))
-        chat_row = cursor.fetchone()
-
-        if not chat_row:
+        if not rows:
             return None
 
-        # 참여자 목록
-        cursor.execute(
-            'SELECT username FROM chat_participants WHERE chat_id = %s',
-            (int(chat_id),)
-        )
-        participants = [row['username'] for row in cursor.fetchall()]
-
         return {
-            'id': chat_row['id'],
-            'title': chat_row['title'],
-            'creator': chat_row['creator'],
-            'created_at': str(chat_row['created_at']),
-            'participants': participants
+            'title': rows[0]['title'],
+            'participants': [{
+                'username': row['username'],
+                'chat_push_preview': bool(row['chat_push_preview']),
+                'unread_chats': int(row['unread_chats']),
+                'pending_tasks': row['pending_tasks'],
+                'has_push_subscription': row['has_push_subscription']
+            } for row in rows]
         }
 
 
 @log_slow_query
 def get_unread_chat_count(username: str) -> int:
     """
-    특정 사용자의 읽지 않은 채팅 메시지 개수 조회 (최적화: 단일 쿼리)
+    특정 사용자의 읽지 않은 채팅 메시지 개수 조회 (미읽음 카운터 합계)
 
     Args:
         username: 사용자명
@@ -942,23 +1470,459 @@ def get_unread_chat_count(username: str) -> int:
     with get_db_connection() as conn:
         cursor = conn.cursor()
 
-        # 내가 참여한 채팅방에서, 내가 보내지 않은 메시지 중, 내가 읽지 않은 메시지 개수
+        # 내가 참여 중인 채팅방의 미읽음 카운터 합계 (메시지 이력 크기와 무관)
         cursor.execute('''
-            SELECT COUNT(*) as count
-            FROM messages m
-            INNER JOIN chat_participants cp ON m.chat_id = cp.chat_id
-            WHERE cp.username = %s
-            AND m.username != %s
-            AND NOT EXISTS (
-                SELECT 1 FROM message_reads mr
-                WHERE mr.message_id = m.id AND mr.username = %s
-            )
-        ''', (username, username, username))
+            SELECT COALESCE(SUM(uc.unread), 0) as count
+            FROM chat_unread_counters uc
+            INNER JOIN chat_participants cp
+                ON cp.chat_id = uc.chat_id AND cp.username = uc.username
+            WHERE uc.username = %s
+        ''', (username,))
 
+        row = cursor.fetchone()
+        return int(row['count']) if row else 0
+
+
+@log_slow_query
+def get_chat_summaries(username: Optional[str] = None,
+                       message_limit: int = 1) -> dict[str, dict[str, Any]]:
+    """
+    채팅 목록 요약 조회 (마지막 메시지 + 미읽음 수, 최근 활동순)
+
+    Args:
+        username: 사용자명 (None이면 전체 채팅방, 미읽음 수는 0)
+        message_limit: 채팅방당 포함할 최신 메시지 개수 (0이면 메시지 제외)
+
+    Returns:
+        dict: {chat_id(str): {title, creator, created_at, chat_type, participants,
+               participant_roles, messages, last_activity, unread_count, order}}
+              (JSON 응답은 키가 정렬되므로 최근 활동순은 order(0부터)로 전달)
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        # 채팅방 + 참여자 + 마지막 메시지 + 미읽음 수를 단일 쿼리로 조회
+        unread_column = 'COALESCE(uc.unread, 0)' if username is not None else '0'
+        sql = f'''
+            SELECT c.id, c.title, c.creator, c.created_at, c.chat_type,
+                   COALESCE(c.last_message_at, c.created_at) as last_activity,
+                   m.id as msg_id, m.username as msg_username, m.message as msg_message,
+                   m.timestamp as msg_timestamp, m.file_path as msg_file_path,
+                   m.file_name as msg_file_name,
+                   {unread_column} as unread_count,
+                   (SELECT json_agg(json_build_array(p.username, COALESCE(p.role, 'member')) ORDER BY p.id)
+                    FROM chat_participants p WHERE p.chat_id = c.id) as participants
+            FROM chats c
+        '''
+        params: list[Any] = []
+
+        if username is not None:
+            sql += '''
+            INNER JOIN chat_participants me ON me.chat_id = c.id AND me.username = %s
+            LEFT JOIN chat_unread_counters uc ON uc.chat_id = c.id AND uc.username = me.username
+            '''
+            params.append(username)
+
+        sql += '''
+            LEFT JOIN messages m ON m.id = c.last_message_id
+            ORDER BY COALESCE(c.last_message_at, c.created_at) DESC, c.id DESC
+        '''
+        cursor.execute(sql, params)
+
+        chats = {}
+        for order, row in enumerate(cursor.fetchall()):
+            participants = row['participants'] or []
+            messages = []
+            if message_limit > 0 and row['msg_id'] is not None:
+                msg = {
+                    'id': row['msg_id'],
+                    'username': row['msg_username'],
+                    'message': row['msg_message'],
+                    'timestamp': str(row['msg_timestamp'])
+                }
+                if row['msg_file_path']:
+                    msg['file_path'] = row['msg_file_path']
+                if row['msg_file_name']:
+                    msg['file_name'] = row['msg_file_name']
+                messages.append(msg)
+
+            chats[str(row['id'])] = {
+                'title': row['title'],
+                'creator': row['creator'],
+                'created_at': str(row['created_at']),
+                'chat_type': row['chat_type'] or 'direct',
+                'participants': [p[0] for p in participants],
+                'participant_roles': {p[0]: p[1] for p in participants},
+                'messages': messages,
+                'last_activity': str(row['last_activity']),
+                'unread_count': row['unread_count'],
+                'order': order
+            }
+
+        # 최신 메시지를 2개 이상 요청한 경우에만 추가 조회 (채팅방별 상위 N개)
+        if message_limit > 1 and chats:
+            cursor.execute('''
+                SELECT id, chat_id, username, message, timestamp, file_path, file_name
+                FROM (
+                    SELECT m.*, ROW_NUMBER() OVER (PARTITION BY m.chat_id ORDER BY m.id DESC) as rn
+                    FROM messages m
+                    WHERE m.chat_id = ANY(%s)
+                ) ranked
+                WHERE rn <= %s
+                ORDER BY chat_id, id
+            ''', ([int(chat_id) for chat_id in chats], message_limit))
+
+            recent_by_chat: dict[str, list[Any]] = {}
+            for row in cursor.fetchall():
+                recent_by_chat.setdefault(str(row['chat_id']), []).append(row)
+            for chat_id, rows in recent_by_chat.items():
+                chats[chat_id]['messages'] = _build_message_dicts(cursor, rows)
+
+        return chats
+
+
+# ==================== 채팅방 단위 메시지 조회 ====================
+
+def _build_message_dicts(cursor: Any, rows: list[Any],
+                         chat_id: Optional[int | str] = None) -> list[dict[str, Any]]:
+    """
+    메시지 행을 load_chats()와 같은 형식의 dict로 변환 (읽음 상태 포함, 내부 함수)
+
+    chat_id가 없으면 각 행의 chat_id 컬럼을 사용 (여러 채팅방 검색 결과)
+    """
+    def row_chat_id(msg_row: Any) -> int:
+        return int(chat_id) if chat_id is not None else msg_row['chat_id']
+
+    # 현재 페이지에 포함된 채팅방의 참여자 워터마크만 조회
+    watermarks = _load_read_watermarks(cursor, list({row_chat_id(row) for row in rows}))
+
+    messages = []
+    for msg_row in rows:
+        msg = {
+            'id': msg_row['id'],
+            'username': msg_row['username'],
+            'message': msg_row['message'],
+            'timestamp': str(msg_row['timestamp'])
+        }
+        if msg_row['file_path']:
+            msg['file_path'] = msg_row['file_path']
+        if msg_row['file_name']:
+            msg['file_name'] = msg_row['file_name']
+        _apply_read_by(msg, msg_row['id'], watermarks.get(row_chat_id(msg_row), []))
+        messages.append(msg)
+
+    return messages
+
+
+def chat_exists(chat_id: int | str) -> bool:
+    """채팅방 존재 여부 확인 (메타데이터 캐시 사용)"""
+    return get_chat_meta(chat_id) is not None
+
+
+def is_chat_participant(chat_id: int | str, username: str) -> bool:
+    """채팅방 참여자 여부 확인 (메타데이터 캐시 사용)"""
+    meta = get_chat_meta(chat_id)
+    if not meta:
+        return False
+    return any(p['username'] == username for p in meta['participants'])
+
+
+def get_chat_message_count(chat_id: int | str) -> int:
+    """채팅방 전체 메시지 개수"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) as count FROM messages WHERE chat_id = %s', (int(chat_id),))
         row = cursor.fetchone()
         return row['count'] if row else 0
 
 
+@log_slow_query
+def get_chat_messages_page(chat_id: int | str, limit: int = 50,
+                           before_id: Optional[int] = None,
+                           after_id: Optional[int] = None,
+                           offset: int = 0) -> tuple[list[dict[str, Any]], bool]:
+    """
+    채팅방 메시지 페이지 조회 (키셋 페이지네이션)
+
+    Args:
+        chat_id: 채팅방 ID
+        limit: 반환할 메시지 개수
+        before_id: 이 ID보다 이전 메시지만 (위로 스크롤)
+        after_id: 이 ID보다 이후 메시지만 (재연결 동기화)
+        offset: before_id/after_id가 없을 때 최신 메시지에서 건너뛸 개수 (호환용)
+
+    Returns:
+        tuple: (시간순 메시지 목록, 조회 방향으로 더 있는지 여부)
+    """
+    # limit + 1개를 조회해서 다음 페이지 존재 여부 판단
+    fetch_count = limit + 1
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        if after_id is not None:
+            cursor.execute('''
+                SELECT id, username, message, timestamp, file_path, file_name
+                FROM messages
+                WHERE chat_id = %s AND id > %s
+                ORDER BY id ASC
+                LIMIT %s
+            ''', (int(chat_id), int(after_id), fetch_count))
+            rows = cursor.fetchall()
+        elif before_id is not None:
+            cursor.execute('''
+                SELECT id, username, message, timestamp, file_path, file_name
+                FROM messages
+                WHERE chat_id = %s AND id < %s
+                ORDER BY id DESC
+                LIMIT %s
+            ''', (int(chat_id), int(before_id), fetch_count))
+            rows = cursor.fetchall()
+        else:
+            cursor.execute('''
+                SELECT id, username, message, timestamp, file_path, file_name
+                FROM messages
+                WHERE chat_id = %s
+                ORDER BY id DESC
+                LIMIT %s OFFSET %s
+            ''', (int(chat_id), fetch_count, max(0, offset)))
+            rows = cursor.fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if after_id is None:
+            rows.reverse()  # 최신순으로 가져왔으므로 시간순으로 뒤집기
+
+        return _build_message_dicts(cursor, rows, chat_id), has_more
+
+
+def _escape_like(text: str) -> str:
+    """LIKE 패턴 특수문자(%, _, \\) 이스케이프 (내부 함수)"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+MESSAGE_SEARCH_MAX_RESULTS = 1000  # 검색 대상: 조건에 맞는 최신 메시지 N건 (결과 수 상한)
+
+
+def _search_message_window(cursor: Any, columns: str, scope_join: str, conditions: str,
+                           params: list[Any], order_by: str, order_params: list[Any],
+                           limit: int, offset: int, oldest_first: bool = False) -> tuple[list[Any], int]:
+    """
+    검색 조건에 맞는 최신 메시지 MESSAGE_SEARCH_MAX_RESULTS건 안에서 정렬/페이지 (내부 함수)
+
+    일치 메시지는 ID 순서(인덱스 순서)로 상한까지만 모으고, 유사도 정렬과
+    결과 수 집계는 그 안에서만 하므로 대화 기록이 늘어나도 검색 비용이 일정함
+    (oldest_first면 가장 오래된 N건 - 시간순으로 앞에서부터 넘겨보는 경우)
+
+    Returns:
+        tuple: (페이지 행, 결과 수 (상한 이하))
+    """
+    cursor.execute(f'''
+        WITH matched AS (
+            SELECT m.id
+            FROM messages m
+            {scope_join}
+            WHERE TRUE {conditions}
+            ORDER BY m.id {'ASC' if oldest_first else 'DESC'}
+            LIMIT %s
+        )
+        SELECT {columns}, (SELECT COUNT(*) FROM matched) as total_count
+        FROM matched w
+        INNER JOIN messages m ON m.id = w.id
+        INNER JOIN chats c ON c.id = m.chat_id
+        ORDER BY {order_by}
+        LIMIT %s OFFSET %s
+    ''', params + [MESSAGE_SEARCH_MAX_RESULTS] + order_params + [limit, max(0, offset)])
+    rows = cursor.fetchall()
+    return rows, rows[0]['total_count'] if rows else 0
+
+
+def _message_search_conditions(query: str, date_from: str, date_to: str) -> tuple[str, list[Any]]:
+    """메시지 검색 공통 WHERE 조건 생성 (pg_trgm 인덱스 사용, 내부 함수)
+
+    3글자 미만 검색어는 트라이그램이 만들어지지 않아 인덱스를 타지 못하므로
+    최신 메시지부터 훑다가 MESSAGE_SEARCH_MAX_RESULTS건을 채우면 멈춤
+    """
+    conditions = ''
+    params: list[Any] = []
+
+    if query:
+        conditions += " AND m.message ILIKE %s ESCAPE '\\'"
+        params.append(f'%{_escape_like(query)}%')
+
+    if date_from:
+        conditions += ' AND m.timestamp >= %s::date'
+        params.append(date_from)
+
+    if date_to:
+        conditions += ' AND m.timestamp < %s::date + 1'
+        params.append(date_to)
+
+    return conditions, params
+
+
+@log_slow_query
+def search_chat_messages_in_room(chat_id: int | str, query: str = '', date_filter: str = '',
+                                 limit: int = 500, offset: int = 0,
+                                 sort: str = 'time') -> tuple[list[dict[str, Any]], int, bool]:
+    """
+    채팅방 내 메시지 검색 (검색어 및 날짜 필터)
+
+    Args:
+        chat_id: 채팅방 ID
+        query: 검색어 (부분 일치)
+        date_filter: 특정 날짜 (YYYY-MM-DD)
+        limit: 반환할 최대 결과 수
+        offset: 건너뛸 결과 수
+        sort: 'time' (시간순) 또는 'relevance' (최신 MESSAGE_SEARCH_MAX_RESULTS건 안에서 유사도순)
+
+    Returns:
+        tuple: (검색 결과 메시지 목록, 결과 수 (MESSAGE_SEARCH_MAX_RESULTS 상한), 다음 페이지 여부)
+    """
+    conditions, params = _message_search_conditions(query, date_filter, date_filter)
+
+    if sort == 'relevance' and query:
+        order_by = 'similarity(m.message, %s) DESC, m.id DESC'
+        order_params = [query]
+    else:
+        order_by = 'm.id'
+        order_params = []
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        rows, total = _search_message_window(
+            cursor, 'm.id, m.username, m.message, m.timestamp, m.file_path, m.file_name',
+            '', ' AND m.chat_id = %s' + conditions, [int(chat_id)] + params,
+            order_by, order_params, limit, offset, oldest_first=not order_params
+        )
+        return _build_message_dicts(cursor, rows, chat_id), total, offset + len(rows) < total
+
+
+@log_slow_query
+def search_user_chat_messages(username: Optional[str], query: str = '', date_from: str = '',
+                              date_to: str = '', limit: int = 50, offset: int = 0,
+                              sort: str = 'time') -> tuple[list[dict[str, Any]], int, bool]:
+    """
+    내가 참여한 모든 채팅방에서 메시지 검색 (최신순, 요청 시 유사도순)
+
+    Args:
+        username: 사용자명 (None이면 전체 채팅방)
+        query: 검색어 (부분 일치)
+        date_from: 시작 날짜 (YYYY-MM-DD)
+        date_to: 종료 날짜 (YYYY-MM-DD)
+        limit: 반환할 최대 결과 수
+        offset: 건너뛸 결과 수
+        sort: 'time' (최신순) 또는 'relevance' (최신 MESSAGE_SEARCH_MAX_RESULTS건 안에서 유사도순)
+
+    Returns:
+        tuple: (검색 결과 목록 - chat_id, chat_title 포함, 결과 수 (MESSAGE_SEARCH_MAX_RESULTS 상한), 다음 페이지 여부)
+    """
+    conditions, params = _message_search_conditions(query, date_from, date_to)
+
+    if username is not None:
+        scope_join = 'INNER JOIN chat_participants cp ON cp.chat_id = m.chat_id AND cp.username = %s'
+        scope_params = [username]
+    else:
+        scope_join = ''
+        scope_params = []
+
+    if sort == 'relevance' and query:
+        order_by = 'similarity(m.message, %s) DESC, m.id DESC'
+        order_params = [query]
+    else:
+        order_by = 'm.id DESC'
+        order_params = []
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        rows, total = _search_message_window(
+            cursor,
+            'm.id, m.chat_id, c.title as chat_title, m.username, m.message, m.timestamp, '
+            'm.file_path, m.file_name',
+            scope_join, conditions, scope_params + params,
+            order_by, order_params, limit, offset
+        )
+
+        results = _build_message_dicts(cursor, rows)
+        for result, row in zip(results, rows):
+            result['chat_id'] = str(row['chat_id'])
+            result['chat_title'] = row['chat_title']
+        return results, total, offset + len(rows) < total
+
+
+def get_chat_message_dates(chat_id: int | str) -> list[str]:
+    """채팅방에 메시지가 있는 날짜 목록 (YYYY-MM-DD, 오름차순)"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT DISTINCT TO_CHAR(timestamp, 'YYYY-MM-DD') as msg_date
+            FROM messages
+            WHERE chat_id = %s
+            ORDER BY msg_date
+        ''', (int(chat_id),))
+        return [row['msg_date'] for row in cursor.fetchall()]
+
+
+@log_slow_query
+def get_chat_message_context(chat_id: int | str, message_id: int,
+                             before: int = 25, after: int = 25) -> Optional[dict[str, Any]]:
+    """
+    특정 메시지 주변 메시지 조회 (검색/날짜 이동용)
+
+    Returns:
+        dict: messages, target_index, first_msg_index, total_messages,
+              has_more_before, has_more_after / 메시지가 없으면 None
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        # 타겟 메시지의 채팅방 내 위치 (인덱스 범위 카운트)
+        cursor.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM messages WHERE chat_id = %s AND id < %s) as position,
+                (SELECT COUNT(*) FROM messages WHERE chat_id = %s) as total
+            FROM messages
+            WHERE id = %s AND chat_id = %s
+        ''', (int(chat_id), int(message_id), int(chat_id), int(message_id), int(chat_id)))
+        pos_row = cursor.fetchone()
+        if not pos_row:
+            return None
+
+        position = pos_row['position']
+        total = pos_row['total']
+
+        cursor.execute('''
+            SELECT id, username, message, timestamp, file_path, file_name
+            FROM messages
+            WHERE chat_id = %s AND id < %s
+            ORDER BY id DESC
+            LIMIT %s
+        ''', (int(chat_id), int(message_id), max(0, before)))
+        before_rows = list(reversed(cursor.fetchall()))
+
+        cursor.execute('''
+            SELECT id, username, message, timestamp, file_path, file_name
+            FROM messages
+            WHERE chat_id = %s AND id >= %s
+            ORDER BY id ASC
+            LIMIT %s
+        ''', (int(chat_id), int(message_id), max(0, after) + 1))
+        after_rows = cursor.fetchall()
+
+        messages = _build_message_dicts(cursor, before_rows + after_rows, chat_id)
+        start_index = position - len(before_rows)
+        end_index = position + len(after_rows)
+
+        return {
+            'messages': messages,
+            'target_index': len(before_rows),
+            'first_msg_index': start_index,
+            'total_messages': total,
+            'has_more_before': start_index > 0,
+            'has_more_after': end_index < total
+        }
+
+
 # ==================== 프로모션 관리 (최적화) ====================
 
 def load_promotions() -> list[dict[str, Any]]:
@@ -1032,6 +1996,315 @@ def save_promotions(promotions: list[dict[str, Any]]) -> None:
             except Exception as e:
                 conn.rollback()
                 raise e
+    _promotion_committed()
+
+# 프로모션 본문 컬럼 (id, 생성/수정 정보, 구독 유형 제외)
+PROMOTION_FIELDS = ('category', 'product_name', 'channel', 'promotion_name', 'promotion_code',
+                    'content', 'start_date', 'end_date', 'discount_amount', 'session_exemption')
+
+
+def _fetch_promotions(cursor: Any, where: str = '', params: tuple | list = (),
+                      limit: Optional[int] = None, offset: int = 0) -> list[dict[str, Any]]:
+    """프로모션 조회 + 구독 유형 연결 (내부 함수)"""
+    page = ''
+    if limit is not None:
+        page = 'LIMIT %s OFFSET %s'
+        params = list(params) + [limit, offset]
+
+    cursor.execute(f'''
+        SELECT p.*,
+               COALESCE((SELECT array_agg(st.subscription_type ORDER BY st.id)
+                         FROM promotion_subscription_types st
+                         WHERE st.promotion_id = p.id), '{{}}') as subscription_types
+        FROM promotions p
+        {where}
+        ORDER BY p.id
+        {page}
+    ''', params)
+
+    promotions = []
+    for row in cursor.fetchall():
+        promo = dict(row)
+        # Timestamp를 문자열로 변환
+        if promo.get('created_at'):
+            promo['created_at'] = str(promo['created_at'])
+        if promo.get('updated_at'):
+            promo['updated_at'] = str(promo['updated_at'])
+        promotions.append(promo)
+    return promotions
+
+
+def _promotion_committed() -> None:
+    """프로모션 쓰기 커밋 후 카탈로그 버전 증가 + 스냅샷 무효화 (내부 함수)
+
+    시퀀스는 트랜잭션과 무관하게 바로 보이므로, 커밋 전에 올리면 다른 워커가
+    새 버전 번호로 이전 데이터를 읽어 스냅샷을 만들고 이후 갱신을 건너뛸 수 있음
+    반드시 커밋된 뒤에 올려서 새 버전을 본 워커는 변경된 데이터도 보게 함
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT nextval('promotion_version_seq')")
+        conn.commit()
+    on_promotion_modified()
+
+
+def get_promotion_version() -> int:
+    """현재 프로모션 카탈로그 버전 (promotion_version_seq)"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT CASE WHEN is_called THEN last_value ELSE 0 END as version FROM promotion_version_seq")
+        return cursor.fetchone()['version']
+
+
+def _replace_subscription_types(cursor: Any, subscription_types: dict[int, list[str]]) -> None:
+    """프로모션별 구독 유형 교체 (삭제 후 배치 INSERT, 내부 함수)"""
+    if not subscription_types:
+        return
+    cursor.execute('DELETE FROM promotion_subscription_types WHERE promotion_id = ANY(%s)',
+                   (list(subscription_types.keys()),))
+    rows = [(promo_id, st) for promo_id, types in subscription_types.items() for st in types or []]
+    if rows:
+        psycopg2.extras.execute_values(cursor, '''
+            INSERT INTO promotion_subscription_types (promotion_id, subscription_type)
+            VALUES %s
+        ''', rows)
+
+
+# 프로모션 통합 검색 대상 (add_promotion_search_index.sql의 trigram 인덱스와 같은 식이어야 함)
+PROMOTION_SEARCH_EXPR = (
+    "(COALESCE(p.product_name, '') || E'\\n' || COALESCE(p.channel, '') || E'\\n' || "
+    "COALESCE(p.promotion_name, '') || E'\\n' || COALESCE(p.promotion_code, '') || E'\\n' || "
+    "COALESCE(p.content, ''))"
+)
+
+
+def _promotion_filter_conditions(filters: dict[str, Any]) -> tuple[str, list[Any]]:
+    """프로모션 목록 필터 WHERE 조건 생성 (내부 함수)
+
+    날짜는 'YYYY-MM-DD' 문자열로 저장되고 종료일 '무기한'은 종료되지 않은 것으로 취급
+    """
+    conditions = ''
+    params: list[Any] = []
+
+    for field in ('category', 'product_name', 'channel', 'promotion_name'):
+        if filters.get(field):
+            conditions += f' AND p.{field} = %s'
+            params.append(filters[field])
+
+    if filters.get('subscription_type'):
+        conditions += ''' AND EXISTS (SELECT 1 FROM promotion_subscription_types st
+                                      WHERE st.promotion_id = p.id AND st.subscription_type = %s)'''
+        params.append(filters['subscription_type'])
+
+    if filters.get('search'):
+        conditions += f" AND {PROMOTION_SEARCH_EXPR} ILIKE %s ESCAPE '\\'"
+        params.append(f"%{_escape_like(filters['search'])}%")
+
+    # 해당 날짜에 진행 중 (시작했고 종료되지 않음)
+    if filters.get('active_on'):
+        conditions += " AND p.start_date <= %s AND (p.end_date = '무기한' OR p.end_date >= %s)"
+        params.extend([filters['active_on'], filters['active_on']])
+
+    # 해당 날짜 기준 종료되지 않음 (시작 전 포함)
+    if filters.get('not_ended_on'):
+        conditions += " AND (p.end_date = '무기한' OR p.end_date >= %s)"
+        params.append(filters['not_ended_on'])
+
+    return conditions, params
+
+
+@log_slow_query
+def query_promotions(filters: Optional[dict[str, Any]] = None, limit: Optional[int] = None,
+                     offset: int = 0, include_total: bool = False,
+                     include_facets: bool = False) -> dict[str, Any]:
+    """
+    프로모션 목록 조회 (필터/검색/페이지를 SQL에서 처리)
+
+    평소에는 promotion_catalog의 메모리 스냅샷으로 응답하고,
+    워커에 아직 스냅샷이 없을 때(시작 직후 빌드 중)만 이 인덱스 조회로 응답
+
+    Args:
+        filters: {category, product_name, channel, promotion_name, subscription_type, search,
+                  active_on: 'YYYY-MM-DD', not_ended_on: 'YYYY-MM-DD'}
+        limit: 페이지 크기 (None이면 조건에 맞는 전체)
+        offset: 건너뛸 행 수
+        include_total: 조건에 맞는 전체 개수 포함 여부
+        include_facets: 조건에 맞는 대분류/상품/채널별 개수 포함 여부
+
+    Returns:
+        dict: {items, total(선택), facets(선택): {categories, products, channels: {값: 개수}}}
+    """
+    conditions, params = _promotion_filter_conditions(filters or {})
+    where = f'WHERE TRUE {conditions}'
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        result: dict[str, Any] = {
+            'items': _fetch_promotions(cursor, where, params, limit=limit, offset=offset)
+        }
+
+        if include_total:
+            cursor.execute(f'SELECT COUNT(*) as count FROM promotions p {where}', params)
+            result['total'] = cursor.fetchone()['count']
+
+        if include_facets:
+            cursor.execute(f'''
+                SELECT p.category, p.product_name, p.channel,
+                       GROUPING(p.category) as g_category,
+                       GROUPING(p.product_name) as g_product,
+                       COUNT(*) as count
+                FROM promotions p
+                {where}
+                GROUP BY GROUPING SETS ((p.category), (p.product_name), (p.channel))
+            ''', params)
+            facets = {'categories': {}, 'products': {}, 'channels': {}}
+            for row in cursor.fetchall():
+                if row['g_category'] == 0:
+                    facets['categories'][row['category']] = row['count']
+                elif row['g_product'] == 0:
+                    facets['products'][row['product_name']] = row['count']
+                else:
+                    facets['channels'][row['channel']] = row['count']
+            result['facets'] = facets
+
+        return result
+
+
+def get_promotion_filter_values() -> list[dict[str, Any]]:
+    """필터 옵션용 (대분류, 상품, 채널, 프로모션명) 고유 조합 조회"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT DISTINCT category, product_name, channel, promotion_name
+            FROM promotions
+        ''')
+        return [dict(row) for row in cursor.fetchall()]
+
+
+def get_promotion(promo_id: int) -> Optional[dict[str, Any]]:
+    """프로모션 단건 조회 (없으면 None)"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        promotions = _fetch_promotions(cursor, 'WHERE p.id = %s', (promo_id,))
+        return promotions[0] if promotions else None
+
+
+def get_promotions_by_ids(promo_ids: list[int]) -> list[dict[str, Any]]:
+    """여러 프로모션 조회 (ID 목록)"""
+    if not promo_ids:
+        return []
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        return _fetch_promotions(cursor, 'WHERE p.id = ANY(%s)', (list(promo_ids),))
+
+
+def insert_promotions(promotions: list[dict[str, Any]], created_by: str) -> list[int]:
+    """
+    프로모션 일괄 추가 (execute_values 배치 INSERT, 한 트랜잭션)
+
+    Args:
+        promotions: 프로모션 목록 (PROMOTION_FIELDS + subscription_types)
+        created_by: 등록자
+
+    Returns:
+        list: 추가된 프로모션 ID (입력 순서)
+    """
+    if not promotions:
+        return []
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        try:
+            # 구독 유형 연결을 위해 ID를 먼저 발급
+            cursor.execute('''
+                SELECT nextval(pg_get_serial_sequence('promotions', 'id')) as id
+                FROM generate_series(1, %s)
+            ''', (len(promotions),))
+            promo_ids = [row['id'] for row in cursor.fetchall()]
+
+            psycopg2.extras.execute_values(cursor, f'''
+                INSERT INTO promotions (id, {', '.join(PROMOTION_FIELDS)}, created_at, updated_at, created_by)
+                VALUES %s
+            ''', [
+                (promo_id, *[promo.get(field) for field in PROMOTION_FIELDS], created_by)
+                for promo_id, promo in zip(promo_ids, promotions)
+            ], template='(' + ', '.join(['%s'] * (len(PROMOTION_FIELDS) + 1))
+                        + ', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, %s)')
+
+            _replace_subscription_types(cursor, {
+                promo_id: promo.get('subscription_types') or []
+                for promo_id, promo in zip(promo_ids, promotions)
+            })
+
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+
+    _promotion_committed()
+    return promo_ids
+
+
+def update_promotions(promotions: list[dict[str, Any]]) -> int:
+    """
+    프로모션 일괄 수정 (UPDATE ... FROM unnest, 한 트랜잭션)
+
+    Args:
+        promotions: 수정할 프로모션 목록 (id + PROMOTION_FIELDS 전체,
+                    subscription_types가 있으면 구독 유형도 교체)
+
+    Returns:
+        int: 수정된 행 수
+    """
+    if not promotions:
+        return 0
+
+    columns = ('id',) + PROMOTION_FIELDS
+    arrays = [[promo.get('id') for promo in promotions]]
+    arrays += [[None if promo.get(field) is None else str(promo.get(field)) for promo in promotions]
+               for field in PROMOTION_FIELDS]
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(f'''
+                UPDATE promotions p
+                SET {', '.join(f'{field} = u.{field}' for field in PROMOTION_FIELDS)},
+                    updated_at = CURRENT_TIMESTAMP
+                FROM unnest(%s::integer[], {', '.join(['%s::text[]'] * len(PROMOTION_FIELDS))})
+                     AS u({', '.join(columns)})
+                WHERE p.id = u.id
+            ''', arrays)
+            updated = cursor.rowcount
+
+            _replace_subscription_types(cursor, {
+                promo['id']: promo['subscription_types']
+                for promo in promotions if 'subscription_types' in promo
+            })
+
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+
+    _promotion_committed()
+    return updated
+
+
+def delete_promotions(promo_ids: list[int]) -> int:
+    """프로모션 삭제 (CASCADE로 구독 유형도 삭제), 삭제된 행 수 반환"""
+    if not promo_ids:
+        return 0
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM promotions WHERE id = ANY(%s)', (list(promo_ids),))
+        deleted = cursor.rowcount
+        conn.commit()
+
+    _promotion_committed()
+    return deleted
 
 # ==================== 개인 예약 관리 ====================
 
@@ -1246,35 +2519,94 @@ def save_user_notification_settings(username: str, settings: dict[str, Any]) ->
             return True
 
 
-def update_last_daily_summary(username: str, date_str: str) -> None:
-    """일일 요약 발송 날짜 업데이트"""
-    with db_lock:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE user_notification_settings
-                SET last_daily_summary_date = %s, updated_at = CURRENT_TIMESTAMP
-                WHERE username = %s
-            ''', (date_str, username))
-            conn.commit()
+def get_due_daily_summaries(date_str: str, current_time: str) -> list[dict[str, Any]]:
+    """
+    일일 요약 발송 대상과 요약 내용을 한 번에 조회
 
+    요약 시간이 지났고 오늘 아직 받지 않은 사용자별로 당일 미완료 예약 개수와
+    시간순 상위 3건을 윈도 함수(ROW_NUMBER/COUNT OVER PARTITION BY user_id)로 계산
 
-def get_users_needing_daily_summary() -> list[dict[str, Any]]:
-    """일일 요약이 필요한 사용자 목록 (오늘 아직 안 보낸 사람)"""
-    from datetime import date
-    today = str(date.today())
+    Args:
+        date_str: 오늘 날짜 'YYYY-MM-DD'
+        current_time: 현재 시각 'HH:MM'
 
+    Returns:
+        list: [{username, today_count, top_reminders: [{id, title, scheduled_time}]}]
+    """
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        # 설정이 있는 사용자 중 오늘 요약 안 보낸 사람
         cursor.execute('''
-            SELECT username, daily_summary_time
-            FROM user_notification_settings
-            WHERE daily_summary_enabled = true
-              AND (last_daily_summary_date IS NULL OR last_daily_summary_date < %s)
-        ''', (today,))
-        rows = cursor.fetchall()
-        return [dict(row) for row in rows]
+            WITH due AS (
+                SELECT username
+                FROM user_notification_settings
+                WHERE daily_summary_enabled = true
+                  AND (last_daily_summary_date IS NULL OR last_daily_summary_date < %(today)s)
+                  AND COALESCE(daily_summary_time, '09:00') <= %(now)s
+            ),
+            ranked AS (
+                SELECT r.user_id, r.id, r.title, r.scheduled_time,
+                       ROW_NUMBER() OVER (PARTITION BY r.user_id ORDER BY r.scheduled_time, r.id) as rn,
+                       COUNT(*) OVER (PARTITION BY r.user_id) as total
+                FROM reminders r
+                INNER JOIN due d ON d.username = r.user_id
+                WHERE r.scheduled_date = %(today)s AND r.is_completed = 0
+            )
+            SELECT d.username,
+                   COALESCE(MAX(rk.total), 0) as today_count,
+                   COALESCE(json_agg(json_build_object(
+                       'id', rk.id, 'title', rk.title, 'scheduled_time', rk.scheduled_time
+                   ) ORDER BY rk.rn) FILTER (WHERE rk.id IS NOT NULL), '[]') as top_reminders
+            FROM due d
+            LEFT JOIN ranked rk ON rk.user_id = d.username AND rk.rn <= 3
+            GROUP BY d.username
+        ''', {'today': date_str, 'now': current_time})
+        return [dict(row) for row in cursor.fetchall()]
+
+
+def mark_daily_summaries_sent(usernames: list[str], date_str: str,
+                              pushes: Optional[list[tuple[str, str]]] = None) -> tuple[int, int]:
+    """
+    일일 요약 발송 날짜 일괄 업데이트 + 푸시 발송 대기열 추가 (한 트랜잭션)
+
+    완료 처리된 사용자(UPDATE ... RETURNING)에게만 푸시를 넣으므로
+    한쪽만 반영되어 요약이 중복 발송되거나 누락되지 않음
+
+    Args:
+        usernames: 발송 완료 처리할 사용자 (오늘 이미 처리된 사용자는 제외됨)
+        date_str: 발송 날짜 'YYYY-MM-DD'
+        pushes: push_helper.outbox_rows() 결과 [(username, payload JSON)]
+                - 이 사용자들은 푸시 구독이 있을 때만 완료 처리 (구독이 없으면 다음 체크에서 다시 시도)
+
+    Returns:
+        tuple: (완료 처리된 사용자 수, 대기열에 추가된 건수)
+    """
+    import push_helper  # push_helper가 database를 import하므로 호출 시점에 import
+
+    if not usernames:
+        return 0, 0
+    pushes = pushes or []
+    with db_lock:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE user_notification_settings s
+                SET last_daily_summary_date = %(today)s, updated_at = CURRENT_TIMESTAMP
+                WHERE s.username = ANY(%(usernames)s)
+                  AND (s.last_daily_summary_date IS NULL OR s.last_daily_summary_date < %(today)s)
+                  AND (s.username <> ALL(%(push_users)s::text[])
+                       OR EXISTS (SELECT 1 FROM push_subscriptions ps WHERE ps.username = s.username))
+                RETURNING s.username
+            ''', {
+                'push_users': list({username for username, _ in pushes}),
+                'today': date_str,
+                'usernames': list(usernames)
+            })
+            marked = {row['username'] for row in cursor.fetchall()}
+            queued = push_helper.enqueue_push_rows(
+                cursor, [(username, payload) for username, payload in pushes if username in marked]
+            )
+            conn.commit()
+            return len(marked), queued
 
 
 def get_all_reminder_users() -> list[str]:
@@ -1319,87 +2651,143 @@ def get_today_reminders_list(username: str) -> list[dict[str, Any]]:
         return [dict(row) for row in rows]
 
 
-def update_reminder_notification(reminder_id: int) -> None:
-    """예약 알림 발송 기록 업데이트"""
-    with db_lock:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE reminders
-                SET last_notified_at = CURRENT_TIMESTAMP,
-                    notification_count = notification_count + 1,
-                    notified_30min = 1
-                WHERE id = %s
-            ''', (reminder_id,))
-            conn.commit()
+def _open_reminder_scope(username: Optional[str]) -> tuple[str, list[Any]]:
+    """미완료 예약 조회 범위 조건 (사용자 지정 시 본인, 없으면 등록된 전체 사용자, 내부 함수)"""
+    if username:
+        return ' AND r.user_id = %s', [username]
+    return ' AND EXISTS (SELECT 1 FROM users u WHERE u.username = r.user_id)', []
 
 
-def get_pending_reminders_for_notification() -> list[dict[str, Any]]:
-    """알림이 필요한 모든 예약 목록 (사용자별 설정 적용)"""
-    from datetime import datetime, timedelta
+def get_reminder_banner_counts(username: Optional[str] = None) -> dict[str, int]:
+    """
+    배너용 미완료 예약 개수 (당일, 지난 예약) - 단일 집계 쿼리
 
-    now = datetime.now()
-    today = now.strftime('%Y-%m-%d')
-    current_time = now.strftime('%H:%M')
+    Args:
+        username: 사용자 (None이면 전체 사용자)
+
+    Returns:
+        dict: {today_count, overdue_count}
+    """
+    from datetime import date
+    today = str(date.today())
+    scope, params = _open_reminder_scope(username)
 
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        # 당일 미완료 예약 + 사용자 설정 조인
-        cursor.execute('''
-            SELECT r.*,
+        cursor.execute(f'''
+            SELECT COUNT(*) FILTER (WHERE r.scheduled_date = %s) as today_count,
+                   COUNT(*) FILTER (WHERE r.scheduled_date < %s) as overdue_count
+            FROM reminders r
+            WHERE r.is_completed = 0
+              AND r.scheduled_date <= %s
+              {scope}
+        ''', [today, today, today] + params)
+        row = cursor.fetchone()
+        return {'today_count': row['today_count'], 'overdue_count': row['overdue_count']}
+
+
+def get_open_reminders_for_today(username: Optional[str] = None) -> list[dict[str, Any]]:
+    """
+    당일 미완료 예약 목록 (시간순)
+
+    Args:
+        username: 사용자 (None이면 전체 사용자)
+    """
+    from datetime import date
+    scope, params = _open_reminder_scope(username)
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT r.* FROM reminders r
+            WHERE r.is_completed = 0
+              AND r.scheduled_date = %s
+              {scope}
+            ORDER BY r.scheduled_time ASC, r.id ASC
+        ''', [str(date.today())] + params)
+
+        result = []
+        for row in cursor.fetchall():
+            r = dict(row)
+            if r.get('created_at'):
+                r['created_at'] = str(r['created_at'])
+            if r.get('updated_at'):
+                r['updated_at'] = str(r['updated_at'])
+            result.append(r)
+        return result
+
+
+def get_reminder_schedules(reminder_ids: Optional[list[int]] = None,
+                           username: Optional[str] = None,
+                           updated_since: Optional[datetime] = None) -> list[dict[str, Any]]:
+    """
+    알림 스케줄러용 미완료 예약 + 사용자 알림 설정 조회 (오늘 이후 예약만)
+
+    Args:
+        reminder_ids: 특정 예약만 조회
+        username: 특정 사용자의 예약만 조회
+        updated_since: 이 시각 이후 예약 또는 사용자 알림 설정이 바뀐 예약만 조회
+                       (완료된 예약도 포함해서 스케줄러가 일정에서 뺄 수 있게 함)
+
+    Returns:
+        list: 예약 행 (reminder_minutes, repeat_enabled, repeat_interval, repeat_until_minutes 포함)
+    """
+    from datetime import date
+
+    conditions = ''
+    params: list[Any] = [str(date.today())]
+    if reminder_ids is not None:
+        conditions += ' AND r.id = ANY(%s)'
+        params.append(list(reminder_ids))
+    if username is not None:
+        conditions += ' AND r.user_id = %s'
+        params.append(username)
+    if updated_since is not None:
+        conditions += ' AND (r.updated_at > %s OR s.updated_at > %s)'
+        params.extend([updated_since, updated_since])
+    else:
+        conditions += ' AND r.is_completed = 0'
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT r.id, r.user_id, r.title, r.scheduled_date, r.scheduled_time,
+                   r.is_completed, r.notification_count, r.last_notified_at,
                    COALESCE(s.reminder_minutes, 30) as reminder_minutes,
                    COALESCE(s.repeat_enabled, false) as repeat_enabled,
                    COALESCE(s.repeat_interval, 5) as repeat_interval,
                    COALESCE(s.repeat_until_minutes, 0) as repeat_until_minutes
             FROM reminders r
             LEFT JOIN user_notification_settings s ON r.user_id = s.username
-            WHERE r.scheduled_date = %s
-              AND r.is_completed = 0
-              AND r.scheduled_time > %s
-            ORDER BY r.scheduled_time ASC
-        ''', (today, current_time))
-        rows = cursor.fetchall()
+            WHERE r.scheduled_date >= %s
+              {conditions}
+        ''', params)
+        return [dict(row) for row in cursor.fetchall()]
 
-        result = []
-        for row in rows:
-            r = dict(row)
-            # 예약 시간 파싱
-            scheduled_time = datetime.strptime(f"{today} {r['scheduled_time']}", '%Y-%m-%d %H:%M')
-            minutes_until = (scheduled_time - now).total_seconds() / 60
-
-            # 첫 알림 체크 (설정된 분 전)
-            reminder_minutes = r.get('reminder_minutes', 30)
-            if minutes_until <= reminder_minutes and r.get('notification_count', 0) == 0:
-                r['should_notify'] = True
-                r['notify_reason'] = 'first'
-                result.append(r)
-                continue
-
-            # 반복 알림 체크
-            if r.get('repeat_enabled') and r.get('notification_count', 0) > 0:
-                repeat_interval = r.get('repeat_interval', 5)
-                repeat_until = r.get('repeat_until_minutes', 0)
-
-                # 마지막 알림 이후 repeat_interval분 경과했는지
-                last_notified = r.get('last_notified_at')
-                if last_notified:
-                    if isinstance(last_notified, str):
-                        # 여러 날짜 포맷 시도
-                        for fmt in ['%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M']:
-                            try:
-                                last_notified = datetime.strptime(last_notified, fmt)
-                                break
-                            except ValueError:
-                                continue
-                    minutes_since_last = (now - last_notified).total_seconds() / 60
-
-                    # repeat_until 체크 (예약 시간까지 또는 설정된 분까지)
-                    if minutes_until > repeat_until and minutes_since_last >= repeat_interval:
-                        r['should_notify'] = True
-                        r['notify_reason'] = 'repeat'
-                        result.append(r)
 
-        return result
+def claim_reminder_notification(reminder_id: int, notification_count: int) -> Optional[dict[str, Any]]:
+    """
+    예약 알림 발송 점유 (발송 기록 업데이트)
+
+    notification_count가 스케줄러가 본 값과 같을 때만 갱신하므로
+    여러 워커가 같은 알림을 동시에 처리해도 한 곳만 성공
+
+    Returns:
+        dict: 갱신된 {notification_count, last_notified_at} (다른 곳에서 처리했거나 완료된 예약이면 None)
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE reminders
+            SET last_notified_at = CURRENT_TIMESTAMP,
+                notification_count = notification_count + 1,
+                notified_30min = 1
+            WHERE id = %s AND notification_count = %s AND is_completed = 0
+            RETURNING notification_count, last_notified_at
+        ''', (reminder_id, notification_count))
+        row = cursor.fetchone()
+        conn.commit()
+        return dict(row) if row else None
 
 
 # ==================== 유틸리티 ====================
@@ -1455,55 +2843,34 @@ def load_holidays(year: Optional[int] = None) -> list[dict[str, Any]]:
 # ==================== 채팅방 설정 관리 ====================
 
 def get_chat_settings(chat_id: int | str, username: str) -> Optional[dict[str, Any]]:
-    """채팅방 설정 및 권한 정보 조회"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-
-        # 채팅방 기본 정보
-        cursor.execute('''
-            SELECT c.id, c.title, c.creator, c.chat_type, c.created_at
-            FROM chats c
-            WHERE c.id = %s
-        ''', (int(chat_id),))
-        chat_row = cursor.fetchone()
-        if not chat_row:
-            return None
+    """채팅방 설정 및 권한 정보 조회 (메타데이터 캐시 사용)"""
+    meta = get_chat_meta(chat_id)
+    if not meta:
+        return None
 
-        # 현재 사용자의 역할
-        cursor.execute('''
-            SELECT role, muted
-            FROM chat_participants
-            WHERE chat_id = %s AND username = %s
-        ''', (int(chat_id), username))
-        user_row = cursor.fetchone()
-        if not user_row:
-            return None  # 참여자가 아님
+    # 현재 사용자의 역할
+    me = next((p for p in meta['participants'] if p['username'] == username), None)
+    if not me:
+        return None  # 참여자가 아님
 
-        # 모든 참여자 목록 (역할 포함)
-        cursor.execute('''
-            SELECT username, role, muted
-            FROM chat_participants
-            WHERE chat_id = %s
-            ORDER BY
-                CASE role
-                    WHEN 'owner' THEN 1
-                    WHEN 'admin' THEN 2
-                    ELSE 3
-                END, username
-        ''', (int(chat_id),))
-        participants = [dict(row) for row in cursor.fetchall()]
+    # 모든 참여자 목록 (방장 → 부방장 → 멤버, 이름순)
+    role_order = {'owner': 1, 'admin': 2}
+    participants = sorted(
+        (dict(p) for p in meta['participants']),
+        key=lambda p: (role_order.get(p['role'], 3), p['username'])
+    )
 
-        return {
-            'id': chat_row['id'],
-            'title': chat_row['title'],
-            'creator': chat_row['creator'],
-            'chat_type': chat_row['chat_type'] or 'direct',
-            'created_at': str(chat_row['created_at']),
-            'my_role': user_row['role'] or 'member',
-            'muted': user_row['muted'] or False,
-            'participants': participants,
-            'participant_count': len(participants)
-        }
+    return {
+        'id': meta['id'],
+        'title': meta['title'],
+        'creator': meta['creator'],
+        'chat_type': meta['chat_type'],
+        'created_at': meta['created_at'],
+        'my_role': me['role'],
+        'muted': me['muted'],
+        'participants': participants,
+        'participant_count': len(participants)
+    }
 
 
 def update_chat_title(chat_id: int | str, username: str, new_title: str) -> tuple[bool, str]:
@@ -1535,6 +2902,7 @@ def update_chat_title(chat_id: int | str, username: str, new_title: str) -> tupl
                 UPDATE chats SET title = %s WHERE id = %s
             ''', (new_title.strip(), int(chat_id)))
             conn.commit()
+            invalidate_chat_meta(chat_id)
 
             logger.info(f"Chat {chat_id} title changed to '{new_title}' by {username}")
             return True, '채팅방 제목이 변경되었습니다.'
@@ -1556,6 +2924,7 @@ def toggle_chat_mute(chat_id: int | str, username: str) -> tuple[bool, bool]:
             conn.commit()
 
             if row:
+                invalidate_chat_meta(chat_id)
                 return True, row['muted']
             return False, False
 
@@ -1602,7 +2971,15 @@ def add_chat_participant(chat_id: int | str, username: str, target_username: str
                 INSERT INTO chat_participants (chat_id, username, role, muted)
                 VALUES (%s, %s, 'member', false)
             ''', (int(chat_id), target_username))
+
+            # 재참여 시 이전 미읽음 카운터 초기화
+            cursor.execute('''
+                INSERT INTO chat_unread_counters (chat_id, username, unread)
+                VALUES (%s, %s, 0)
+                ON CONFLICT (chat_id, username) DO UPDATE SET unread = 0
+            ''', (int(chat_id), target_username))
             conn.commit()
+            invalidate_chat_meta(chat_id)
 
             logger.info(f"User {target_username} added to chat {chat_id} by {username}")
             return True, f'{target_username}님이 채팅방에 추가되었습니다.'
@@ -1656,6 +3033,7 @@ def remove_chat_participant(chat_id: int | str, username: str, target_username:
                 WHERE chat_id = %s AND username = %s
             ''', (int(chat_id), target_username))
             conn.commit()
+            invalidate_chat_meta(chat_id)
 
             logger.info(f"User {target_username} removed from chat {chat_id} by {username}")
             return True, f'{target_username}님이 채팅방에서 내보내졌습니다.'
@@ -1720,10 +3098,12 @@ def leave_chat(chat_id: int | str, username: str) -> tuple[bool, str, bool]:
             if remaining_count == 0:
                 # CASCADE로 messages, message_reads도 자동 삭제됨
                 cursor.execute('DELETE FROM chats WHERE id = %s', (int(chat_id),))
+                cursor.execute('DELETE FROM chat_unread_counters WHERE chat_id = %s', (int(chat_id),))
                 logger.info(f"Chat {chat_id} and all messages deleted (no participants)")
                 deleted = True
 
             conn.commit()
+            invalidate_chat_meta(chat_id)
 
             logger.info(f"User {username} left chat {chat_id}")
             return True, '채팅방을 나갔습니다.', deleted
@@ -1773,6 +3153,7 @@ def set_chat_admin(chat_id: int | str, username: str, target_username: str, is_a
                 WHERE chat_id = %s AND username = %s
             ''', (new_role, int(chat_id), target_username))
             conn.commit()
+            invalidate_chat_meta(chat_id)
 
             action = '부방장으로 지정' if is_admin else '일반 멤버로 변경'
             logger.info(f"User {target_username} {action} in chat {chat_id} by {username}")
@@ -0,0 +1,206 @@
+"""
+프로모션 카탈로그 모듈
+프로모션 전체를 프로세스 메모리에 불변 스냅샷으로 보관하고
+필터 조합은 facet별 역인덱스(값 -> 프로모션 ID 집합)의 교집합으로 응답
+
+- 모든 프로모션 쓰기는 커밋 후 promotion_version_seq 버전을 올리고 on_promotion_modified()를 호출
+- on_promotion_modified()가 이 프로세스와 다른 워커(Redis pub/sub)의 스냅샷을 stale로 표시
+- stale이거나 마지막 확인 후 PROMOTION_VERSION_CHECK_SECONDS가 지나면 DB 버전을 확인하고
+  바뀌었으면 새 스냅샷을 만들어 참조를 통째로 교체 (읽는 쪽은 잠금 없음)
+- 워커에 아직 스냅샷이 없으면 get_snapshot(wait=False)가 백그라운드로 빌드를 시작하고 None을
+  반환하므로, 호출하는 쪽은 그동안 SQL 경로(database.query_promotions)로 응답
+"""
+
+import logging
+import threading
+import time
+from types import MappingProxyType
+
+import database
+from cache_manager import register_invalidation_handler
+
+logger = logging.getLogger('crm')
+
+PROMOTION_VERSION_CHECK_SECONDS = 30  # 무효화 메시지 유실 대비 DB 버전 확인 주기
+
+# 역인덱스를 만드는 facet (요청 파라미터 이름 -> 프로모션 필드)
+FACET_FIELDS = {
+    'category': 'category',
+    'product_name': 'product_name',
+    'channel': 'channel',
+    'promotion_name': 'promotion_name',
+    'subscription_type': 'subscription_types',
+}
+
+# 통합 검색 대상 필드
+SEARCH_FIELDS = ('product_name', 'channel', 'promotion_name', 'promotion_code', 'content')
+
+
+def build_filters(promotions):
+    """필터 옵션 (대분류/상품/채널/프로모션명 고유 값 + 대분류별 상품 매핑)"""
+    values = {'categories': set(), 'products': set(), 'channels': set(), 'promotion_names': set()}
+    category_products = {}
+    for promo in promotions:
+        for key, field in (('categories', 'category'), ('products', 'product_name'),
+                           ('channels', 'channel'), ('promotion_names', 'promotion_name')):
+            if promo.get(field):
+                values[key].add(promo[field])
+        if promo.get('category') and promo.get('product_name'):
+            category_products.setdefault(promo['category'], set()).add(promo['product_name'])
+    filters = {key: sorted(items) for key, items in values.items()}
+    filters['category_products'] = {cat: sorted(products) for cat, products in category_products.items()}
+    return filters
+
+
+class PromotionSnapshot:
+    """특정 버전의 프로모션 카탈로그 (생성 후 변경하지 않음)"""
+
+    def __init__(self, version, promotions):
+        self.version = version
+        self.promotions = tuple(promotions)  # ID 순
+        self.by_id = MappingProxyType({p['id']: p for p in self.promotions})
+
+        # facet별 역인덱스 {facet: {값: frozenset(ID)}}
+        indexes = {facet: {} for facet in FACET_FIELDS}
+        for promo in self.promotions:
+            for facet, field in FACET_FIELDS.items():
+                values = promo.get(field)
+                if not isinstance(values, (list, tuple)):
+                    values = [values]
+                for value in values:
+                    if value:
+                        indexes[facet].setdefault(value, set()).add(promo['id'])
+        self.indexes = MappingProxyType({
+            facet: MappingProxyType({value: frozenset(ids) for value, ids in index.items()})
+            for facet, index in indexes.items()
+        })
+
+        # 검색용 소문자 텍스트
+        self.search_text = MappingProxyType({
+            p['id']: '\n'.join(str(p.get(field) or '') for field in SEARCH_FIELDS).lower()
+            for p in self.promotions
+        })
+
+        self.filters = build_filters(self.promotions)
+
+    def query(self, filters):
+        """
+        필터 조건에 맞는 프로모션 목록 (ID 순)
+
+        Args:
+            filters: {category, product_name, channel, promotion_name, subscription_type,
+                      search, active_on: 'YYYY-MM-DD', not_ended_on: 'YYYY-MM-DD'}
+        """
+        ids = None
+        for facet in FACET_FIELDS:
+            value = filters.get(facet)
+            if value:
+                matched = self.indexes[facet].get(value, frozenset())
+                ids = matched if ids is None else ids & matched
+                if not ids:
+                    return []
+
+        candidates = self.promotions if ids is None else [self.by_id[i] for i in sorted(ids)]
+
+        search = (filters.get('search') or '').lower()
+        # 진행 중 = 시작했고 종료되지 않음, 종료되지 않음 = 시작 전 포함
+        active_on = filters.get('active_on')
+        ended_before = max(filter(None, (active_on, filters.get('not_ended_on'))), default=None)
+
+        if not (search or ended_before):
+            return list(candidates)
+
+        result = []
+        for promo in candidates:
+            if search and search not in self.search_text[promo['id']]:
+                continue
+            # 날짜는 'YYYY-MM-DD' 문자열, 종료일 '무기한'은 종료되지 않은 것으로 취급
+            end_date = promo.get('end_date') or ''
+            if ended_before and end_date != '무기한' and end_date < ended_before:
+                continue
+            if active_on and (promo.get('start_date') or '') > active_on:
+                continue
+            result.append(promo)
+        return result
+
+    def facet_counts(self, promotions):
+        """프로모션 목록의 대분류/상품/채널별 개수"""
+        facets = {'categories': {}, 'products': {}, 'channels': {}}
+        for promo in promotions:
+            for key, field in (('categories', 'category'), ('products', 'product_name'), ('channels', 'channel')):
+                value = promo.get(field)
+                facets[key][value] = facets[key].get(value, 0) + 1
+        return facets
+
+
+_snapshot = None
+_stale = True
+_last_checked = 0.0
+_build_lock = threading.Lock()
+
+
+def mark_stale(key=None):
+    """프로모션 변경 알림: 다음 조회 시 DB 버전 확인"""
+    global _stale
+    _stale = True
+
+
+# on_promotion_modified() 및 다른 워커의 무효화 메시지 처리
+register_invalidation_handler('promotions', mark_stale)
+
+
+def get_snapshot(wait=True):
+    """
+    현재 프로모션 스냅샷 (변경이 감지되면 새로 만들어 교체)
+
+    Args:
+        wait: 스냅샷이 아직 없을 때 빌드를 기다릴지 여부
+              (False면 백그라운드로 빌드를 시작하고 None 반환)
+    """
+    global _snapshot, _stale, _last_checked
+
+    snapshot = _snapshot
+    if snapshot is not None and not _stale and time.time() - _last_checked < PROMOTION_VERSION_CHECK_SECONDS:
+        return snapshot
+
+    if snapshot is None and not wait:
+        if not _build_lock.locked():
+            threading.Thread(target=_build_in_background, daemon=True).start()
+        return None
+
+    # 다른 요청이 갱신 중이면 기존 스냅샷으로 응답
+    if not _build_lock.acquire(blocking=snapshot is None):
+        return snapshot
+
+    try:
+        snapshot = _snapshot
+        if snapshot is not None and not _stale and time.time() - _last_checked < PROMOTION_VERSION_CHECK_SECONDS:
+            return snapshot
+
+        _stale = False
+        _last_checked = time.time()
+        version = database.get_promotion_version()
+
+        if snapshot is None or snapshot.version != version:
+            started = time.time()
+            snapshot = PromotionSnapshot(version, database.load_promotions())
+            _snapshot = snapshot
+            logger.info(f"Promotion catalog v{version} built: {len(snapshot.promotions)} promotions "
+                        f"({(time.time() - started) * 1000:.0f}ms)")
+        return snapshot
+    except Exception:
+        _stale = True
+        if snapshot is None:
+            raise
+        logger.exception('Promotion catalog refresh failed, serving previous snapshot')
+        return snapshot
+    finally:
+        _build_lock.release()
+
+
+def _build_in_background():
+    """첫 스냅샷 빌드 (get_snapshot(wait=False)에서 시작, 실패하면 다음 요청에서 다시 시도)"""
+    try:
+        get_snapshot()
+    except Exception:
+        logger.exception('Promotion catalog build failed')
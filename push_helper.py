@@ -5,12 +5,42 @@
 
 import os
 import json
+import math
+import random
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+import psycopg2.extras
 from pywebpush import webpush, WebPushException
 from database import get_db_connection
 
 logger = logging.getLogger('crm')
 
+# 배달 워커 설정
+PUSH_MAX_CONCURRENCY = int(os.getenv('PUSH_MAX_CONCURRENCY', '16'))  # 동시 발송 수
+PUSH_BATCH_SIZE = 200           # 한 번에 가져올 발송 건수
+PUSH_MAX_ATTEMPTS = 5           # 최대 시도 횟수 (초과 시 failed)
+PUSH_RETRY_BASE_SECONDS = 15    # 재시도 기본 간격 (15초, 30초, 60초, ...)
+PUSH_POLL_SECONDS = 2           # 대기열이 비었을 때 확인 주기
+PUSH_REQUEST_TIMEOUT = 10       # 푸시 서비스 요청 타임아웃 (연결/응답 각각)
+PUSH_LEASE_MARGIN_SECONDS = 30  # 점유 시간 여유 (결과 반영 등)
+# 워커 점유 시간: 한 배치가 모두 타임아웃돼도 끝나기 전에 만료되지 않도록 배치 크기에서 계산
+# (동시 발송 수만큼씩 돌아가며, 요청 하나는 연결 + 응답 타임아웃까지 걸릴 수 있음)
+# 프로세스가 죽으면 만료 후 다른 워커가 가져감
+PUSH_LEASE_SECONDS = (math.ceil(PUSH_BATCH_SIZE / PUSH_MAX_CONCURRENCY) * PUSH_REQUEST_TIMEOUT * 2
+                      + PUSH_LEASE_MARGIN_SECONDS)
+
+# 푸시 서비스 호스트별 keep-alive 세션 (FCM, Mozilla, Apple 등)
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# 같은 프로세스에서 대기열에 추가되면 배달 워커를 즉시 깨움
+_outbox_event = threading.Event()
+
 
 def get_vapid_keys():
     """VAPID 키 경로와 claims를 반환합니다."""
@@ -24,6 +54,47 @@ def get_vapid_keys():
     }
 
 
+def _get_session(endpoint):
+    """푸시 서비스 호스트별 keep-alive 세션 반환 (연결 재사용)"""
+    host = urlparse(endpoint).netloc
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=PUSH_MAX_CONCURRENCY)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _sessions[host] = session
+        return session
+
+
+def _build_payload(title, body, data=None):
+    """푸시 메시지 페이로드 생성"""
+    return {
+        'title': title,
+        'body': body,
+        'icon': '/static/icon-192.png',
+        'badge': '/static/icon-192.png',
+        'data': data or {}
+    }
+
+
+def _webpush(subscription, payload_json):
+    """구독 하나에 푸시 발송 (호스트별 세션 재사용)"""
+    vapid_keys = get_vapid_keys()
+    webpush(
+        subscription_info={
+            'endpoint': subscription['endpoint'],
+            'keys': subscription['keys']
+        },
+        data=payload_json,
+        vapid_private_key=vapid_keys['private_key_path'],
+        vapid_claims=vapid_keys['claims'],
+        timeout=PUSH_REQUEST_TIMEOUT,
+        requests_session=_get_session(subscription['endpoint'])
+    )
+
+
 def get_user_subscriptions(username):
     """특정 사용자의 모든 푸시 구독 정보를 가져옵니다."""
     with get_db_connection() as conn:
@@ -70,66 +141,68 @@ def send_push_notification(username, title, body, data=None):
             'errors': ['No subscriptions found for user']
         }
 
-    vapid_keys = get_vapid_keys()
+    return send_push_to_subscriptions(subscriptions, title, body, data)
 
-    # 푸시 메시지 페이로드
-    payload = {
-        'title': title,
-        'body': body,
-        'icon': '/static/icon-192.png',
-        'badge': '/static/icon-192.png',
-        'data': data or {}
-    }
+
+def send_push_to_subscriptions(subscriptions, title, body, data=None):
+    """
+    이미 조회한 구독 목록으로 푸시 알림을 발송합니다. (구독 재조회 없음)
+
+    Args:
+        subscriptions (list): 구독 정보 목록 [{'id', 'endpoint', 'keys': {'p256dh', 'auth'}}]
+        title (str): 알림 제목
+        body (str): 알림 본문
+        data (dict, optional): 추가 데이터
+
+    Returns:
+        dict: 발송 결과 {'success': int, 'failed': int, 'errors': list}
+    """
+    payload_json = json.dumps(_build_payload(title, body, data))
 
     results = {
         'success': 0,
         'failed': 0,
         'errors': []
     }
-
-    with get_db_connection() as conn:
-        cur = conn.cursor()
-
-        for subscription in subscriptions:
-            try:
-                # 푸시 알림 발송
-                webpush(
-                    subscription_info={
-                        'endpoint': subscription['endpoint'],
-                        'keys': subscription['keys']
-                    },
-                    data=json.dumps(payload),
-                    vapid_private_key=vapid_keys['private_key_path'],
-                    vapid_claims=vapid_keys['claims']
+    expired_ids = []
+
+    for subscription in subscriptions:
+        try:
+            # 푸시 알림 발송
+            _webpush(subscription, payload_json)
+            results['success'] += 1
+
+        except WebPushException as e:
+            results['failed'] += 1
+            error_msg = f"Subscription {subscription['id']}: {str(e)}"
+            results['errors'].append(error_msg)
+
+            # 410 Gone 또는 404 Not Found 에러는 구독이 만료된 것이므로 DB에서 삭제
+            if e.response and e.response.status_code in [410, 404]:
+                expired_ids.append(subscription['id'])
+
+        except Exception as e:
+            results['failed'] += 1
+            results['errors'].append(f"Subscription {subscription['id']}: {str(e)}")
+
+    if expired_ids:
+        try:
+            with get_db_connection() as conn:
+                cur = conn.cursor()
+                cur.execute(
+                    "DELETE FROM push_subscriptions WHERE id = ANY(%s)",
+                    (expired_ids,)
                 )
-                results['success'] += 1
-
-            except WebPushException as e:
-                results['failed'] += 1
-                error_msg = f"Subscription {subscription['id']}: {str(e)}"
-                results['errors'].append(error_msg)
-
-                # 410 Gone 또는 404 Not Found 에러는 구독이 만료된 것이므로 DB에서 삭제
-                if e.response and e.response.status_code in [410, 404]:
-                    try:
-                        cur.execute(
-                            "DELETE FROM push_subscriptions WHERE id = %s",
-                            (subscription['id'],)
-                        )
-                        conn.commit()
-                    except Exception as del_error:
-                        results['errors'].append(f"Failed to delete subscription {subscription['id']}: {str(del_error)}")
-
-            except Exception as e:
-                results['failed'] += 1
-                results['errors'].append(f"Subscription {subscription['id']}: {str(e)}")
+                conn.commit()
+        except Exception as del_error:
+            results['errors'].append(f"Failed to delete subscriptions {expired_ids}: {str(del_error)}")
 
     return results
 
 
 def send_push_to_multiple_users(usernames, title, body, data=None):
     """
-    여러 사용자에게 푸시 알림을 발송합니다.
+    여러 사용자에게 푸시 알림을 발송합니다. (발송 대기열에 일괄 추가)
 
     Args:
         usernames (list): 알림을 받을 사용자 이름 목록
@@ -138,21 +211,241 @@ def send_push_to_multiple_users(usernames, title, body, data=None):
         data (dict, optional): 추가 데이터
 
     Returns:
-        dict: 전체 발송 결과
+        dict: {'queued': 대기열에 추가된 발송 건수 (구독 단위)}
     """
-    total_results = {
-        'success': 0,
-        'failed': 0,
-        'errors': []
+    queued = enqueue_push_batch([(username, title, body, data) for username in usernames])
+    return {'queued': queued}
+
+
+# ==================== 발송 대기열 (push_outbox) ====================
+
+def outbox_rows(jobs):
+    """
+    발송 대기열 행 값 생성 (다른 쓰기와 한 트랜잭션으로 대기열에 넣을 때 enqueue_push_rows()에 전달)
+
+    Args:
+        jobs (list): [(username, title, body, data), ...]
+
+    Returns:
+        list: [(username, payload JSON), ...]
+    """
+    return [
+        (username, json.dumps(_build_payload(title, body, data)))
+        for username, title, body, data in jobs
+    ]
+
+
+def wake_delivery_worker():
+    """대기열에 직접 추가한 뒤 이 프로세스의 배달 워커를 즉시 깨움"""
+    _outbox_event.set()
+
+
+def enqueue_push_rows(cur, rows):
+    """
+    대기열 행을 호출한 쪽 트랜잭션 안에서 push_outbox에 추가 (커밋/워커 깨우기는 호출한 쪽에서)
+
+    Args:
+        cur: 쓰기 트랜잭션의 커서
+        rows (list): outbox_rows() 결과 [(username, payload JSON), ...]
+
+    Returns:
+        int: 대기열에 추가된 건수 (구독이 없는 사용자는 제외)
+    """
+    if not rows:
+        return 0
+    # 사용자별 모든 구독으로 펼쳐서 삽입 (rowcount는 마지막 페이지만 반영하므로 RETURNING으로 집계)
+    inserted = psycopg2.extras.execute_values(cur, """
+        INSERT INTO push_outbox (subscription_id, username, payload)
+        SELECT ps.id, ps.username, v.payload::jsonb
+        FROM (VALUES %s) AS v(username, payload)
+        INNER JOIN push_subscriptions ps ON ps.username = v.username
+        RETURNING push_outbox.id
+    """, rows, page_size=500, fetch=True)
+    return len(inserted)
+
+
+def enqueue_push_batch(jobs):
+    """
+    푸시 알림을 발송 대기열에 일괄 추가합니다. (INSERT 1회)
+
+    Args:
+        jobs (list): [(username, title, body, data), ...]
+
+    Returns:
+        int: 대기열에 추가된 건수 (구독이 없는 사용자는 제외)
+    """
+    if not jobs:
+        return 0
+
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        queued = enqueue_push_rows(cur, outbox_rows(jobs))
+        conn.commit()
+
+    if queued > 0:
+        _outbox_event.set()
+    return queued
+
+
+def enqueue_push(username, title, body, data=None):
+    """
+    사용자 한 명에게 보낼 푸시 알림을 발송 대기열에 추가합니다.
+
+    Returns:
+        int: 대기열에 추가된 건수 (구독 수)
+    """
+    return enqueue_push_batch([(username, title, body, data)])
+
+
+def _claim_due_pushes(limit):
+    """발송할 대기열 항목 점유 (여러 프로세스가 동시에 처리해도 중복 발송 없음)"""
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE push_outbox o
+            SET locked_until = CURRENT_TIMESTAMP + %s * INTERVAL '1 second',
+                attempts = o.attempts + 1
+            FROM push_subscriptions ps
+            WHERE o.id IN (
+                SELECT id FROM push_outbox
+                WHERE status = 'pending'
+                AND next_attempt_at <= CURRENT_TIMESTAMP
+                AND (locked_until IS NULL OR locked_until < CURRENT_TIMESTAMP)
+                ORDER BY next_attempt_at
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            AND ps.id = o.subscription_id
+            RETURNING o.id, o.subscription_id, o.attempts, o.payload,
+                      ps.endpoint, ps.p256dh, ps.auth
+        """, (PUSH_LEASE_SECONDS, limit))
+        rows = cur.fetchall()
+        conn.commit()
+        return rows
+
+
+def _deliver(row):
+    """
+    대기열 항목 하나 발송
+
+    Returns:
+        tuple: (결과 'sent' | 'dead' | 'retry' | 'failed', 오류 메시지)
+    """
+    subscription = {
+        'endpoint': row['endpoint'],
+        'keys': {'p256dh': row['p256dh'], 'auth': row['auth']}
     }
+    try:
+        _webpush(subscription, json.dumps(row['payload']))
+        return 'sent', None
+    except WebPushException as e:
+        status_code = e.response.status_code if e.response is not None else None
+        # 410 Gone 또는 404 Not Found: 만료된 구독
+        if status_code in (404, 410):
+            return 'dead', str(e)
+        # 429/5xx/응답 없음은 일시 오류로 보고 재시도, 나머지 4xx는 재시도해도 실패
+        if status_code is None or status_code == 429 or status_code >= 500:
+            return 'retry', str(e)
+        return 'failed', str(e)
+    except Exception as e:
+        # 타임아웃, 연결 오류 등
+        return 'retry', str(e)
+
+
+def _finalize_deliveries(rows, outcomes):
+    """발송 결과를 대기열에 일괄 반영"""
+    sent_ids = []
+    dead_subscription_ids = set()
+    retry_rows = []
+    failed_rows = []
+
+    for row, (outcome, error) in zip(rows, outcomes):
+        if outcome == 'sent':
+            sent_ids.append(row['id'])
+        elif outcome == 'dead':
+            dead_subscription_ids.add(row['subscription_id'])
+        elif outcome == 'retry' and row['attempts'] < PUSH_MAX_ATTEMPTS:
+            # 지수 백오프 + 지터 (같은 시각에 재시도가 몰리지 않도록)
+            delay = PUSH_RETRY_BASE_SECONDS * (2 ** (row['attempts'] - 1))
+            delay += random.uniform(0, PUSH_RETRY_BASE_SECONDS)
+            retry_rows.append((row['id'], delay, (error or '')[:500]))
+        else:
+            failed_rows.append((row['id'], (error or '')[:500]))
+
+    with get_db_connection() as conn:
+        cur = conn.cursor()
 
-    for username in usernames:
-        result = send_push_notification(username, title, body, data)
-        total_results['success'] += result['success']
-        total_results['failed'] += result['failed']
-        total_results['errors'].extend(result['errors'])
+        if sent_ids:
+            cur.execute("DELETE FROM push_outbox WHERE id = ANY(%s)", (sent_ids,))
+
+        # 만료된 구독 정리 (CASCADE로 해당 구독의 대기열도 삭제)
+        if dead_subscription_ids:
+            cur.execute(
+                "DELETE FROM push_subscriptions WHERE id = ANY(%s)",
+                (list(dead_subscription_ids),)
+            )
 
-    return total_results
+        if retry_rows:
+            psycopg2.extras.execute_values(cur, """
+                UPDATE push_outbox o
+                SET next_attempt_at = CURRENT_TIMESTAMP + v.delay * INTERVAL '1 second',
+                    locked_until = NULL,
+                    last_error = v.error
+                FROM (VALUES %s) AS v(id, delay, error)
+                WHERE o.id = v.id
+            """, retry_rows)
+
+        if failed_rows:
+            psycopg2.extras.execute_values(cur, """
+                UPDATE push_outbox o
+                SET status = 'failed', locked_until = NULL, last_error = v.error
+                FROM (VALUES %s) AS v(id, error)
+                WHERE o.id = v.id
+            """, failed_rows)
+
+        conn.commit()
+
+    if dead_subscription_ids:
+        logger.info(f"[Push] 만료된 구독 {len(dead_subscription_ids)}개 삭제")
+    if failed_rows:
+        logger.warning(f"[Push] 발송 최종 실패 {len(failed_rows)}건")
+
+
+def process_push_outbox(executor, limit=PUSH_BATCH_SIZE):
+    """
+    발송 대기열에서 한 배치를 처리합니다.
+
+    Args:
+        executor: 동시 발송에 사용할 실행기 (동시 발송 수 제한)
+        limit (int): 한 번에 처리할 최대 건수
+
+    Returns:
+        int: 처리한 건수
+    """
+    rows = _claim_due_pushes(limit)
+    if not rows:
+        return 0
+
+    outcomes = list(executor.map(_deliver, rows))
+    _finalize_deliveries(rows, outcomes)
+    return len(rows)
+
+
+def run_push_delivery_loop():
+    """푸시 배달 워커 루프 (대기열이 비면 새 항목이 들어오거나 폴링 주기가 될 때까지 대기)"""
+    logger.info(f"[Push] 배달 워커 시작 (동시 발송 {PUSH_MAX_CONCURRENCY})")
+    executor = ThreadPoolExecutor(max_workers=PUSH_MAX_CONCURRENCY, thread_name_prefix='push')
+
+    while True:
+        try:
+            processed = process_push_outbox(executor)
+        except Exception as e:
+            logger.error(f"[Push] 대기열 처리 오류: {e}", exc_info=True)
+            processed = 0
+
+        if processed < PUSH_BATCH_SIZE:
+            _outbox_event.wait(PUSH_POLL_SECONDS)
+            _outbox_event.clear()
 
 
 def save_subscription(username, subscription_data):
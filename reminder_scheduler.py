@@ -0,0 +1,297 @@
+"""
+예약 알림 스케줄러 모듈
+미완료 예약의 다음 알림 시각을 힙(우선순위 큐)에 보관하고
+가장 이른 시각까지 잠들었다가 깨어나 알림을 발송
+
+- 시작 시 한 번만 전체 예약 + 사용자 알림 설정을 로드
+- 예약 추가/수정/삭제/완료 토글, 알림 설정 변경 시 해당 예약(사용자)만 다시 로드
+- 다른 워커의 변경은 cache_manager 무효화 메시지(Redis pub/sub)로 전달
+- 메시지 유실(재연결 중 발행 등)에 대비해 REMINDER_RESYNC_SECONDS마다 그 사이 바뀐 예약만 다시 조회
+  (삭제된 예약은 발송 시 점유가 실패하면서 일정에서 빠짐)
+- 스케줄러는 리더 프로세스(scheduler_leader)에서만 실행되고, 다른 프로세스의 변경은 메시지로 반영
+- 발송 전 DB에서 조건부 UPDATE로 알림을 점유하므로 리더 교체 중에도 한 번만 발송
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+from datetime import datetime, timedelta
+
+import database
+import push_helper
+from cache_manager import publish_invalidation, register_invalidation_handler
+
+logger = logging.getLogger('crm')
+
+REMINDER_MAX_SLEEP_SECONDS = 300  # 시계 변경 대비 최대 대기 시간
+REMINDER_RESYNC_SECONDS = 180  # 변경분 재조회 주기 (무효화 메시지 유실 대비)
+REMINDER_RESYNC_OVERLAP_SECONDS = 60  # 재조회 구간 겹침 (커밋 지연/서버 간 시계 차이 대비)
+REMINDER_LOAD_RETRY_SECONDS = 30  # 초기 로드 실패 시 재시도 간격
+REMINDER_RETRY_SECONDS = 60  # 발송 오류 시 재시도 간격
+
+_lock = threading.Lock()
+_wakeup = threading.Event()
+_heap = []  # (알림 시각, 세대, 예약 ID)
+_entries = {}  # 예약 ID -> (알림 시각, 세대, 예약 행)
+_generation = itertools.count()
+_running = False  # 이 프로세스에서 스케줄러 실행 중 여부 (리더만 True)
+
+
+def _parse_timestamp(value):
+    """last_notified_at 값을 datetime으로 변환 (없거나 형식이 다르면 None)"""
+    if value is None or isinstance(value, datetime):
+        return value
+    for fmt in ('%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M'):
+        try:
+            return datetime.strptime(str(value), fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def compute_next_fire_at(reminder, now):
+    """
+    예약의 다음 알림 시각 계산 (사용자 알림 설정 적용)
+
+    - 첫 알림: 예약 시각 reminder_minutes분 전 (이미 지났으면 즉시)
+    - 반복 알림: 마지막 알림 + repeat_interval분, 예약 시각 repeat_until_minutes분 전까지
+    - 예약 시각이 지났거나 완료된 예약은 None
+
+    Args:
+        reminder: get_reminder_schedules() 행
+        now: 기준 시각
+
+    Returns:
+        datetime 또는 None (더 이상 알림 없음)
+    """
+    if reminder.get('is_completed'):
+        return None
+    try:
+        scheduled_at = datetime.strptime(f"{reminder['scheduled_date']} {reminder['scheduled_time']}",
+                                         '%Y-%m-%d %H:%M')
+    except (KeyError, TypeError, ValueError):
+        return None
+    if scheduled_at <= now:
+        return None
+
+    if not reminder.get('notification_count'):
+        return max(scheduled_at - timedelta(minutes=reminder.get('reminder_minutes') or 0), now)
+
+    if not reminder.get('repeat_enabled'):
+        return None
+    last_notified = _parse_timestamp(reminder.get('last_notified_at'))
+    if last_notified is None:
+        return None
+
+    fire_at = max(last_notified + timedelta(minutes=reminder.get('repeat_interval') or 5), now)
+    if fire_at >= scheduled_at - timedelta(minutes=reminder.get('repeat_until_minutes') or 0):
+        return None
+    return fire_at
+
+
+def _schedule(reminders, removed_ids=()):
+    """예약 행을 힙에 반영 (이전 항목은 세대 번호로 무효화)"""
+    now = datetime.now()
+    earliest = _heap[0][0] if _heap else None
+    woke = False
+
+    for reminder_id in removed_ids:
+        _entries.pop(reminder_id, None)
+
+    for reminder in reminders:
+        fire_at = compute_next_fire_at(reminder, now)
+        if fire_at is None:
+            _entries.pop(reminder['id'], None)
+            continue
+        generation = next(_generation)
+        _entries[reminder['id']] = (fire_at, generation, reminder)
+        heapq.heappush(_heap, (fire_at, generation, reminder['id']))
+        if earliest is None or fire_at < earliest:
+            woke = True
+
+    # 무효화된 항목이 너무 많이 쌓이면 힙 재구성
+    if len(_heap) > 2 * len(_entries) + 64:
+        _heap[:] = [(fire_at, generation, reminder_id)
+                    for reminder_id, (fire_at, generation, _) in _entries.items()]
+        heapq.heapify(_heap)
+
+    # 가장 이른 알림 시각이 앞당겨졌으면 스케줄러를 깨움
+    if woke:
+        _wakeup.set()
+
+
+def _reload(reminder_ids=None, username=None):
+    """예약(ID 목록 또는 사용자 전체)을 DB에서 다시 읽어 일정 갱신 (스케줄러 실행 중일 때만)"""
+    if not _running:
+        return
+    reminders = database.get_reminder_schedules(reminder_ids=reminder_ids, username=username)
+    with _lock:
+        if reminder_ids is not None:
+            stale = set(reminder_ids)
+        else:
+            stale = {reminder_id for reminder_id, (_, _, reminder) in _entries.items()
+                     if reminder['user_id'] == username}
+        _schedule(reminders, removed_ids=stale - {reminder['id'] for reminder in reminders})
+
+
+def _on_remote_change(key):
+    """다른 워커의 예약/알림 설정 변경 메시지 처리"""
+    kind, _, value = (key or '').partition(':')
+    if kind == 'reminder':
+        _reload(reminder_ids=[int(value)])
+    elif kind == 'user':
+        _reload(username=value)
+
+
+register_invalidation_handler('reminder_schedule', _on_remote_change)
+
+
+def refresh_reminder(reminder_id):
+    """예약 추가/수정/삭제/완료 토글 후 해당 예약 일정 갱신"""
+    try:
+        _reload(reminder_ids=[reminder_id])
+    except Exception as e:
+        logger.error(f"[Reminder] 예약 일정 갱신 실패: {reminder_id} - {e}")
+    publish_invalidation('reminder_schedule', f'reminder:{reminder_id}')
+
+
+def refresh_user(username):
+    """알림 설정 변경 후 사용자의 모든 예약 일정 갱신"""
+    try:
+        _reload(username=username)
+    except Exception as e:
+        logger.error(f"[Reminder] 사용자 예약 일정 갱신 실패: {username} - {e}")
+    publish_invalidation('reminder_schedule', f'user:{username}')
+
+
+def _pop_due(now):
+    """알림 시각이 된 예약 행 꺼내기"""
+    due = []
+    with _lock:
+        while _heap and _heap[0][0] <= now:
+            fire_at, generation, reminder_id = heapq.heappop(_heap)
+            entry = _entries.get(reminder_id)
+            if entry and entry[1] == generation:
+                del _entries[reminder_id]
+                due.append(entry[2])
+    return due
+
+
+def _notify(reminder):
+    """예약 알림 점유 후 푸시 발송 대기열에 추가, 다음 반복 알림 예약"""
+    claimed = database.claim_reminder_notification(reminder['id'], reminder.get('notification_count') or 0)
+    if not claimed:
+        # 다른 워커가 이미 발송했거나 예약이 바뀜: 현재 상태로 다시 예약
+        _reload(reminder_ids=[reminder['id']])
+        return
+
+    user_id = reminder['user_id']
+    title = reminder.get('title') or '예약'
+    scheduled_time = reminder.get('scheduled_time', '')
+    notification_count = reminder.get('notification_count') or 0
+    notify_reason = 'repeat' if notification_count else 'first'
+
+    # 반복 알림인 경우 메시지 다르게
+    if notify_reason == 'repeat':
+        push_title = f'🔔 재알림: {title}'
+        push_body = f'{scheduled_time} 예약이 곧 시작됩니다! (알림 {notification_count + 1}회차)'
+    else:
+        push_title = f'⏰ 예약 알림: {title}'
+        push_body = f'{scheduled_time}에 "{title}" 예약이 있습니다.'
+
+    queued = push_helper.enqueue_push(
+        username=user_id,
+        title=push_title,
+        body=push_body,
+        data={
+            'type': 'reminder',
+            'reminderId': reminder['id'],
+            'url': '/reminders',
+            'requireInteraction': True,
+            'tag': f"reminder-{reminder['id']}-{notify_reason}"
+        }
+    )
+    if queued > 0:
+        logger.info(f"[Reminder] 푸시 알림 대기열 추가: {user_id} - {title} ({notify_reason})")
+    else:
+        logger.warning(f"[Reminder] 푸시 구독 없음: {user_id} - {title}")
+
+    # 발송 기록이 반영된 현재 상태를 DB에서 다시 읽어 다음 반복 알림 예약
+    # (점유 결과를 이전 행에 덮어쓰면 그 사이 바뀐 예약/알림 설정을 놓침)
+    _reload(reminder_ids=[reminder['id']])
+
+
+def _resync(since):
+    """since 이후 예약/알림 설정이 바뀐 예약을 다시 읽어 일정 갱신 (완료된 예약은 일정에서 제거)"""
+    reminders = database.get_reminder_schedules(updated_since=since)
+    with _lock:
+        _schedule(reminders)
+    if reminders:
+        logger.info(f"[Reminder] 변경분 재조회: {len(reminders)}건 반영")
+
+
+def _retry_later(reminder):
+    """발송 오류가 난 예약을 REMINDER_RETRY_SECONDS 뒤에 다시 시도 (그 사이 갱신되었으면 무시)"""
+    with _lock:
+        if reminder['id'] in _entries:
+            return
+        fire_at = datetime.now() + timedelta(seconds=REMINDER_RETRY_SECONDS)
+        generation = next(_generation)
+        _entries[reminder['id']] = (fire_at, generation, reminder)
+        heapq.heappush(_heap, (fire_at, generation, reminder['id']))
+
+
+def run_reminder_scheduler():
+    """예약 알림 스케줄러 (가장 이른 알림 시각까지 대기, 유휴 시 주기적 변경분 재조회만 수행)
+
+    스케줄러 리더 프로세스에서만 실행되며, 리더를 잃어 중지되면 일정을 비움
+    """
+    global _running
+    _running = True
+    try:
+        while True:
+            try:
+                last_sync = datetime.now()
+                reminders = database.get_reminder_schedules()
+                with _lock:
+                    _entries.clear()
+                    _heap.clear()
+                    _schedule(reminders)
+                logger.info(f"[Reminder] 예약 알림 스케줄러 시작: {len(_entries)}건 예약됨")
+                break
+            except Exception as e:
+                logger.error(f"[Reminder] 예약 일정 로드 실패: {e}", exc_info=True)
+                _wakeup.wait(REMINDER_LOAD_RETRY_SECONDS)
+
+        next_resync = datetime.now() + timedelta(seconds=REMINDER_RESYNC_SECONDS)
+        while True:
+            _wakeup.clear()
+            now = datetime.now()
+
+            if now >= next_resync:
+                try:
+                    _resync(last_sync - timedelta(seconds=REMINDER_RESYNC_OVERLAP_SECONDS))
+                    last_sync = now
+                except Exception as e:
+                    logger.error(f"[Reminder] 변경분 재조회 실패: {e}", exc_info=True)
+                next_resync = now + timedelta(seconds=REMINDER_RESYNC_SECONDS)
+
+            for reminder in _pop_due(now):
+                try:
+                    _notify(reminder)
+                except Exception as e:
+                    logger.error(f"[Reminder] 알림 발송 오류: {reminder.get('id')} - {e}", exc_info=True)
+                    _retry_later(reminder)
+
+            with _lock:
+                next_fire_at = _heap[0][0] if _heap else None
+            timeout = min(REMINDER_MAX_SLEEP_SECONDS, max((next_resync - datetime.now()).total_seconds(), 0))
+            if next_fire_at is not None:
+                timeout = min(max((next_fire_at - datetime.now()).total_seconds(), 0), timeout)
+            _wakeup.wait(timeout)
+    finally:
+        _running = False
+        with _lock:
+            _entries.clear()
+            _heap.clear()
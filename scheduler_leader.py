@@ -0,0 +1,121 @@
+"""
+스케줄러 리더 선출 모듈
+여러 gunicorn 인스턴스(5001, 5002) 중 PostgreSQL advisory lock을 잡은 한 프로세스만
+백그라운드 스케줄러(예약 알림, 일일 요약)를 실행
+
+- 리더는 락을 잡은 전용 연결을 유지하고 LEADER_RENEW_SECONDS마다 락 보유를 확인 (리스 갱신)
+- 리더 프로세스가 죽으면 세션이 끊기면서 락이 풀리고, 대기 중인 프로세스가
+  LEADER_RETRY_SECONDS 안에 락을 잡아 스케줄러를 이어서 실행
+- 네트워크 단절처럼 소켓이 바로 닫히지 않는 경우는 서버 측 TCP keepalive
+  (LEADER_KEEPALIVE_IDLE + INTERVAL x COUNT = 약 19초)로 서버가 세션을 끊고 락을 풀어서
+  대기 중인 프로세스가 그 뒤 LEADER_RETRY_SECONDS 안에 이어받음
+  (클라이언트 측 keepalive는 리더 쪽에서 끊긴 연결을 감지해 스케줄러를 멈추는 용도)
+"""
+
+import logging
+
+import eventlet
+import psycopg2
+
+import database
+
+logger = logging.getLogger('crm')
+
+SCHEDULER_LOCK_KEY = 7301001   # advisory lock 키 (클러스터 공통, 다른 용도와 겹치지 않게)
+LEADER_RENEW_SECONDS = 5       # 리더 락 보유 확인 주기
+LEADER_RETRY_SECONDS = 5       # 대기 중 락 획득 재시도 주기
+LEADER_KEEPALIVE_IDLE = 10     # TCP keepalive 시작까지 유휴 시간 (초, 서버/클라이언트 공통)
+LEADER_KEEPALIVE_INTERVAL = 3  # keepalive 재전송 간격 (초)
+LEADER_KEEPALIVE_COUNT = 3     # 응답 없는 keepalive 허용 횟수
+
+_is_leader = False
+
+
+def is_leader():
+    """이 프로세스가 스케줄러 리더인지 여부"""
+    return _is_leader
+
+
+def _connect():
+    """리더 락 전용 연결 (풀과 분리, 세션이 살아 있는 동안 락 유지)
+
+    keepalives_*는 libpq(클라이언트) 소켓에만 적용되므로, 락을 쥔 서버 세션이
+    끊긴 클라이언트를 정리하도록 서버 측 tcp_keepalives_*도 세션 옵션으로 지정
+    """
+    conn = psycopg2.connect(
+        **database.DB_CONFIG,
+        connect_timeout=5,
+        keepalives=1,
+        keepalives_idle=LEADER_KEEPALIVE_IDLE,
+        keepalives_interval=LEADER_KEEPALIVE_INTERVAL,
+        keepalives_count=LEADER_KEEPALIVE_COUNT,
+        options=(f'-c tcp_keepalives_idle={LEADER_KEEPALIVE_IDLE} '
+                 f'-c tcp_keepalives_interval={LEADER_KEEPALIVE_INTERVAL} '
+                 f'-c tcp_keepalives_count={LEADER_KEEPALIVE_COUNT}'),
+        application_name='crm_scheduler_leader'
+    )
+    conn.autocommit = True
+    return conn
+
+
+def _try_acquire(conn):
+    """advisory lock 획득 시도 (대기하지 않음)"""
+    with conn.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_lock(%s)', (SCHEDULER_LOCK_KEY,))
+        return cursor.fetchone()[0]
+
+
+def _still_holding(conn):
+    """리스 갱신: 이 세션이 여전히 락을 보유하는지 확인 (연결이 끊겼으면 예외)"""
+    with conn.cursor() as cursor:
+        cursor.execute('''
+            SELECT EXISTS (
+                SELECT 1 FROM pg_locks
+                WHERE locktype = 'advisory'
+                  AND pid = pg_backend_pid()
+                  AND classid = 0 AND objid = %s AND objsubid = 1
+                  AND granted
+            )
+        ''', (SCHEDULER_LOCK_KEY,))
+        return cursor.fetchone()[0]
+
+
+def run_leader_election(tasks):
+    """
+    리더 선출 루프 (프로세스마다 1개 실행)
+
+    리더가 되면 tasks를 각각 그린스레드로 실행하고, 락을 잃으면 모두 중지한 뒤 다시 대기
+
+    Args:
+        tasks: 리더만 실행할 무한 루프 함수 목록
+    """
+    global _is_leader
+
+    while True:
+        conn = None
+        workers = []
+        try:
+            conn = _connect()
+            while not _try_acquire(conn):
+                eventlet.sleep(LEADER_RETRY_SECONDS)
+
+            _is_leader = True
+            logger.info(f"[Leader] 스케줄러 리더 획득 (lock {SCHEDULER_LOCK_KEY})")
+            workers = [eventlet.spawn(task) for task in tasks]
+
+            while _still_holding(conn):
+                eventlet.sleep(LEADER_RENEW_SECONDS)
+            logger.warning("[Leader] 스케줄러 리더 락을 잃음")
+        except Exception as e:
+            logger.error(f"[Leader] 리더 선출 오류: {e}")
+        finally:
+            _is_leader = False
+            for worker in workers:
+                worker.kill()
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+        eventlet.sleep(LEADER_RETRY_SECONDS)
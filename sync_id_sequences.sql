@@ -0,0 +1,6 @@
+-- SERIAL 시퀀스를 현재 최대 ID에 맞춤
+-- 이전 코드는 전체 재작성 시 ID를 직접 지정해서 INSERT 했기 때문에 시퀀스가 뒤처져 있을 수 있음
+-- 새 코드는 행 단위 INSERT에서 시퀀스(DEFAULT)로 ID를 부여하므로 배포 전에 1회 실행
+SELECT setval(pg_get_serial_sequence('chats', 'id'), COALESCE((SELECT MAX(id) FROM chats), 0) + 1, false);
+SELECT setval(pg_get_serial_sequence('tasks', 'id'), COALESCE((SELECT MAX(id) FROM tasks), 0) + 1, false);
+SELECT setval(pg_get_serial_sequence('promotions', 'id'), COALESCE((SELECT MAX(id) FROM promotions), 0) + 1, false);
@@ -40,6 +40,47 @@ class TestAPIEndpoints:
         data = response.get_json()
         assert isinstance(data, list)
 
+    def test_get_items_page(self, client):
+        """할일 목록 서버 측 페이지 조회"""
+        response = client.get('/api/items?limit=5&total=true&sort=created_at&order=desc')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert isinstance(data['items'], list)
+        assert len(data['items']) <= 5
+        assert 'total' in data
+        assert 'next_cursor' in data
+
+    def test_get_items_invalid_cursor(self, client):
+        """잘못된 커서는 400"""
+        response = client.get('/api/items?limit=5&cursor=invalid')
+        assert response.status_code == 400
+
+    def test_get_items_cursor_sort_mismatch(self, client):
+        """다른 정렬 조건으로 만든 커서는 400"""
+        response = client.get('/api/items?limit=1&sort=title&order=asc')
+        assert response.status_code == 200
+        next_cursor = response.get_json()['next_cursor']
+        if next_cursor:
+            response = client.get(f'/api/items?limit=1&sort=created_at&order=desc&cursor={next_cursor}')
+            assert response.status_code == 400
+
+    def test_get_items_invalid_date_filter(self, client):
+        """존재하지 않는 날짜 필터는 400"""
+        response = client.get('/api/items?limit=1&created_from=2024-13-45')
+        assert response.status_code == 400
+
+        response = client.get('/api/items?limit=1&assigned_until=2024-02-30')
+        assert response.status_code == 400
+
+    def test_get_items_stats(self, client):
+        """할일 통계 조회 (localhost=관리자)"""
+        response = client.get('/api/items/stats')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert 'total' in data
+        assert isinstance(data['by_status'], dict)
+        assert sum(data['by_status'].values()) == data['total']
+
     def test_get_users(self, client):
         """사용자 목록 조회 (localhost=관리자)"""
         response = client.get('/api/users')
@@ -74,12 +115,50 @@ class TestAPIEndpoints:
         data = response.get_json()
         assert isinstance(data, dict)
 
+    def test_search_all_chats(self, client):
+        """전체 채팅방 메시지 검색"""
+        response = client.get('/api/chats/search?q=test&limit=10')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert isinstance(data['results'], list)
+        assert 'total' in data
+        assert isinstance(data['has_more'], bool)
+
+    def test_search_all_chats_requires_query(self, client):
+        """검색어 없는 전체 검색은 400"""
+        response = client.get('/api/chats/search')
+        assert response.status_code == 400
+
     def test_get_promotions(self, client):
         """프로모션 목록 조회"""
         response = client.get('/api/promotions')
         # 401 또는 200 (localhost 환경에 따라)
         assert response.status_code in [200, 401]
 
+    def test_get_promotions_page(self, client):
+        """프로모션 페이지 조회 (facet 포함)"""
+        response = client.get('/api/promotions?page=1&limit=5&facets=1&search=test')
+        # 401 또는 200 (localhost 환경에 따라)
+        assert response.status_code in [200, 401]
+        if response.status_code == 200:
+            data = response.get_json()
+            assert len(data['items']) <= 5
+            assert 'total' in data
+            assert 'channels' in data['facets']
+
+    def test_get_promotions_not_modified(self, auth_client):
+        """프로모션 목록 ETag 재검증 (변경 없으면 304)"""
+        response = auth_client.get('/api/promotions/filters')
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+        response = auth_client.get('/api/promotions/filters', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+
+    def test_bulk_delete_promotions_invalid_ids(self, client):
+        """숫자가 아닌 프로모션 ID는 400"""
+        response = client.delete('/api/promotions/bulk-delete', json={'ids': ['abc']})
+        assert response.status_code == 400
+
     def test_get_holidays(self, client):
         """공휴일 조회"""
         response = client.get('/api/holidays')
@@ -212,6 +291,67 @@ class TestHelperFunctions:
             txt_file = BytesIO(b'text content')
             assert validate_file_signature(txt_file, 'txt') is True
 
+    def test_validate_promotion_batch(self, app):
+        """프로모션 엑셀 행 배치 검증 (날짜 정규화, 중복여부 분리, 행별 오류)"""
+        with app.app_context():
+            from app import _validate_promotion_batch
+            from datetime import datetime
+
+            rows = [
+                ('안마의자', '프리미엄', '온라인', '신규할인', 10000, None, '기존, 결합', None,
+                 '내용', datetime(2024, 1, 1), None),
+                ('안마의자', '프리미엄', '온라인', '신규할인', None, None, '기존', None,
+                 '내용', '2024.03.01', '2024-02-01'),
+                (None, '프리미엄', '온라인', '신규할인', None, None, '기타', None,
+                 '내용', 'abc', None),
+                ('안마의자', '스탠다드', '매장', '재구매할인', None, None, None, None,
+                 '내용', '2024-04-01', None),
+            ]
+            promotions, errors = _validate_promotion_batch([18, 19, 20, 21], rows)
+
+            assert len(promotions) == 2
+            assert promotions[0]['start_date'] == '2024-01-01'
+            assert promotions[0]['end_date'] == '무기한'
+            assert promotions[0]['discount_amount'] == '10000'
+            assert promotions[0]['subscription_types'] == ['기존', '결합']
+
+            # 빈 숫자 셀/종료일은 'nan'이 아니라 빈 값/무기한
+            assert promotions[1]['start_date'] == '2024-04-01'
+            assert promotions[1]['end_date'] == '무기한'
+            assert promotions[1]['discount_amount'] == ''
+            assert promotions[1]['session_exemption'] == ''
+            assert promotions[1]['subscription_types'] == []
+
+            assert [error['row'] for error in errors] == [19, 20]
+            assert errors[0]['fields'] == ['end_date']
+            assert set(errors[1]['fields']) == {'category', 'start_date', 'subscription_types'}
+
+    def test_compute_next_fire_at(self, app):
+        """예약 알림 시각 계산 (첫 알림, 반복 알림, repeat_until)"""
+        with app.app_context():
+            from reminder_scheduler import compute_next_fire_at
+            from datetime import datetime
+
+            now = datetime(2024, 5, 1, 9, 0)
+            reminder = {
+                'scheduled_date': '2024-05-01', 'scheduled_time': '10:00',
+                'is_completed': 0, 'notification_count': 0, 'last_notified_at': None,
+                'reminder_minutes': 30, 'repeat_enabled': True,
+                'repeat_interval': 5, 'repeat_until_minutes': 10
+            }
+            assert compute_next_fire_at(reminder, now) == datetime(2024, 5, 1, 9, 30)
+
+            repeated = dict(reminder, notification_count=1, last_notified_at=datetime(2024, 5, 1, 9, 30))
+            assert compute_next_fire_at(repeated, now) == datetime(2024, 5, 1, 9, 35)
+
+            # repeat_until_minutes(10분 전) 이후에는 반복하지 않음
+            late = dict(repeated, last_notified_at=datetime(2024, 5, 1, 9, 46))
+            assert compute_next_fire_at(late, now) is None
+
+            # 지난 예약, 반복 비활성화
+            assert compute_next_fire_at(reminder, datetime(2024, 5, 1, 10, 0)) is None
+            assert compute_next_fire_at(dict(repeated, repeat_enabled=False), now) is None
+
     def test_is_localhost(self, app):
         """localhost 확인 함수"""
         with app.app_context():
@@ -249,6 +389,14 @@ class TestCRUDOperations:
         # 에러 또는 빈 JSON 처리
         assert response.status_code in [400, 500]
 
+    def test_create_item_missing_title(self, auth_client):
+        """할일 생성 - 제목 누락 시 400"""
+        response = auth_client.post('/api/items',
+                                    json={'title': '', 'content': 'test'},
+                                    content_type='application/json')
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'Title and content required'
+
     def test_update_item_not_found(self, auth_client):
         """할일 수정 - 존재하지 않는 ID"""
         response = auth_client.put('/api/items/999999',
@@ -0,0 +1,262 @@
+"""
+cache_manager.py 단위 테스트 (Redis는 메모리 가짜 클라이언트로 대체)
+"""
+import re
+import time
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cache_manager
+from cache_manager import LRUCache, TieredCache
+
+
+def _glob_to_regex(pattern):
+    """Redis glob(*, ?, 역슬래시 이스케이프)을 정규식으로 변환"""
+    parts = []
+    chars = iter(pattern)
+    for char in chars:
+        if char == '\\':
+            parts.append(re.escape(next(chars, '\\')))
+        elif char == '*':
+            parts.append('.*')
+        elif char == '?':
+            parts.append('.')
+        else:
+            parts.append(re.escape(char))
+    return re.compile(''.join(parts) + r'\Z', re.DOTALL)
+
+
+class FakeRedis:
+    """TieredCache가 쓰는 명령만 구현한 메모리 Redis (decode_responses 없이 bytes 반환)"""
+
+    def __init__(self):
+        self.values = {}  # key -> (value, 만료 시각)
+        self.sets = {}
+        self.published = []
+        self.round_trips = 0
+
+    @staticmethod
+    def _b(value):
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def _alive(self, key):
+        entry = self.values.get(key)
+        if entry and entry[1] is not None and time.time() >= entry[1]:
+            del self.values[key]
+            return None
+        return entry
+
+    def get(self, key):
+        entry = self._alive(self._b(key))
+        return entry[0] if entry else None
+
+    def pttl(self, key):
+        entry = self._alive(self._b(key))
+        if entry is None:
+            return -2
+        return -1 if entry[1] is None else int((entry[1] - time.time()) * 1000)
+
+    def set(self, key, value, ex=None):
+        self.values[self._b(key)] = (self._b(value), time.time() + ex if ex else None)
+        return True
+
+    def exists(self, key):
+        return 1 if self._alive(self._b(key)) else 0
+
+    def delete(self, *keys):
+        return sum(1 for key in keys if self.values.pop(self._b(key), None) is not None)
+
+    def sadd(self, key, *members):
+        members = {self._b(member) for member in members}
+        target = self.sets.setdefault(self._b(key), set())
+        added = len(members - target)
+        target |= members
+        return added
+
+    def srem(self, key, *members):
+        target = self.sets.get(self._b(key), set())
+        removed = {self._b(member) for member in members} & target
+        target -= removed
+        return len(removed)
+
+    def sscan_iter(self, key, match=None, count=None):
+        self.round_trips += 1
+        regex = _glob_to_regex(match) if match else None
+        for member in list(self.sets.get(self._b(key), ())):
+            if regex is None or regex.match(member.decode()):
+                yield member
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """명령을 모았다가 execute() 한 번(왕복 1회)에 실행"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        self.client.round_trips += 1
+        results = [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+
+class BrokenRedis(FakeRedis):
+    """모든 명령이 연결 오류로 실패하는 Redis"""
+
+    def pipeline(self, transaction=True):
+        raise ConnectionError('redis down')
+
+    def sscan_iter(self, key, match=None, count=None):
+        raise ConnectionError('redis down')
+
+    def publish(self, channel, message):
+        raise ConnectionError('redis down')
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """cache_manager가 가짜 Redis를 쓰도록 교체"""
+    client = FakeRedis()
+    monkeypatch.setattr(cache_manager, '_get_redis', lambda: client)
+    return client
+
+
+def new_cache():
+    """워커 하나에 해당하는 캐시 (L1은 워커마다 따로, L2는 공유)"""
+    return TieredCache(LRUCache(max_size=100))
+
+
+class TestTieredCache:
+    """L1(LRU) + L2(Redis) 계층 캐시 테스트"""
+
+    def test_l2_fall_through(self, fake_redis):
+        """다른 워커가 기록한 값은 L2에서 읽고 L1에 채움"""
+        writer, reader = new_cache(), new_cache()
+        writer.set('nav_counts:alice', {'unread_chats': 2}, ttl=60)
+
+        assert reader.local.get('nav_counts:alice') is None
+        assert reader.get('nav_counts:alice') == {'unread_chats': 2}
+        assert reader.l2_hits == 1
+
+        # 두 번째 조회는 L1에서 응답
+        round_trips = fake_redis.round_trips
+        assert reader.get('nav_counts:alice') == {'unread_chats': 2}
+        assert fake_redis.round_trips == round_trips
+        assert reader.l2_hits == 1
+
+    def test_l2_miss(self, fake_redis):
+        """어느 계층에도 없으면 None"""
+        cache = new_cache()
+        assert cache.get('nav_counts:nobody') is None
+        assert cache.l2_misses == 1
+
+    def test_non_json_value_stays_in_l1(self, fake_redis):
+        """JSON으로 직렬화할 수 없는 값은 L1에만 저장"""
+        value = {'assignees': {'alice', 'bob'}}
+        cache = new_cache()
+        cache.set('task_upload:1', value, ttl=60)
+
+        assert cache.get('task_upload:1') is value
+        assert fake_redis.get(cache.key_prefix + 'task_upload:1') is None
+        assert new_cache().get('task_upload:1') is None
+
+    def test_set_many_single_round_trip(self, fake_redis):
+        """set_many는 여러 네임스페이스의 키를 Redis 왕복 1회로 기록"""
+        cache = new_cache()
+        cache.set_many({
+            'nav_counts:alice': {'unread_chats': 1},
+            'nav_counts:bob': {'unread_chats': 3},
+            'chats:alice': [1, 2],
+        }, ttl=10)
+
+        assert fake_redis.round_trips == 1
+        reader = new_cache()
+        assert reader.get('nav_counts:bob') == {'unread_chats': 3}
+        assert reader.get('chats:alice') == [1, 2]
+
+    def test_prefix_invalidation_across_namespaces(self, fake_redis):
+        """':' 없는 접두사는 이름이 맞는 모든 네임스페이스에서 삭제"""
+        writer, other = new_cache(), new_cache()
+        writer.set_many({
+            'nav_counts:alice': 1,
+            'nav_counts:bob': 2,
+            'nav_extra:carol': 3,
+            'chats:alice': 4,
+        }, ttl=60)
+        assert other.get('nav_counts:alice') == 1
+
+        writer.invalidate('nav')
+
+        for key in ('nav_counts:alice', 'nav_counts:bob', 'nav_extra:carol'):
+            assert writer.get(key) is None
+            assert fake_redis.get(writer.key_prefix + key) is None
+        assert new_cache().get('chats:alice') == 4
+        # 다른 워커의 L1은 무효화 메시지로 정리
+        assert fake_redis.published[-1][0] == cache_manager.INVALIDATION_CHANNEL
+
+    def test_key_invalidation(self, fake_redis):
+        """':'가 있는 접두사는 해당 네임스페이스의 일치하는 키만 삭제"""
+        cache = new_cache()
+        cache.set_many({'nav_counts:alice': 1, 'nav_counts:alice2': 2, 'nav_counts:bob': 3}, ttl=60)
+
+        cache.invalidate('nav_counts:alice')
+
+        reader = new_cache()
+        assert reader.get('nav_counts:alice') is None
+        assert reader.get('nav_counts:alice2') is None  # 접두사 일치
+        assert reader.get('nav_counts:bob') == 3
+
+    def test_redis_down_falls_back_to_l1(self, monkeypatch):
+        """Redis 오류 시 L1만으로 동작하고 예외를 내지 않음"""
+        monkeypatch.setattr(cache_manager, '_get_redis', lambda: BrokenRedis())
+        cache = new_cache()
+
+        cache.set('nav_counts:alice', {'unread_chats': 1}, ttl=60)
+        assert cache.get('nav_counts:alice') == {'unread_chats': 1}
+        assert cache.get('nav_counts:bob') is None
+        assert cache.get_stats()['l2_available'] is False
+
+        cache.invalidate('nav_counts')
+        assert cache.get('nav_counts:alice') is None
+
+    def test_prune_index_drops_expired_keys(self, fake_redis):
+        """만료된 키는 네임스페이스 인덱스에서 제거"""
+        cache = new_cache()
+        cache.set_many({'nav_counts:alice': 1, 'nav_counts:bob': 2}, ttl=60)
+        fake_redis.delete(cache.key_prefix + 'nav_counts:alice')  # Redis TTL 만료와 같음
+
+        cache._prune_index(fake_redis, 'nav_counts')
+
+        assert fake_redis.sets[cache._index_key('nav_counts').encode()] == {b'nav_counts:bob'}
+
+    def test_prune_runs_in_background_after_threshold(self, fake_redis, monkeypatch):
+        """L2_INDEX_PRUNE_EVERY번 기록하면 백그라운드에서 인덱스 정리"""
+        monkeypatch.setattr(cache_manager, 'L2_INDEX_PRUNE_EVERY', 3)
+        cache = new_cache()
+        cache.set_many({'nav_counts:alice': 1, 'nav_counts:bob': 2}, ttl=60)
+        fake_redis.delete(cache.key_prefix + 'nav_counts:alice')
+
+        cache.set('nav_counts:carol', 3, ttl=60)
+
+        deadline = time.time() + 2
+        while cache._pruning and time.time() < deadline:
+            time.sleep(0.01)
+        assert fake_redis.sets[cache._index_key('nav_counts').encode()] == {b'nav_counts:bob', b'nav_counts:carol'}
@@ -61,6 +61,23 @@ class TestDatabaseFunctions:
         assert isinstance(count, int)
         assert count >= 0
 
+    def test_get_chat_summaries_nonexistent_user(self):
+        """참여 채팅방이 없는 사용자의 채팅 목록 요약 테스트"""
+        summaries = database.get_chat_summaries('definitely_nonexistent_user_12345')
+        assert summaries == {}
+
+    def test_get_chat_summaries_order(self):
+        """채팅 목록 요약의 order는 0부터 연속된 최근 활동순"""
+        summaries = database.get_chat_summaries(None, 0)
+        assert sorted(chat['order'] for chat in summaries.values()) == list(range(len(summaries)))
+
+    def test_get_chat_messages_page_nonexistent_chat(self):
+        """존재하지 않는 채팅방 메시지 페이지 조회 테스트"""
+        messages, has_more = database.get_chat_messages_page(999999999, limit=10)
+        assert messages == []
+        assert has_more is False
+        assert database.get_chat_message_context(999999999, 1) is None
+
     def test_get_next_id(self):
         """다음 ID 조회 테스트"""
         next_id = database.get_next_id('tasks')
@@ -105,6 +122,57 @@ class TestDatabaseFunctions:
         reminders = database.load_reminders('test_user')
         assert isinstance(reminders, list)
 
+    def test_get_reminder_banner_counts(self):
+        """배너용 예약 개수 집계 (전체/사용자)"""
+        counts = database.get_reminder_banner_counts()
+        assert counts['today_count'] >= 0
+        assert counts['overdue_count'] >= 0
+        assert database.get_reminder_banner_counts('nonexistent_user_xyz') == {'today_count': 0, 'overdue_count': 0}
+
+    def test_get_due_daily_summaries(self):
+        """일일 요약 대상 일괄 조회 (사용자별 개수 + 상위 3건)"""
+        summaries = database.get_due_daily_summaries('2000-01-01', '23:59')
+        for summary in summaries:
+            assert summary['today_count'] >= len(summary['top_reminders'])
+            assert len(summary['top_reminders']) <= 3
+        assert database.mark_daily_summaries_sent([], '2000-01-01') == (0, 0)
+
+    def test_query_promotions(self):
+        """프로모션 SQL 조회 (카탈로그 준비 전 경로) - 필터/페이지/facet"""
+        result = database.query_promotions({'search': '__no_such_promotion__'},
+                                           limit=10, include_total=True, include_facets=True)
+        assert result['items'] == []
+        assert result['total'] == 0
+        assert result['facets'] == {'categories': {}, 'products': {}, 'channels': {}}
+
+        all_items = database.query_promotions({'subscription_type': ''})['items']
+        assert len(all_items) == len(database.load_promotions())
+
+    def test_get_reminder_schedules_updated_since(self):
+        """변경분 재조회는 기준 시각 이후 바뀐 예약만 반환"""
+        from datetime import datetime, timedelta
+        assert database.get_reminder_schedules(updated_since=datetime.now() + timedelta(days=1)) == []
+        for reminder in database.get_reminder_schedules():
+            assert reminder['is_completed'] == 0
+
+    def test_get_task_not_found(self):
+        """존재하지 않는 할일 단건 조회"""
+        assert database.get_task(999999999) is None
+
+    def test_create_chat_keeps_legacy_roles(self):
+        """채팅방 생성은 chat_type/역할을 지정하지 않음 (기존 저장 방식과 동일)"""
+        chat = database.create_chat('test_create_chat', 'test_user_a', ['test_user_a', 'test_user_b'])
+        try:
+            meta = database.get_chat_meta(chat['id'])
+            assert meta['chat_type'] == 'direct'
+            assert [p['role'] for p in meta['participants']] == ['member', 'member']
+        finally:
+            assert database.delete_chat(chat['id']) is True
+
+    def test_delete_chat_not_found(self):
+        """존재하지 않는 채팅방 삭제"""
+        assert database.delete_chat(999999999) is False
+
 
 class TestSlowQueryDecorator:
     """느린 쿼리 로깅 데코레이터 테스트"""